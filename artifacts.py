@@ -0,0 +1,159 @@
+# artifacts.py
+
+import mmap
+import os
+import struct
+
+CACHE_DIR = os.environ.get(
+    'BALATRO_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'balatroAdvisor')
+)
+MANIFEST_NAME = 'manifest.json'
+
+# Ranks 2..Ace map to bits 0..12 of a rank mask.
+STRAIGHT_WINDOW_MASKS = [0b1000000001111] + [0b11111 << start for start in range(0, 9)]
+
+
+def _build_hand_classes(path):
+    """Write, for every 13-bit rank mask, the uint16 mask of straight windows it completes."""
+    with open(path, 'wb') as f:
+        for mask in range(1 << 13):
+            windows = sum(1 << i for i, window in enumerate(STRAIGHT_WINDOW_MASKS) if mask & window == window)
+            f.write(struct.pack('<H', windows))
+
+
+def _build_draw_odds(path):
+    """Write the draw-odds table (see drawOdds.py)."""
+    from drawOdds import build_table
+    build_table(path)
+
+
+BUILDERS = {
+    'handclass': _build_hand_classes,
+    'drawodds': _build_draw_odds,
+}
+
+
+def _file_hash(path):
+    import hashlib
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def build_artifacts(cache_dir=CACHE_DIR, names=None):
+    """
+    Build precomputed artifacts into cache_dir, naming each file by its content hash.
+
+    Parameters:
+    - cache_dir (str): Directory to write the artifacts and manifest to.
+    - names (list): Artifact names to build (defaults to all of BUILDERS).
+
+    Returns:
+    - dict: The updated manifest mapping artifact names to file names.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest = _read_manifest(cache_dir)
+    for name in names or BUILDERS:
+        tmp_path = os.path.join(cache_dir, f"{name}.tmp")
+        BUILDERS[name](tmp_path)
+        _install(name, tmp_path, cache_dir, manifest)
+    _write_manifest(cache_dir, manifest)
+    return manifest
+
+
+def register_artifact(name, path, cache_dir=CACHE_DIR):
+    """
+    Move a file built elsewhere (e.g., by a long resumable job) into cache_dir as an artifact.
+
+    Returns:
+    - str: The artifact's new path.
+    """
+    manifest = _read_manifest(cache_dir)
+    _install(name, path, cache_dir, manifest)
+    _write_manifest(cache_dir, manifest)
+    return os.path.join(cache_dir, manifest[name])
+
+
+def _install(name, path, cache_dir, manifest):
+    """Rename a built file to its content-hashed name, replacing the artifact's previous file."""
+    file_name = f"{name}-{_file_hash(path)}.bin"
+    os.replace(path, os.path.join(cache_dir, file_name))
+    stale = manifest.get(name)
+    manifest[name] = file_name
+    if stale and stale != file_name and os.path.exists(os.path.join(cache_dir, stale)):
+        os.remove(os.path.join(cache_dir, stale))
+
+
+def _write_manifest(cache_dir, manifest):
+    import json
+    tmp_manifest = os.path.join(cache_dir, f"{MANIFEST_NAME}.tmp")
+    with open(tmp_manifest, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_manifest, os.path.join(cache_dir, MANIFEST_NAME))
+
+
+def _read_manifest(cache_dir):
+    import json
+    try:
+        with open(os.path.join(cache_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def artifact_path(name, cache_dir=CACHE_DIR):
+    """Return the path of a built artifact, or None if it has not been built."""
+    file_name = _read_manifest(cache_dir).get(name)
+    if file_name:
+        path = os.path.join(cache_dir, file_name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+_maps = {}
+
+
+def open_artifact(name):
+    """Memory-map an artifact on first use; returns None if it has not been built."""
+    if name not in _maps:
+        path = artifact_path(name)
+        if path is None:
+            _maps[name] = None
+        else:
+            with open(path, 'rb') as f:
+                _maps[name] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _maps[name]
+
+
+def straight_windows(rank_mask):
+    """
+    Return the bitmask of straight windows completed by a 13-bit rank mask.
+
+    Bit 0 is the Ace-low straight; bit i (1..9) is the straight starting at rank i + 1.
+    """
+    table = open_artifact('handclass')
+    if table is None:
+        return sum(1 << i for i, window in enumerate(STRAIGHT_WINDOW_MASKS) if rank_mask & window == window)
+    return struct.unpack_from('<H', table, 2 * rank_mask)[0]
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Build the precomputed artifacts used at runtime.")
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="Directory to write the artifacts to.")
+    parser.add_argument('names', nargs='*', help=f"Artifacts to build: {', '.join(BUILDERS)} (default: all).")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BUILDERS]
+    if unknown:
+        parser.error(f"unknown artifacts: {', '.join(unknown)}")
+    manifest = build_artifacts(args.cache_dir, args.names or None)
+    for name, file_name in sorted(manifest.items()):
+        print(f"{name}: {os.path.join(args.cache_dir, file_name)}")
+
+
+if __name__ == "__main__":
+    main()
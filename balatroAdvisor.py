@@ -1,53 +1,139 @@
 # balatroAdvisor.py
-import os
+import sys
 import time
 import threading
-from typing import List
-from play import parse_playing_cards, find_best_hands, update_hand_scores
+from collections import Counter
+from play import parse_playing_cards, find_best_hands, update_hand_scores, BASE_HAND_SCORES
 from discard import recommend_discard_strategies
 from planetCards import PLANET_CARDS
+from deck import CARD_NAMES, DECK_PRESETS, RANKS, SUITS, Zones, card_index, make_deck
+from blinds import BOSS_BLINDS
+from screen import Screen
 
-# Attempt to import colorama for colored output
-try:
-    from colorama import init, Fore, Style
+HAND_TYPES = list(BASE_HAND_SCORES)
 
-    init(autoreset=True)
-    COLORAMA_AVAILABLE = True
-except ImportError:
-    COLORAMA_AVAILABLE = False
+# colorama, the JokerManager and the asyncio front end's worker threads are only
+# set up on first use to keep startup fast; asyncio itself is imported by main()
+_colorama = None
+_joker_manager = None
+_analysis_executor = None
+
+# The on-disk recommendation cache; None until first used, False when turned off
+_recommendation_cache = None
+
+# The background prefetcher of next hands' plays; None until first used, False when turned off
+_prefetcher = None
+
+# The terminal, redrawn in place by menus that own the whole screen
+SCREEN = Screen()
+
+# Seconds an analysis runs before its progress is shown, and between updates
+PROGRESS_DELAY = 0.2
+PROGRESS_INTERVAL = 0.1
+
+# Seconds the discard search may take before it answers with the best found so far
+DISCARD_DEADLINE = 0.05
+
+# Worker threads for engine calls, so a superseded analysis still winding down does not delay the next
+ANALYSIS_WORKERS = 4
+
+
+def color(name):
+    """
+    Return the colorama code for name (e.g., 'GREEN', 'RESET_ALL'), or '' without colorama.
+
+    colorama is imported and initialized the first time a color is requested.
+    """
+    global _colorama
+    if _colorama is None:
+        try:
+            from colorama import init, Fore, Style
+
+            init(autoreset=True)
+            _colorama = (Fore, Style)
+        except ImportError:
+            _colorama = False
+    if not _colorama:
+        return ''
+    fore, style = _colorama
+    return getattr(fore, name, None) or getattr(style, name, '')
+
+
+def get_joker_manager():
+    """Return the shared JokerManager, constructing it on first use."""
+    global _joker_manager
+    if _joker_manager is None:
+        from jokers import JokerManager
+        _joker_manager = JokerManager()
+    return _joker_manager
+
+
+def get_recommendation_cache():
+    """Return the shared RecommendationCache, opening it on first use, or None if it is off or unusable."""
+    global _recommendation_cache
+    if _recommendation_cache is None:
+        try:
+            from recommendationCache import RecommendationCache
+            _recommendation_cache = RecommendationCache()
+        except Exception:
+            _recommendation_cache = False
+    return _recommendation_cache or None
+
+
+def get_prefetcher():
+    """Return the shared Prefetcher, constructing it on first use, or None if it or the cache is off."""
+    global _prefetcher
+    if _prefetcher is None:
+        cache = get_recommendation_cache()
+        if cache is None:
+            return None
+        from prefetch import Prefetcher
+        _prefetcher = Prefetcher(cache)
+    return _prefetcher or None
+
+
+def stop_prefetch():
+    """Stop the background prefetch, if one is running (e.g., when what it assumed changes)."""
+    if _prefetcher:
+        _prefetcher.stop()
+
+
+def enabled_joker_names():
+    """Return the names of the enabled Jokers, in order, without loading the Joker catalog."""
+    if _joker_manager is None:
+        return []
+    return [joker.name for joker in _joker_manager.enabled_jokers]
 
 
 def clear_screen():
-    """Clear the console screen without error messages."""
-    try:
-        if os.name == 'nt':
-            os.system('cls')
-        else:
-            import subprocess
-            subprocess.run(['clear'], stderr=subprocess.DEVNULL)
-    except Exception:
-        pass
+    """Clear the console screen with ANSI control sequences (see screen.Screen)."""
+    SCREEN.clear()
 
 
 def display_hacker_banner():
     """Display the hacker-style banner for Balatro Advisor."""
     banner = f"""
-{Fore.GREEN if COLORAMA_AVAILABLE else ''}██████╗  █████╗ ██╗      █████╗ ████████╗██████╗  ██████╗ 
+{color('GREEN')}██████╗  █████╗ ██╗      █████╗ ████████╗██████╗  ██████╗ 
 ██╔══██╗██╔══██╗██║     ██╔══██╗╚══██╔══╝██╔══██╗██╔═══██╗
 ██████╔╝███████║██║     ███████║   ██║   ██████╔╝██║   ██║
 ██╔══██ ██╔══██║██║     ██╔══██║   ██║   ██╔══██║██║   ██║
 ██████╔╝██║  ██║███████╗██║  ██║   ██║   ██║  ██║╚██████╔╝
 ╚═════╝ ╚═╝  ╚═╝╚══════╝╚═╝  ╚═╝   ╚═╝   ╚═╝  ╚═╝ ╚═════╝ 
                    Balatro Advisor v2.5                                  
-{Style.RESET_ALL if COLORAMA_AVAILABLE else ''}
+{color('RESET_ALL')}
     """
     print(banner)
 
 def get_active_planet_cards():
     """Retrieve all active Planet Cards."""
     return [card for card in PLANET_CARDS.values() if card.quantity > 0]
-def manage_planet_cards():
-    """Allow users to add or remove Planet Cards by typing the planet name or -planet name."""
+async def manage_planet_cards(console, remaining_deck):
+    """
+    Allow users to add or remove Planet Cards by typing the planet name or -planet name.
+
+    Typing 'rank' ranks the planets by the score one more level of each would
+    add to hands drawn from remaining_deck.
+    """
     # Define secret planets
     secret_planets = {'Planet X', 'Eris', 'Ceres'}
 
@@ -61,12 +147,15 @@ def manage_planet_cards():
         print("\nInstructions:")
         print(" - To add a Planet Card, type its name (e.g., 'Earth').")
         print(" - To remove a Planet Card, type '-' followed by its name (e.g., '-Earth').")
+        print(" - Type 'rank' to see which Planet Card adds the most to your hands.")
         print(" - Type 'back' to return to the main menu.")
 
-        user_input = input("Your choice: ").strip()
+        user_input = await console.ask("Your choice: ")
 
         if user_input.lower() == 'back':
             break
+        elif user_input.lower() == 'rank':
+            await display_planet_ranking(remaining_deck)
         elif user_input.startswith('-'):
             # Attempt to remove a Planet Card
             planet_name = user_input[1:].strip().title()
@@ -91,47 +180,20 @@ def manage_planet_cards():
             else:
                 print("Invalid Planet Card name. Please try again.")
 
-def get_shorthand(card):
-    """
-    Convert a full card name to its shorthand representation.
-
-    Parameters:
-    - card (str): Full card name (e.g., 'Ace Spade').
-
-    Returns:
-    - str: Shorthand representation (e.g., 'as').
-    """
-    value_map = {
-        'Ace': 'a',
-        '2': '2',
-        '3': '3',
-        '4': '4',
-        '5': '5',
-        '6': '6',
-        '7': '7',
-        '8': '8',
-        '9': '9',
-        '10': '10',
-        'Jack': 'j',
-        'Queen': 'q',
-        'King': 'k'
-    }
-    suit_map = {
-        'Heart': 'h',
-        'Diamond': 'd',
-        'Spade': 's',
-        'Club': 'c'
-    }
+async def display_planet_ranking(remaining_deck):
+    """Show the Planet Cards ranked by the expected score they add per hand drawn from the deck."""
+    from planetValue import rank_planets
 
     try:
-        value, suit = card.split()
-        value_short = value_map.get(value, value[0].lower())
-        suit_short = suit_map.get(suit, '?')  # '?' for unknown suits
-        return f"{value_short}{suit_short}"
-    except ValueError:
-        # Handle unexpected card format
-        print(f"Warning: Unable to parse card '{card}'. Using original string.")
-        return card.lower()
+        ranking = await run_analysis("Sampling hands (hands)", rank_planets, remaining_deck.copy())
+    except ValueError as e:
+        print(e)
+        return
+    lines = [f"\n>> {color('CYAN')}Planet Cards by Expected Gain per Hand:{color('RESET_ALL')}"]
+    for idx, entry in enumerate(ranking, 1):
+        lines.append(f"   {idx}. {entry['planet']} ({entry['hand']}): +{entry['gain']:.1f} "
+                     f"(average best play {entry['expected_score']:.1f})")
+    print_delayed(lines)
 
 def print_delayed(lines, delay=0.07):
     """Print lines with a small delay between each line."""
@@ -170,6 +232,12 @@ def get_card_value(card):
     return value_map.get(value, 0)
 
 
+# Deck table layout: Ace first, then 2 to King, with each row's card indices in suit order
+CARD_LABELS = [format_hand([card]) for card in CARD_NAMES]
+DECK_TABLE_HEADER = f"{'Rank':<10} " + " ".join(suit[:3] for suit in SUITS)
+DECK_TABLE_ROWS = [(rank, [card_index(f"{rank} {suit}") for suit in SUITS]) for rank in RANKS[-1:] + RANKS[:-1]]
+
+
 def calculate_high_card_score(card):
     """Calculate a score for the High Card pattern based on its value."""
     value = get_card_value(card)
@@ -177,14 +245,17 @@ def calculate_high_card_score(card):
     return value
 
 
-def display_best_hand_recommendation(cards):
-    """Show the best play recommendation and return top_hands."""
-    top_hands = find_best_hands(cards, top_n=1)
+def display_best_hand_recommendation(cards, blind=None, top_hands=None):
+    """Show the best play recommendation and return top_hands (looked up or searched for unless given)."""
+    if top_hands is None:
+        from bestPlayTable import lookup_best_play
+
+        top_hands = lookup_best_play(cards, blind) or find_best_hands(cards, top_n=1, blind=blind)
     if top_hands:
         hand = top_hands[0]
         formatted_hand = format_hand(hand['pattern_cards'])
         lines = [
-            f"\n>> {Fore.CYAN if COLORAMA_AVAILABLE else ''}Best Hand Recommendation:{Style.RESET_ALL if COLORAMA_AVAILABLE else ''}",
+            f"\n>> {color('CYAN')}Best Hand Recommendation:{color('RESET_ALL')}",
             f"   Pattern: {hand['pattern']}",
             f"   Cards: {formatted_hand}",
             f"   Calculation: {hand['calculation']}",
@@ -195,7 +266,7 @@ def display_best_hand_recommendation(cards):
         # **Ensure at least a High Card recommendation exists**
         high_card = max(cards, key=lambda card: get_card_value(card))
         lines = [
-            f"\n>> {Fore.CYAN if COLORAMA_AVAILABLE else ''}Best Hand Recommendation:{Style.RESET_ALL if COLORAMA_AVAILABLE else ''}",
+            f"\n>> {color('CYAN')}Best Hand Recommendation:{color('RESET_ALL')}",
             f"   Pattern: High Card",
             f"   Cards: {format_hand([high_card])}",
             f"   Calculation: High card value",
@@ -212,14 +283,16 @@ def display_best_hand_recommendation(cards):
     return top_hands
 
 
-def display_best_discard_recommendation(current_hand, best_play_pattern, remaining_deck):
-    """Show the best discard recommendation."""
-    top_discards = recommend_discard_strategies(current_hand, remaining_deck, top_n=1)
+def display_best_discard_recommendation(current_hand, best_play_pattern, remaining_deck, blind=None, top_discards=None):
+    """Show the best discard recommendation (searched for unless given)."""
+    if top_discards is None:
+        top_discards = recommend_discard_strategies(current_hand, remaining_deck, top_n=1, blind=blind,
+                                                    deadline=DISCARD_DEADLINE)
     if top_discards:
         strategy = top_discards[0]
         if best_play_pattern and strategy['pattern'] == best_play_pattern and not strategy['discard']:
             # If the best play is already the current hand's pattern and no discard is recommended
-            line = f">> {Fore.MAGENTA if COLORAMA_AVAILABLE else ''}Best Discard Recommendation:{Style.RESET_ALL if COLORAMA_AVAILABLE else ''} Play your current hand; it's already strong.\n"
+            line = f">> {color('MAGENTA')}Best Discard Recommendation:{color('RESET_ALL')} Play your current hand; it's already strong.\n"
             print_delayed([line])
         else:
             formatted_discard = format_hand(strategy['discard'])
@@ -227,108 +300,214 @@ def display_best_discard_recommendation(current_hand, best_play_pattern, remaini
             probability = f"{strategy['probability'] * 100:.2f}%"
             expected_score = f"{strategy['score']:.2f}"
             lines = [
-                f"\n>> {Fore.MAGENTA if COLORAMA_AVAILABLE else ''}Best Discard Recommendation:{Style.RESET_ALL if COLORAMA_AVAILABLE else ''}",
+                f"\n>> {color('MAGENTA')}Best Discard Recommendation:{color('RESET_ALL')}",
                 f"   Pattern to Aim For: {strategy['pattern']}",
                 f"   Discard: {formatted_discard}",
                 f"   Kept Cards: {formatted_kept}",
                 f"   Probability: {probability}"
             ]
+            if not strategy['exact']:
+                lines.append("   (Best found within the time limit)")
             print_delayed(lines)
     else:
         print_delayed(["\n>> No valid discard recommendations available.\n"])
 
 
+def deck_table_lines(remaining_deck):
+    """
+    Return the lines of the remaining deck's table, one row per rank and one column per suit.
+
+    Cells are read from the deck's card mask and counts; copies beyond the
+    first are shown as 'x2', 'x3', ...
+    """
+    mask = remaining_deck.mask()
+    counts = remaining_deck.counts
+    lines = [DECK_TABLE_HEADER, "-" * len(DECK_TABLE_HEADER)]
+    for rank, indices in DECK_TABLE_ROWS:
+        row = f"{rank:<10} "
+        for index in indices:
+            if mask >> index & 1:
+                cell = CARD_LABELS[index] if counts[index] == 1 else f"{CARD_LABELS[index]}x{counts[index]}"
+            else:
+                cell = "--"
+            row += f"{cell:<5} "
+        lines.append(row)
+    return lines
+
+
 def show_deck_table(remaining_deck):
     """Display the remaining deck as a table categorized by rank and suit."""
-    ranks = ['Ace', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King']
-    suits = ['Heart', 'Diamond', 'Spade', 'Club']
+    print("\n".join(deck_table_lines(remaining_deck)))
 
-    # Initialize a dictionary to map suits to their ranks
-    deck_dict = {suit: [] for suit in suits}
-    for card in remaining_deck:
-        value, suit = card.split()
-        deck_dict[suit].append(value)
 
-    # Sort the ranks within each suit
-    for suit in suits:
-        deck_dict[suit].sort(key=lambda x: get_card_value(f"{x} {suit}"))
+def display_remaining_card_count(zones):
+    """Display the number of cards left to draw, and how many are in the other zones."""
+    print(f"\n>> Cards Remaining in Deck: {len(zones.draw)} "
+          f"(hand {len(zones.hand)}, discarded {len(zones.discard)}, played {len(zones.played)})\n")
 
-    # Prepare the table header
-    header = f"{'Rank':<10} " + " ".join([f"{suit[:3]}" for suit in suits])
-    print(header)
-    print("-" * len(header))
 
-    # Iterate through each rank and display presence in suits
-    for rank in ranks:
-        row = f"{rank:<10} "
-        for suit in suits:
-            card = f"{rank} {suit}"
-            if card in remaining_deck:
-                display_card = format_hand([card]).replace(" ", "")
-            else:
-                display_card = "--"
-            row += f"{display_card:<5} "
-        print(row)
+def display_remaining_deck(zones):
+    """Show the cards still available to draw in a table format."""
+    display_remaining_card_count(zones)
+    show_deck_table(zones.draw)
 
 
-def display_remaining_card_count(remaining_deck):
-    """Display the number of remaining cards in the deck."""
-    print(f"\n>> Cards Remaining in Deck: {len(remaining_deck)}\n")
+class Console:
+    """
+    Line input for the asyncio front end.
 
+    stdin is read on a daemon thread so the event loop keeps running while the
+    user types. At most one read is outstanding: a line typed while an analysis
+    runs cancels the analysis and is then returned by the next ask().
+    """
 
-def display_remaining_deck(remaining_deck):
-    """Show the cards still available in the deck in a table format."""
-    display_remaining_card_count(remaining_deck)
-    show_deck_table(remaining_deck)
+    def __init__(self):
+        """Initialize a Console with no read outstanding."""
+        self._pending = None
 
+    def read(self, prompt=''):
+        """Print prompt and return a future for the next line, reusing an outstanding read."""
+        print(prompt, end='', flush=True)
+        if self._pending is None:
+            import asyncio
+
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+
+            def reader():
+                line = sys.stdin.readline()
+                try:
+                    loop.call_soon_threadsafe(future.set_result, line)
+                except RuntimeError:
+                    pass  # The event loop has already closed
+
+            threading.Thread(target=reader, daemon=True).start()
+            self._pending = future
+        return self._pending
+
+    async def ask(self, prompt=''):
+        """Return the next line typed, stripped; raises EOFError at the end of input."""
+        line = await self.read(prompt)
+        self._pending = None
+        if not line:
+            raise EOFError
+        return line.strip()
 
-def loading_indicator(stop_event):
-    """Display dynamic loading messages based on elapsed time."""
-    start_time = time.time()
-    messages = [
-        (10, "Meditating..."),
-        (30, "Pondering existential questions..."),
-        (60, "Reaching enlightenment..."),
-        (120, "Achieving omniscience...")
-    ]
-    message_idx = 0
-    while not stop_event.is_set():
-        elapsed = time.time() - start_time
-        if message_idx < len(messages) and elapsed >= messages[message_idx][0]:
-            print(f"{messages[message_idx][1]}", flush=True)
-            message_idx += 1
-        time.sleep(1)  # Check every second
 
+class AnalysisCancelled(Exception):
+    """Raised inside an engine call whose analysis has been cancelled."""
 
-def update_deck(current_deck, cards_to_remove):
+
+class Analysis:
+    """Progress and cancellation shared between the event loop and an engine call on the worker thread."""
+
+    def __init__(self, label):
+        """Initialize an Analysis shown as label while it runs."""
+        self.label = label
+        self.done = 0
+        self.total = 0
+        self.cancelled = threading.Event()
+
+    def progress(self, done, total):
+        """Engine callback: record progress, or stop the engine if the analysis was cancelled."""
+        if self.cancelled.is_set():
+            raise AnalysisCancelled
+        self.done, self.total = done, total
+
+
+async def show_progress(analysis):
+    """Keep a progress line for analysis up to date until cancelled."""
+    import asyncio
+
+    await asyncio.sleep(PROGRESS_DELAY)
+    try:
+        while True:
+            if analysis.total:
+                print(f"\r{analysis.label}: {analysis.done}/{analysis.total}", end='', flush=True)
+            await asyncio.sleep(PROGRESS_INTERVAL)
+    finally:
+        print("\r" + " " * 60 + "\r", end='', flush=True)
+
+
+async def run_analysis(label, engine, *args, **kwargs):
     """
-    Remove specific cards from the current deck in place.
+    Run an engine function on the worker thread, showing the progress it reports.
 
     Parameters:
-    - current_deck: Set of remaining cards in the deck.
-    - cards_to_remove: Iterable of cards to remove from the deck.
+    - label (str): What the progress line calls the work (e.g., 'Scoring plays').
+    - engine: find_best_hands, recommend_discard_strategies or any function taking progress=.
 
     Returns:
-    - None
+    - The engine's result. Cancelling the awaiting task stops the engine at its
+      next progress report; the next analysis starts on another worker meanwhile.
     """
-    current_deck.difference_update(cards_to_remove)
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    global _analysis_executor
+    if _analysis_executor is None:
+        # Engine calls run on worker threads, off the event loop
+        _analysis_executor = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS)
+    analysis = Analysis(label)
+    # The foreground analysis has the CPU to itself until the engine call has
+    # returned, even when cancelled, since it only stops at its next progress report
+    prefetcher = _prefetcher or None
+    if prefetcher is not None:
+        prefetcher.pause()
+    job = _analysis_executor.submit(lambda: engine(*args, progress=analysis.progress, **kwargs))
+    if prefetcher is not None:
+        job.add_done_callback(lambda _: prefetcher.resume())
+    ticker = asyncio.create_task(show_progress(analysis))
+    try:
+        return await asyncio.wrap_future(job)
+    except asyncio.CancelledError:
+        analysis.cancelled.set()
+        raise
+    finally:
+        ticker.cancel()
+        await asyncio.gather(ticker, return_exceptions=True)
 
 
-def show_detailed_options():
+async def unless_superseded(console, coroutine):
+    """
+    Await an analysis while listening for input; typing anything first cancels it.
+
+    Returns:
+    - The analysis result, or None if it was cancelled. The line typed is left
+      for the next console.ask().
+    """
+    import asyncio
+
+    analysis = asyncio.create_task(coroutine)
+    typed = console.read()
+    await asyncio.wait({analysis, typed}, return_when=asyncio.FIRST_COMPLETED)
+    if analysis.done():
+        return analysis.result()
+    analysis.cancel()
+    await asyncio.gather(analysis, return_exceptions=True)
+    print("\n>> Analysis cancelled.")
+    return None
+
+
+async def show_detailed_options(console):
     """Display menu options for further details."""
     print("\nOptions:")
     print("p - View all play recommendations")
     print("d - View all discard recommendations")
     print("deck - View the cards remaining in the deck")
     print("back - Return to the previous menu")
+    print("c - Chance to clear the blind with the hands and discards left")
+    print("r - Score distribution after the top discards (chance to reach a score)")
     print("go - Input a new set of cards")
-    choice = input("Your choice: ").strip().lower()
+    choice = (await console.ask("Your choice: ")).lower()
     return choice
 
 
-def display_all_play_recommendations(cards):
-    """Show all play recommendations with calculations."""
-    top_hands = find_best_hands(cards, top_n=5)
+def display_all_play_recommendations(cards, blind=None, top_hands=None, search=None):
+    """Show all play recommendations with calculations (searched for unless given, with their search stats)."""
+    if top_hands is None:
+        search = {}
+        top_hands = find_best_hands(cards, top_n=5, blind=blind, stats=search)
     if not top_hands:
         # **Ensure at least a High Card recommendation exists**
         high_card = max(cards, key=lambda card: get_card_value(card))
@@ -348,12 +527,17 @@ def display_all_play_recommendations(cards):
             f"Calculation: {hand['calculation']}",
             f"Total Score: {hand['score']}"
         ])
+    if search and search.get('subsets'):
+        lines.append(f"\nScored {search['scored']} candidate plays instead of {search['subsets']} card subsets "
+                     f"({search['types_pruned']} hand types pruned by score bound).")
     print_delayed(lines)
 
 
-def display_all_discard_recommendations(current_hand, remaining_deck):
-    """Show all discard recommendations with probability and expected score."""
-    top_discards = recommend_discard_strategies(current_hand, remaining_deck, top_n=5)
+def display_all_discard_recommendations(current_hand, remaining_deck, blind=None, top_discards=None):
+    """Show all discard recommendations with probability and expected score (searched for unless given)."""
+    if top_discards is None:
+        top_discards = recommend_discard_strategies(current_hand, remaining_deck, top_n=5, blind=blind,
+                                                    deadline=DISCARD_DEADLINE)
     lines = ["\n>> Top 5 Discard Recommendations:"]
     if not top_discards:
         lines.append("\n>> No discard recommendations available.\n")
@@ -371,77 +555,133 @@ def display_all_discard_recommendations(current_hand, remaining_deck):
                 f"Probability: {probability}",
                 f"Expected Score Increase: {expected_score}"
             ])
+        if not top_discards[0]['exact']:
+            lines.append("\n(Best found within the time limit; not every discard was weighed.)")
     print_delayed(lines)
 
 
-def process_card_input(user_input, remaining_deck, previous_hand):
-    """
-    Process the card input string, update the deck, and display recommendations.
-
-    Parameters:
-    - user_input: String input representing the user's hand.
-    - remaining_deck: Set of remaining cards in the deck.
-    - previous_hand: Set of cards from the previous hand.
-
-    Returns:
-    - Updated current_hand (set) or None if an error occurs.
-    """
-    stop_event = threading.Event()
-    loader_thread = threading.Thread(target=loading_indicator, args=(stop_event,))
-    loader_thread.start()
-
-    # Display "Calculating Best Outcomes..." message immediately
-    print("\nCalculating Best Outcomes...", end='', flush=True)
-    time.sleep(0.4)  # Simulate loading delay after message is shown
+async def display_score_distributions(console, current_hand, remaining_deck, blind=None):
+    """Ask for a score to reach, then show the distribution of the best play's score after each top discard."""
+    from scoreDistribution import strategy_distributions, format_distribution
 
+    answer = (await console.ask("Score to reach (Enter for none): ")).strip()
     try:
-        # Parse the input cards
-        new_hand, n = parse_playing_cards(user_input)
-        new_hand_set = set(new_hand)
+        target = int(answer) if answer else None
+    except ValueError:
+        print_delayed(["\nPlease enter a whole number.\n"])
+        return
+    strategies = await run_analysis("Weighing discards (keep sets)", recommend_discard_strategies, current_hand,
+                                    remaining_deck.copy(), top_n=3, blind=blind, deadline=DISCARD_DEADLINE)
+    distributions = await run_analysis("Scoring draws (outcomes)", strategy_distributions, current_hand,
+                                       remaining_deck.copy(), strategies, blind=blind)
+    lines = [f"\n>> {color('CYAN')}Score Distributions:{color('RESET_ALL')}"]
+    for idx, (strategy, distribution) in enumerate(zip(strategies, distributions), 1):
+        lines.append(f"\nRank {idx}: Discard {format_hand(strategy['discard']) or 'None'}, "
+                     f"aiming for {strategy['pattern']}")
+        lines.extend(f"   {line}" for line in format_distribution(distribution, target))
+    print_delayed(lines)
 
-        # Identify new cards by comparing with the previous hand
-        if previous_hand:
-            new_cards = new_hand_set - previous_hand
-        else:
-            new_cards = new_hand_set  # All cards are new if no previous hand
 
-        # Check if new cards are available in the remaining deck
-        if not new_cards.issubset(remaining_deck):
-            missing = new_cards - remaining_deck
-            raise ValueError(f"The following cards are not available in the deck: {', '.join(missing)}")
+async def display_clear_probability(console, current_hand, remaining_deck, blind=None):
+    """Ask for the blind's remaining score, hands and discards, then show the estimated chance to clear it."""
+    from clear import clear_probability, describe_action
 
-        # Remove new cards from the deck
-        update_deck(remaining_deck, new_cards)
+    try:
+        target = int(await console.ask("Chips still needed to clear the blind: "))
+        hands_left = int(await console.ask("Hands left: "))
+        discards_left = int(await console.ask("Discards left: "))
+    except ValueError:
+        print_delayed(["\nPlease enter whole numbers.\n"])
+        return
+    result = await run_analysis("Planning the round (actions)", clear_probability, current_hand,
+                                remaining_deck.copy(), target, hands_left, discards_left, blind=blind)
+    lines = [
+        f"\n>> {color('CYAN')}Estimated Chance to Clear:{color('RESET_ALL')} {result['probability'] * 100:.1f}% "
+        f"± {result['error'] * 100:.1f}% ({result['samples']} sampled draws per action)",
+        f"   Best Action: {describe_action(result['action'])}"
+    ]
+    for action in result['actions'][1:]:
+        lines.append(f"   Or: {describe_action(action)} ({action['probability'] * 100:.1f}%)")
+    print_delayed(lines)
 
-        # Stop the loading indicator
-        stop_event.set()
-        loader_thread.join()
 
-        # Clear the screen (do not display the banner again)
-        clear_screen()
+async def recommend_for_hand(hand, remaining_deck, blind=None):
+    """
+    Search for the best play and the best discard for a hand; returns (top_hands, top_discards).
 
-        # Show the parsed hand
-        formatted_hand = format_hand(new_hand)
-        print_delayed([f"\nYour Hand: {formatted_hand}"])
+    Both are looked up in the recommendation cache first, in one read, and
+    stored there once computed; the plays are often there already, from the
+    prefetch started after the previous hand's discard recommendation. Discards cut short by the deadline are not
+    stored, so a later search can do better. An 8-card hand from a standard deck
+    is answered from the best-play table when it has been built.
+    """
+    from bestPlayTable import lookup_best_play
+
+    top_hands = lookup_best_play(hand, blind)
+    cache = get_recommendation_cache()
+    found = {}
+    if cache is not None:
+        from recommendationCache import cache_key
+
+        jokers = enabled_joker_names()
+        plays_key = cache_key('plays', hand, blind=blind, jokers=jokers)
+        discards_key = cache_key('discards', hand, remaining_deck, blind, jokers)
+        found = cache.get_many([plays_key, discards_key])
+        if _prefetcher:
+            _prefetcher.check(plays_key)
+
+    if top_hands is None and cache is not None and plays_key in found:
+        top_hands = found[plays_key]
+    elif top_hands is None:
+        start = time.perf_counter()
+        top_hands = await run_analysis("Scoring plays (hand types)", find_best_hands, hand, top_n=1, blind=blind)
+        if cache is not None:
+            cache.put(plays_key, 'plays', top_hands, time.perf_counter() - start)
+
+    if cache is not None and discards_key in found:
+        top_discards = found[discards_key]
+    else:
+        start = time.perf_counter()
+        top_discards = await run_analysis("Weighing discards (keep sets)", recommend_discard_strategies,
+                                          hand, remaining_deck, top_n=1, blind=blind, deadline=DISCARD_DEADLINE)
+        if cache is not None and all(strategy['exact'] for strategy in top_discards):
+            cache.put(discards_key, 'discards', top_discards, time.perf_counter() - start)
+    return top_hands, top_discards
 
-        # Display Best Hand Recommendation
-        top_hands = display_best_hand_recommendation(new_hand)
-        best_play_pattern = top_hands[0]['pattern'] if top_hands else None
 
-        # Display Best Discard Recommendation
-        display_best_discard_recommendation(new_hand, best_play_pattern, remaining_deck)
+async def process_card_input(console, new_hand, zones, blind=None):
+    """
+    Take in a new hand, move cards between the zones, and display recommendations.
 
-        # Display number of remaining cards and the deck
-        display_remaining_card_count(remaining_deck)
+    Cards that left the hand since the last one go to the played or discard
+    pile, as the user says; new cards come out of the draw pile. The
+    recommendations are computed in the background; typing a command before
+    they are ready cancels them and the command is handled next.
 
-        return new_hand_set  # Return the updated current hand
+    Parameters:
+    - console: Console to read from.
+    - new_hand: List of card names in the user's hand (see input_play_game).
+    - zones: The run's Zones; the draw pile is what the odds are computed from.
+    - blind: Active BossBlind, or None.
 
+    Returns:
+    - Updated current_hand (list) or None if an error occurs.
+    """
+    # The prefetch for this hand is over; what it stored is read below
+    stop_prefetch()
+    try:
+        # Cards of the previous hand that are not in the new one (as multisets)
+        left = list((Counter(zones.hand) - Counter(new_hand)).elements())
+        left_to = 'discard'
+        if left:
+            answer = await console.ask(f"Were {format_hand(left)} played or discarded? (p/d): ")
+            left_to = 'played' if answer.lower().startswith('p') else 'discard'
+
+        # Raises ValueError, moving nothing, if the draw pile lacks any new card
+        zones.set_hand(new_hand, left_to)
     except ValueError as e:
-        # Stop the loading indicator in case of error
-        stop_event.set()
-        loader_thread.join()
         print_delayed([f"\nError: {e}\n"])
-        retry = input("Do you want to try again? (y/n): ").strip().lower()
+        retry = (await console.ask("Do you want to try again? (y/n): ")).lower()
         if retry != 'y':
             print_delayed(["\nExiting Balatro Advisor... Stay sharp!\n"])
             exit(0)
@@ -450,16 +690,54 @@ def process_card_input(user_input, remaining_deck, previous_hand):
             display_hacker_banner()
             return None
 
+    # Clear the screen (do not display the banner again)
+    clear_screen()
+
+    # Show the parsed hand
+    formatted_hand = format_hand(new_hand)
+    print_delayed([f"\nYour Hand: {formatted_hand}"])
+    print("\nCalculating Best Outcomes... (type a command to skip)", flush=True)
+
+    # The engine works on its own copy of the deck, so a cancelled search never
+    # sees later changes
+    results = await unless_superseded(console, recommend_for_hand(new_hand, zones.draw.copy(), blind))
+    if results is not None:
+        top_hands, top_discards = results
+
+        # Display Best Hand Recommendation
+        top_hands = display_best_hand_recommendation(new_hand, blind, top_hands)
+        best_play_pattern = top_hands[0]['pattern'] if top_hands else None
+
+        # Display Best Discard Recommendation
+        display_best_discard_recommendation(new_hand, best_play_pattern, zones.draw, blind, top_discards)
+
+        # While the advice is read, find the best plays for the hands the discard can lead to
+        prefetcher = get_prefetcher()
+        if prefetcher is not None and top_discards and top_discards[0]['discard']:
+            strategy = top_discards[0]
+            prefetcher.start(strategy['kept_cards'], zones.draw, len(strategy['discard']), blind,
+                             enabled_joker_names())
+
+    # Display number of remaining cards and the deck
+    display_remaining_card_count(zones)
+
+    return new_hand  # Return the updated current hand
 
-def input_play_game():
-    """Handle the Play Game input by prompting for each suit separately."""
+
+async def input_play_game(console):
+    """
+    Handle the Play Game input by prompting for each suit separately.
+
+    Returns:
+    - list: The card names entered, or None if there were none.
+    """
     suits = ['Spade', 'Heart', 'Diamond', 'Club']
     collected_cards = []
 
     for suit in suits:
         while True:
-            user_input = input(
-                f"Input {suit} card values, separated by a comma (e.g., a,3,j or 0 if none): ").strip().lower()
+            user_input = (await console.ask(
+                f"Input {suit} card values, separated by a comma (e.g., a,3,j or 0 if none): ")).lower()
             if user_input == '0':
                 break  # No cards in this suit
             else:
@@ -491,35 +769,198 @@ def input_play_game():
         print("No cards entered. Exiting Play Game.")
         return None
 
-    # Convert collected_cards to a single string for processing using the helper function
-    card_string = ''.join([get_shorthand(card) for card in collected_cards])
-    return card_string
+    return collected_cards
+
+
+async def deck_menu(console, remaining_deck, preset):
+    """
+    Allow users to pick a starting deck and add or remove card copies.
+
+    The menu owns the screen: the remaining deck's table stays on it and each
+    change redraws only the rows that changed.
+
+    Returns:
+    - (remaining_deck, preset): The deck to use from now on and its preset name.
+    """
+    message = ""
+    try:
+        while True:
+            lines = [
+                "--- Deck Menu ---",
+                f"Starting deck: {preset} ({len(remaining_deck)} cards remaining)",
+                "",
+                *deck_table_lines(remaining_deck),
+                "",
+                "Instructions:",
+                f" - To start over with a deck, type its name ({', '.join(DECK_PRESETS)}).",
+                " - To add copies of cards (e.g., Cryptid, DNA), type '+' followed by the cards (e.g., '+ahah').",
+                " - To remove destroyed cards (e.g., Hanged Man), type '-' followed by the cards (e.g., '-2c3d').",
+                " - Type 'back' to return to the main menu.",
+                "",
+                message
+            ]
+            SCREEN.render(lines)
+
+            user_input = await console.ask("Your choice: ")
+
+            try:
+                if user_input.lower() == 'back':
+                    return remaining_deck, preset
+                elif user_input.startswith('+'):
+                    cards, n = parse_playing_cards(user_input[1:], allow_duplicates=True)
+                    for card in cards:
+                        remaining_deck.add(card)
+                    message = f"Added {n} card(s)."
+                elif user_input.startswith('-'):
+                    cards, n = parse_playing_cards(user_input[1:], allow_duplicates=True)
+                    remaining_deck.remove_cards(cards)
+                    message = f"Removed {n} card(s)."
+                elif user_input.title() in DECK_PRESETS:
+                    preset = user_input.title()
+                    remaining_deck = make_deck(preset)
+                    message = f"Started a new {preset} deck with {len(remaining_deck)} cards."
+                else:
+                    message = "Invalid choice. Please try again."
+            except ValueError as e:
+                message = str(e)
+    finally:
+        # The main menu prints below the frame from here on
+        SCREEN.forget()
+
+
+async def boss_blind_menu(console, blind):
+    """
+    Allow users to pick the current Boss Blind and record the hand types played against it.
+
+    Returns:
+    - The active BossBlind, or None for no Boss Blind.
+    """
+    while True:
+        print("\n--- Boss Blind Menu ---")
+        for name, boss in BOSS_BLINDS.items():
+            marker = " [Active]" if boss is blind else ""
+            print(f"{name}: {boss.description}{marker}")
+        if blind is not None and blind.played_hand_types:
+            print(f"\nHand types played this round: {', '.join(blind.played_hand_types)}")
+
+        print("\nInstructions:")
+        print(" - To face a Boss Blind, type its name (e.g., 'The Eye').")
+        print(" - To record a played hand type, type 'played' followed by it (e.g., 'played Pair').")
+        print(" - Type 'none' to clear the Boss Blind.")
+        print(" - Type 'back' to return to the main menu.")
+
+        user_input = await console.ask("Your choice: ")
+
+        if user_input.lower() == 'back':
+            return blind
+        elif user_input.lower() == 'none':
+            blind = None
+            print("No Boss Blind active.")
+        elif user_input.lower().startswith('played '):
+            pattern = user_input[len('played '):].strip().title()
+            if blind is None:
+                print("Select a Boss Blind first.")
+            elif pattern not in HAND_TYPES:
+                print(f"Invalid hand type. Choose from: {', '.join(HAND_TYPES)}")
+            else:
+                blind.record_play(pattern)
+                print(f"Recorded {pattern}.")
+        elif user_input.title() in BOSS_BLINDS:
+            blind = BOSS_BLINDS[user_input.title()]
+            blind.reset()
+            print(f"Now facing {blind.name}: {blind.description}")
+        else:
+            print("Invalid choice. Please try again.")
 
 
-def jokers_menu():
-    """Placeholder for Jokers menu."""
+async def display_best_loadouts(console, manager, remaining_deck):
+    """Ask for the number of Joker slots, then show the best loadouts from the Joker catalog."""
+    from jokerLoadout import optimize_loadout
+
+    try:
+        slots = int(await console.ask("Joker slots: "))
+        loadouts = await run_analysis("Optimizing loadouts (hands, then first Jokers)", optimize_loadout,
+                                      manager.all_jokers, remaining_deck.copy(), slots=slots)
+    except ValueError as e:
+        print(e if str(e).startswith("Error") else "Please enter a whole number.")
+        return
+    lines = [f"\n>> {color('CYAN')}Best Loadouts of {slots} Jokers:{color('RESET_ALL')}"]
+    for idx, loadout in enumerate(loadouts, 1):
+        lines.append(f"   {idx}. {', '.join(loadout['jokers'])}: {loadout['expected_score']:.1f} per hand "
+                     f"(+{loadout['gain']:.1f})")
+    print_delayed(lines)
+
+
+async def display_best_order(console, manager, remaining_deck):
+    """Show the order of the enabled Jokers that scores best, and offer to apply it."""
+    from jokerOrder import optimize_order
+
+    if len(manager.enabled_jokers) < 2:
+        print("Enable at least two Jokers to order them.")
+        return
+    try:
+        result = await run_analysis("Ordering Jokers (hands)", optimize_order, list(manager.enabled_jokers),
+                                    remaining_deck.copy())
+    except ValueError as e:
+        print(e)
+        return
+    current = [joker.name for joker in manager.enabled_jokers]
+    lines = [f"\n>> {color('CYAN')}Best Joker Order:{color('RESET_ALL')}",
+             f"   {', '.join(result['order'])}",
+             f"   {result['expected_score']:.1f} per hand (current order {result['current_score']:.1f}, "
+             f"+{result['gain']:.1f})"]
+    print_delayed(lines)
+    if result['order'] != current and (await console.ask("Apply this order? (y/n): ")).lower() == 'y':
+        manager.reorder_jokers(result['order'])
+        print("Joker order updated.")
+
+
+async def jokers_menu(console, remaining_deck):
+    """
+    Allow users to enable or disable Jokers by typing the joker name or -joker name.
+
+    Typing 'optimize' finds the loadouts of Jokers that score best on hands
+    drawn from remaining_deck, and 'order' the best order of the enabled ones.
+    """
+    manager = get_joker_manager()
+
     while True:
         print("\n--- Jokers Menu ---")
-        print("Jokers feature is under development. Stay tuned!")
+        for name, joker in manager.all_jokers.items():
+            print(f"{name}: {'Enabled' if joker.enabled else 'Disabled'}")
+
+        print("\nInstructions:")
+        print(" - To enable a Joker, type its name (e.g., 'Jolly Joker').")
+        print(" - To disable a Joker, type '-' followed by its name (e.g., '-Jolly Joker').")
+        print(" - Type 'optimize' to find the best Jokers for your slots.")
+        print(" - Type 'order' to find the best order of the enabled Jokers.")
         print(" - Type 'back' to return to the main menu.")
-        user_input = input("Your choice: ").strip().lower()
-        if user_input == 'back':
+
+        user_input = await console.ask("Your choice: ")
+
+        if user_input.lower() == 'back':
             break
+        elif user_input.lower() == 'optimize':
+            await display_best_loadouts(console, manager, remaining_deck)
+        elif user_input.lower() == 'order':
+            await display_best_order(console, manager, remaining_deck)
+        elif user_input.startswith('-'):
+            manager.disable_joker(user_input[1:].strip().title())
         else:
-            print("Invalid choice. Please type 'back' to return.")
+            manager.enable_joker(user_input.title())
 
 
-def main():
+async def run_advisor():
+    """Run the interactive advisor on an asyncio event loop."""
+    console = Console()
     clear_screen()
     display_hacker_banner()
 
-    # Initialize the full deck
-    full_deck = {f"{v} {s}"
-                 for v in (list(map(str, range(2, 11))) + ['Jack', 'Queen', 'King', 'Ace'])
-                 for s in ['Heart', 'Diamond', 'Spade', 'Club']}
-    remaining_deck = set(full_deck)  # Copy of the full deck
+    # Initialize the full deck; every card starts in the draw pile
+    deck_preset = 'Standard'
+    zones = Zones(make_deck(deck_preset))
 
-    previous_hand = set()  # To store the previous hand
+    blind = None  # Active Boss Blind
 
     while True:
         # Prompt for input
@@ -528,46 +969,58 @@ def main():
         print("1. Play Game")
         print("2. Planets")
         print("3. Jokers")
+        print("4. Deck")
+        print("5. Boss Blind")
+        print("6. New Blind (shuffle every card back into the deck)")
 
-        choice = input("Select an option (1-3): ").strip()
+        choice = await console.ask("Select an option (1-6): ")
+        if choice != '1':
+            # The other options can change the planets, Jokers, deck or blind the prefetch assumed
+            stop_prefetch()
 
         if choice == '1':
             # Handle Play Game
-            card_string = input_play_game()
-            if not card_string:
+            cards = await input_play_game(console)
+            if not cards:
                 continue  # If no cards were entered, return to main menu
 
             # Process the card input and display recommendations
-            current_hand = process_card_input(card_string, remaining_deck, previous_hand)
+            current_hand = await process_card_input(console, cards, zones, blind)
             if current_hand is None:
                 continue  # If processing failed, prompt again
 
-            # Update the previous_hand for the next iteration
-            previous_hand = current_hand
-
             # Main loop for detailed view options
             while True:
-                choice = show_detailed_options()
+                choice = await show_detailed_options(console)
 
                 if choice == 'p':
-                    display_all_play_recommendations(current_hand)
+                    search = {}
+                    top_hands = await run_analysis("Scoring plays (hand types)", find_best_hands,
+                                                   current_hand, top_n=5, blind=blind, stats=search)
+                    display_all_play_recommendations(current_hand, blind, top_hands, search)
                 elif choice == 'd':
-                    display_all_discard_recommendations(current_hand, remaining_deck)
+                    top_discards = await run_analysis("Weighing discards (keep sets)", recommend_discard_strategies,
+                                                      current_hand, zones.draw.copy(), top_n=5, blind=blind,
+                                                      deadline=DISCARD_DEADLINE)
+                    display_all_discard_recommendations(current_hand, zones.draw, blind, top_discards)
+                elif choice == 'c':
+                    await display_clear_probability(console, current_hand, zones.draw, blind)
+                elif choice == 'r':
+                    await display_score_distributions(console, current_hand, zones.draw, blind)
                 elif choice == 'deck':
-                    display_remaining_deck(remaining_deck)
+                    display_remaining_deck(zones)
                 elif choice == 'back':
                     break  # Return to the main menu
                 elif choice == 'go':
                     # Prompt the user for a new set of cards
                     print("\n--- Enter a New Set of Cards ---")
-                    new_card_string = input_play_game()
-                    if not new_card_string:
+                    new_cards = await input_play_game(console)
+                    if not new_cards:
                         print("No cards entered. Returning to detailed options.")
                         continue
                     # Process the new card input
-                    new_hand = process_card_input(new_card_string, remaining_deck, previous_hand)
+                    new_hand = await process_card_input(console, new_cards, zones, blind)
                     if new_hand:
-                        previous_hand = new_hand
                         current_hand = new_hand
                     else:
                         print_delayed(["\nInvalid card input. Please try again.\n"])
@@ -575,22 +1028,70 @@ def main():
                     # Handle unexpected inputs
                     print_delayed(["\nInvalid choice. Please select again.\n"])
 
-                input("\nPress Enter to continue...")
+                await console.ask("\nPress Enter to continue...")
                 clear_screen()
                 print(f"\nYour Hand: {format_hand(current_hand)}")
 
         elif choice == '2':
             # Handle Planets
-            manage_planet_cards()
+            await manage_planet_cards(console, zones.draw)
             # After managing, continue to main menu
             continue
         elif choice == '3':
             # Handle Jokers
-            jokers_menu()
+            await jokers_menu(console, zones.draw)
+            continue
+        elif choice == '4':
+            # Handle Deck; a new starting deck puts every card back in the draw pile
+            new_deck, deck_preset = await deck_menu(console, zones.draw, deck_preset)
+            if new_deck is not zones.draw:
+                zones = Zones(new_deck)
+            continue
+        elif choice == '5':
+            # Handle Boss Blind
+            blind = await boss_blind_menu(console, blind)
+            continue
+        elif choice == '6':
+            # Handle New Blind; the Boss Blind, if any, is over
+            zones.reset()
+            blind = None
+            print(f"New blind: all {len(zones.draw)} cards are back in the deck.")
             continue
         else:
             print("Invalid choice. Please select a valid option.")
 
 
+def main():
+    import argparse
+    import asyncio
+
+    global _recommendation_cache, _prefetcher
+    parser = argparse.ArgumentParser(description="Balatro Advisor: best plays and discards for your hand.")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Do not read or store recommendations in the on-disk cache.")
+    parser.add_argument('--cache-stats', action='store_true',
+                        help="Report the recommendation cache's and the prefetch's hit rates on exit.")
+    parser.add_argument('--no-prefetch', action='store_true',
+                        help="Do not compute the likely next hands' plays in the background.")
+    args = parser.parse_args()
+    if args.no_cache:
+        _recommendation_cache = False
+    if args.no_cache or args.no_prefetch:
+        _prefetcher = False
+
+    try:
+        asyncio.run(run_advisor())
+    except (EOFError, KeyboardInterrupt):
+        print_delayed(["\nExiting Balatro Advisor... Stay sharp!\n"])
+    finally:
+        stop_prefetch()
+        if _recommendation_cache:
+            _recommendation_cache.close()
+            if args.cache_stats:
+                print(_recommendation_cache.summary())
+                if _prefetcher:
+                    print(_prefetcher.summary())
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,191 @@
+# benchmarks.py
+
+import random
+import re
+import subprocess
+import sys
+import time
+
+# Cumulative import time allowed for `import balatroAdvisor` in a fresh interpreter.
+IMPORT_TIME_BUDGET_MS = 75.0
+
+# Largest share of the 5-card subsets find_best_hands may score, for top_n=1 on large hands.
+MAX_SCORED_SHARE = 0.05
+
+# Discard search deadline, and how far past it a call may return.
+DISCARD_DEADLINE_S = 0.05
+DISCARD_OVERRUN_MS = 20.0
+
+# Peak memory allocated by a best-play plus discard request, in KiB: the average over
+# the hands of each size, and the worst single request. Before the slotted result
+# objects, 24-card hands averaged 61.2 KiB with a worst request of 251.3 KiB, and 8- and
+# 16-card hands 11.4 and 15.4 KiB.
+ALLOCATION_BUDGET_KB = 48.0
+ALLOCATION_WORST_KB = 160.0
+
+
+def measure_import_time(module='balatroAdvisor', runs=5):
+    """
+    Measure the cold import time of a module in fresh interpreters.
+
+    Parameters:
+    - module (str): Module to import.
+    - runs (int): Number of interpreters to start; the best run is reported.
+
+    Returns:
+    - float: Cumulative import time in milliseconds, as reported by -X importtime.
+    """
+    best = None
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                capture_output=True, text=True, check=True)
+        for line in result.stderr.splitlines():
+            match = re.match(r'import time:\s+\d+ \|\s+(\d+) \| (\S+)$', line)
+            if match and match.group(2) == module:
+                elapsed = int(match.group(1)) / 1000
+                best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_import_time():
+    """Check the cold import time of balatroAdvisor against IMPORT_TIME_BUDGET_MS."""
+    elapsed = measure_import_time()
+    ok = elapsed <= IMPORT_TIME_BUDGET_MS
+    print(f"import balatroAdvisor: {elapsed:.1f} ms (budget {IMPORT_TIME_BUDGET_MS:.0f} ms) "
+          f"{'OK' if ok else 'OVER BUDGET'}")
+    return ok
+
+
+def bench_best_play(hand_sizes=(12, 16, 20), hands=20, seed=0):
+    """Check that the best-play search scores only a small share of the 5-card subsets for top_n=1."""
+    from deck import CARD_NAMES
+    from play import find_best_hands
+
+    rng = random.Random(seed)
+    ok = True
+    for size in hand_sizes:
+        subsets = scored = 0
+        start = time.perf_counter()
+        for _ in range(hands):
+            stats = {}
+            find_best_hands(rng.sample(CARD_NAMES, size), top_n=1, stats=stats)
+            subsets += stats['subsets']
+            scored += stats['scored']
+        elapsed = (time.perf_counter() - start) / hands * 1000
+        share = scored / subsets
+        ok = ok and share <= MAX_SCORED_SHARE
+        print(f"best play, {size} cards: {elapsed:.2f} ms per hand, {scored / hands:.0f} plays scored "
+              f"({share:.1%} of subsets, maximum {MAX_SCORED_SHARE:.0%})")
+    return ok
+
+
+def bench_discard_deadline(hand_sizes=(8, 16, 24), hands=20, seed=0):
+    """
+    Check that discard recommendations return within their deadline whatever the hand size.
+
+    Most searches finish well inside DISCARD_DEADLINE_S: random hands of 16
+    or more cards nearly always hold a strong pattern and return before
+    weighing anything. So a large hand built to miss the deadline is searched
+    first: 39 cards, three of every rank, drawing from a deck with one to
+    four copies of each card (by rank) under The Eye with Flush, Straight and
+    Full House played, which leaves 13 Four of a Kind draws of 36 cards, none
+    in the draw-odds table. Then each random hand that weighs more than one keep set is
+    searched again with a deadline of a quarter of its own search time. All
+    of these must come back partial and just as promptly.
+    """
+    from dataclasses import replace
+    from blinds import BOSS_BLINDS
+    from deck import CARD_NAMES, Deck
+    from discard import recommend_discard_strategies
+    from play import update_deck
+
+    def search(hand, deck, deadline=None, blind=None):
+        weighed = []
+        start = time.perf_counter()
+        strategies = recommend_discard_strategies(hand, deck, top_n=5, blind=blind, deadline=deadline,
+                                                  progress=lambda done, total: weighed.append(total))
+        elapsed = (time.perf_counter() - start) * 1000
+        return elapsed, bool(strategies) and not strategies[0]['exact'], max(weighed, default=0)
+
+    limit = DISCARD_DEADLINE_S * 1000 + DISCARD_OVERRUN_MS
+    hand = [CARD_NAMES[rank * 4 + (rank + k) % 4] for rank in range(13) for k in range(3)]
+    deck = Deck([1 + index // 4 % 4 for index in range(52)])
+    deck.remove_cards(hand)
+    blind = replace(BOSS_BLINDS['The Eye'], played_hand_types=['Flush', 'Straight', 'Full House'])
+    elapsed, was_partial, _ = search(hand, deck, DISCARD_DEADLINE_S, blind)
+    ok = elapsed <= limit and was_partial
+    print(f"discard, {len(hand)} cards built to miss the deadline: {elapsed:.1f} ms (limit {limit:.0f} ms), "
+          f"{'partial' if was_partial else 'NOT partial'}")
+
+    rng = random.Random(seed)
+    for size in hand_sizes:
+        worst = over = 0.0
+        partial = cut = searched = 0
+        for _ in range(hands):
+            hand = rng.sample(CARD_NAMES, size)
+            deck = update_deck(hand)
+            elapsed, was_partial, _ = search(hand, deck, DISCARD_DEADLINE_S)
+            worst = max(worst, elapsed)
+            partial += was_partial
+            # Searched again once the caches are warm, then with a deadline it cannot meet
+            elapsed, _, keep_sets = search(hand, deck)
+            if keep_sets > 1:
+                deadline = elapsed / 4
+                tight, was_partial, _ = search(hand, deck, deadline / 1000)
+                over = max(over, tight - deadline)
+                cut += was_partial
+                searched += 1
+        ok = ok and worst <= limit and over <= DISCARD_OVERRUN_MS and cut == searched
+        print(f"discard, {size} cards: worst {worst:.1f} ms (limit {limit:.0f} ms), {partial}/{hands} partial; "
+              f"at a quarter of their search time, {cut}/{searched} partial, worst {over:.1f} ms over "
+              f"(limit {DISCARD_OVERRUN_MS:.0f} ms)")
+    return ok
+
+
+def bench_allocations(hand_sizes=(8, 16, 24), hands=20, seed=0):
+    """Check the memory a best-play plus discard request allocates at its peak, for top_n=5, on average and at worst."""
+    import tracemalloc
+    from deck import CARD_NAMES
+    from discard import recommend_discard_strategies
+    from play import find_best_hands, update_deck
+
+    def request(hand, deck):
+        find_best_hands(hand, top_n=5)
+        recommend_discard_strategies(hand, deck, top_n=5)
+
+    rng = random.Random(seed)
+    ok = True
+    for size in hand_sizes:
+        peaks = []
+        for _ in range(hands):
+            hand = rng.sample(CARD_NAMES, size)
+            deck = update_deck(hand)
+            # Warm the caches first so only the request's own allocations are traced
+            request(hand, deck)
+            tracemalloc.start()
+            request(hand, deck)
+            peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+            tracemalloc.stop()
+        average = sum(peaks) / len(peaks)
+        ok = ok and average <= ALLOCATION_BUDGET_KB and max(peaks) <= ALLOCATION_WORST_KB
+        print(f"allocations, {size} cards: {average:.1f} KiB peak per request on average "
+              f"(budget {ALLOCATION_BUDGET_KB:.0f} KiB), worst {max(peaks):.1f} KiB (budget {ALLOCATION_WORST_KB:.0f} KiB)")
+    return ok
+
+
+BENCHMARKS = {
+    'import': bench_import_time,
+    'best_play': bench_best_play,
+    'discard_deadline': bench_discard_deadline,
+    'allocations': bench_allocations,
+}
+
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+    results = [BENCHMARKS[name]() for name in names]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+# bestPlayTable.py
+
+import mmap
+import os
+import struct
+from bisect import bisect_right
+from array import array
+from artifacts import CACHE_DIR, artifact_path, straight_windows
+from deck import CARD_INDEX, RANKS, SUITS
+
+# Explicit table path; when unset the table built by artifacts.py is used, or a partial build
+TABLE_PATH = os.environ.get('BALATRO_BEST_PLAYS')
+
+# The unfinished table, built chunk by chunk; a build resumes from it
+WORK_NAME = 'bestplays.work'
+
+TABLE_MAGIC = b'BBPT'
+TABLE_VERSION = 2
+HEADER_FORMAT = '<4sHHIII'  # magic, version, hand size, classes, chunk size, chunks
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+HAND_SIZE = 8
+CHUNK_SIZE = 1 << 16
+
+# Hand types 8 distinct standard cards can form, in the order of BASE_HAND_SCORES; a record's pattern id indexes it
+TABLE_TYPES = ('High Card', 'Pair', 'Two Pair', 'Three of a Kind', 'Straight', 'Flush', 'Full House',
+               'Four of a Kind', 'Straight Flush', 'Royal Flush')
+
+# Most pattern chips a play of each type can hold with standard cards (Ace 11, tens and faces 10)
+MAX_PATTERN_CHIPS = {
+    'High Card': 11, 'Pair': 22, 'Two Pair': 42, 'Three of a Kind': 33, 'Straight': 51, 'Flush': 51,
+    'Full House': 53, 'Four of a Kind': 44, 'Straight Flush': 51, 'Royal Flush': 51,
+}
+
+# Record bits: pattern id, types the hand can form, then the played and the scoring cards as
+# masks over the hand's 8 cards in canonical order; 0 marks a record not built yet
+TYPES_SHIFT = 4
+PLAY_SHIFT = 14
+PATTERN_SHIFT = 22
+
+# Suit rank masks a hand can hold (at most 8 ranks), in increasing order; a mask's position is its ordinal
+MASKS = [mask for mask in range(1 << len(RANKS)) if bin(mask).count('1') <= HAND_SIZE]
+ORDINAL = {mask: i for i, mask in enumerate(MASKS)}
+POPCOUNT = [bin(mask).count('1') for mask in MASKS]
+
+
+def _sequence_counts():
+    """
+    Count the sequences of suit masks a canonical hand is made of.
+
+    A hand's canonical form is its four suit masks sorted by ordinal, largest
+    first, so suit-relabelled hands share it. counts[L][x][s] is the number of
+    non-increasing sequences of L ordinals, all below x, whose masks hold s
+    cards; it ranks and unranks canonical hands (see BestPlayTable.rank).
+
+    Returns:
+    - array: uint32 counts, flattened as ((L * (len(MASKS) + 1)) + x) * (HAND_SIZE + 1) + s.
+    """
+    width = HAND_SIZE + 1
+    columns = len(MASKS) + 1
+    counts = array('I', bytes(4 * (len(SUITS) + 1) * columns * width))
+    for x in range(columns):
+        counts[x * width] = 1
+    for length in range(1, len(SUITS) + 1):
+        base, shorter = length * columns * width, (length - 1) * columns * width
+        for x in range(len(MASKS)):
+            bits = POPCOUNT[x]
+            for s in range(width):
+                value = counts[base + x * width + s]
+                if s >= bits:
+                    # Sequences below x + 1 either stay below x or start with x, the rest at most x
+                    value += counts[shorter + (x + 1) * width + s - bits]
+                counts[base + (x + 1) * width + s] = value
+    return counts
+
+
+def canonical_masks(cards):
+    """
+    Return the canonical suit masks of a hand of distinct standard cards and the slot each card fills.
+
+    Returns:
+    - (masks, slots): The suit rank masks, largest first, and for each card
+      its (slot, rank index), the slot being the position of its suit's mask.
+    """
+    masks = [0] * len(SUITS)
+    positions = []
+    for card in cards:
+        rank, suit = divmod(CARD_INDEX[card], len(SUITS))
+        masks[suit] |= 1 << rank
+        positions.append((suit, rank))
+    order = sorted(range(len(SUITS)), key=lambda suit: -masks[suit])
+    slot = {suit: i for i, suit in enumerate(order)}
+    return [masks[suit] for suit in order], [(slot[suit], rank) for suit, rank in positions]
+
+
+def canonical_cards(masks):
+    """Card names of canonical masks, slot i taking the suit SUITS[i], in canonical order (by slot, then rank)."""
+    return [f"{RANKS[rank]} {SUITS[i]}" for i, mask in enumerate(masks)
+            for rank in range(len(RANKS)) if mask >> rank & 1]
+
+
+def types_present(masks):
+    """Return the TABLE_TYPES bitmask of the hand types suit masks can form (Royal Flush also counts as a Straight Flush)."""
+    counts = [sum(mask >> rank & 1 for mask in masks) for rank in range(len(RANKS))]
+    pairs = sum(count >= 2 for count in counts)
+    threes = sum(count >= 3 for count in counts)
+    present = {'High Card'}
+    if pairs:
+        present.add('Pair')
+    if pairs >= 2:
+        present.add('Two Pair')
+    if threes:
+        present.add('Three of a Kind')
+    if threes and pairs >= 2:
+        present.add('Full House')
+    if any(count >= 4 for count in counts):
+        present.add('Four of a Kind')
+    if straight_windows(masks[0] | masks[1] | masks[2] | masks[3]):
+        present.add('Straight')
+    for mask in masks:
+        if bin(mask).count('1') >= 5:
+            present.add('Flush')
+        windows = straight_windows(mask)
+        if windows:
+            present.add('Straight Flush')
+        if windows >> 9 & 1:
+            present.add('Royal Flush')
+    return sum(1 << i for i, pattern in enumerate(TABLE_TYPES) if pattern in present)
+
+
+def _columns(counts):
+    """Split flat sequence counts into lists counts[L][s][x], for bisecting in unrank."""
+    width, columns = HAND_SIZE + 1, len(MASKS) + 1
+    return [[[counts[(length * columns + x) * width + s] for x in range(columns)] for s in range(width)]
+            for length in range(len(SUITS) + 1)]
+
+
+def unrank(rank, columns):
+    """Return the canonical suit masks of the hand with a rank (see BestPlayTable.rank)."""
+    left = HAND_SIZE
+    bound = len(MASKS) - 1
+    masks = []
+    for length in range(len(SUITS), 0, -1):
+        column = columns[length][left]
+        x = bisect_right(column, rank, 0, bound + 1) - 1
+        rank -= column[x]
+        masks.append(MASKS[x])
+        left -= POPCOUNT[x]
+        bound = x
+    return masks
+
+
+def encode_record(masks):
+    """
+    Find the best play of a canonical hand under the base hand scores and pack it into a record.
+
+    Returns:
+    - int: The uint32 record (see the *_SHIFT constants).
+    """
+    import play
+
+    cards = canonical_cards(masks)
+    position = {card: i for i, card in enumerate(cards)}
+    best = play.find_best_hands(cards, top_n=1)[0]
+    play_mask = sum(1 << position[card] for card in best['subset'])
+    pattern_mask = sum(1 << position[card] for card in best['pattern_cards'])
+    return (TABLE_TYPES.index(best['pattern']) | types_present(masks) << TYPES_SHIFT
+            | play_mask << PLAY_SHIFT | pattern_mask << PATTERN_SHIFT)
+
+
+_worker_columns = None
+
+
+def _build_chunk(chunk):
+    """Return (chunk, records as bytes) for the ranks of one chunk; runs in a worker process."""
+    global _worker_columns
+    import play
+
+    # The table holds plays under the base hand scores, whatever planets are set
+    play.HAND_SCORES = play.BASE_HAND_SCORES.copy()
+    if _worker_columns is None:
+        _worker_columns = _columns(_sequence_counts())
+    total = _worker_columns[len(SUITS)][HAND_SIZE][len(MASKS)]
+    start = chunk * CHUNK_SIZE
+    records = array('I', (encode_record(unrank(rank, _worker_columns))
+                          for rank in range(start, min(start + CHUNK_SIZE, total))))
+    return chunk, records.tobytes()
+
+
+def _layout(classes):
+    """Return (chunks, counts offset, records offset) of a table with a number of classes."""
+    chunks = -(-classes // CHUNK_SIZE)
+    counts_offset = HEADER_SIZE + (chunks + 3) // 4 * 4
+    records_offset = counts_offset + 4 * (len(SUITS) + 1) * (len(MASKS) + 1) * (HAND_SIZE + 1)
+    return chunks, counts_offset, records_offset
+
+
+def _create_work_file(path):
+    """Write the header and sequence counts of an empty table; records stay zero (a sparse file) until built."""
+    counts = _sequence_counts()
+    classes = counts[(len(SUITS) * (len(MASKS) + 1) + len(MASKS)) * (HAND_SIZE + 1) + HAND_SIZE]
+    chunks, counts_offset, records_offset = _layout(classes)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(struct.pack(HEADER_FORMAT, TABLE_MAGIC, TABLE_VERSION, HAND_SIZE, classes, CHUNK_SIZE, chunks))
+        f.seek(counts_offset)
+        f.write(counts.tobytes())
+        f.truncate(records_offset + 4 * classes)
+    os.replace(tmp_path, path)
+
+
+def build_chunks(path, processes=None, limit=None, progress=None):
+    """
+    Build the chunks of a table file that are not done yet, on every core.
+
+    The file is created on first use. Each chunk's records are written and
+    then marked done, so an interrupted build resumes where it stopped.
+
+    Parameters:
+    - path (str): The work file.
+    - processes (int): Worker processes (defaults to the CPU count).
+    - limit (int): Most chunks to build in this run (defaults to all that are left).
+    - progress: Optional progress(done, total) callback counting chunks.
+
+    Returns:
+    - (done, total): Chunks done and chunks in the table.
+    """
+    from multiprocessing import Pool
+
+    if not os.path.exists(path):
+        _create_work_file(path)
+    with open(path, 'r+b') as f:
+        magic, version, hand_size, classes, chunk_size, chunks = struct.unpack(HEADER_FORMAT, f.read(HEADER_SIZE))
+        if magic != TABLE_MAGIC or version != TABLE_VERSION or chunk_size != CHUNK_SIZE:
+            raise ValueError(f"Error: '{path}' is not a compatible best-play table; delete it to start over.")
+        done = bytearray(f.read(chunks))
+        pending = [chunk for chunk in range(chunks) if not done[chunk]][:limit]
+        records_offset = _layout(classes)[2]
+        finished = chunks - len([chunk for chunk in range(chunks) if not done[chunk]])
+        if pending:
+            with Pool(processes) as pool:
+                for chunk, records in pool.imap_unordered(_build_chunk, pending):
+                    f.seek(records_offset + 4 * chunk * CHUNK_SIZE)
+                    f.write(records)
+                    f.flush()
+                    f.seek(HEADER_SIZE + chunk)
+                    f.write(b'\x01')
+                    f.flush()
+                    finished += 1
+                    if progress is not None:
+                        progress(finished, chunks)
+    return finished, chunks
+
+
+class BestPlayTable:
+    """
+    Read-only view of a best-play table file through mmap.
+
+    Layout: header, a done flag per chunk, the uint32 sequence counts that
+    rank canonical hands, then one uint32 record per canonical hand.
+    """
+
+    def __init__(self, path):
+        """
+        Open and validate a table file.
+
+        Parameters:
+        - path (str): Path to a finished table or a partial work file.
+        """
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, hand_size, classes, chunk_size, chunks = struct.unpack_from(HEADER_FORMAT, self._mmap, 0)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION or hand_size != HAND_SIZE:
+            self._mmap.close()
+            raise ValueError(f"Error: '{path}' is not a compatible best-play table.")
+        self.classes = classes
+        self.chunks = chunks
+        self._counts_offset, self._records_offset = _layout(classes)[1:]
+
+    def done(self):
+        """Return the number of chunks built."""
+        return sum(self._mmap[HEADER_SIZE:HEADER_SIZE + self.chunks])
+
+    def rank(self, masks):
+        """Return the rank of canonical suit masks among all canonical hands."""
+        width, columns = HAND_SIZE + 1, len(MASKS) + 1
+        rank = 0
+        left = HAND_SIZE
+        for i, mask in enumerate(masks):
+            x = ORDINAL[mask]
+            offset = self._counts_offset + 4 * (((len(SUITS) - i) * columns + x) * width + left)
+            rank += struct.unpack_from('<I', self._mmap, offset)[0]
+            left -= POPCOUNT[x]
+        return rank
+
+    def record(self, masks):
+        """Return the record of canonical suit masks (0 if its chunk is not built yet)."""
+        return struct.unpack_from('<I', self._mmap, self._records_offset + 4 * self.rank(masks))[0]
+
+
+_table = None
+_table_loaded = False
+
+
+def get_table():
+    """Open the best-play table on first use; returns None when none has been built or started."""
+    global _table, _table_loaded
+    if not _table_loaded:
+        _table_loaded = True
+        path = TABLE_PATH or artifact_path('bestplays')
+        if path is None and os.path.exists(os.path.join(CACHE_DIR, WORK_NAME)):
+            path = os.path.join(CACHE_DIR, WORK_NAME)
+        if path and os.path.exists(path):
+            try:
+                _table = BestPlayTable(path)
+            except ValueError as e:
+                print(f"Warning: {e} Falling back to direct computation.")
+    return _table
+
+
+def lookup_best_play(cards, blind=None):
+    """
+    Look up the best play of a hand in the best-play table.
+
+    Only 8 distinct standard cards without a Boss Blind are covered. The
+    stored play is scored with the current (planet-levelled) hand scores; when
+    levels let a hand type the cards can form possibly outscore it, the table
+    cannot tell the best play and None is returned.
+
+    Parameters:
+    - cards (list): Card names.
+    - blind: Active BossBlind, or None.
+
+    Returns:
+    - list: [PlayResult] as find_best_hands(cards, top_n=1) would return,
+      or None when the table does not cover the hand (search instead).
+    """
+    import play
+    from results import PlayResult
+
+    if blind is not None or len(cards) != HAND_SIZE or len(set(cards)) != HAND_SIZE:
+        return None
+    if not all(card in CARD_INDEX for card in cards):
+        return None
+    table = get_table()
+    if table is None:
+        return None
+    masks, slots = canonical_masks(cards)
+    record = table.record(masks)
+    if not record:
+        return None
+
+    # A card's position in canonical order: by slot, then by rank
+    canonical = sorted(range(HAND_SIZE), key=lambda i: slots[i])
+    position = {i: p for p, i in enumerate(canonical)}
+    play_cards = [cards[i] for i in range(HAND_SIZE) if record >> (PLAY_SHIFT + position[i]) & 1]
+    pattern_cards = [cards[i] for i in range(HAND_SIZE) if record >> (PATTERN_SHIFT + position[i]) & 1]
+    pattern = TABLE_TYPES[record & 0xF]
+    score, base_chips, mult = play.score_pattern(pattern, pattern_cards)
+    if play.HAND_SCORES != play.BASE_HAND_SCORES:
+        for i, other in enumerate(TABLE_TYPES):
+            if other != pattern and record >> (TYPES_SHIFT + i) & 1:
+                chips, other_mult = play.HAND_SCORES[other]
+                if (chips + MAX_PATTERN_CHIPS[other]) * other_mult > score:
+                    return None
+    return [PlayResult(tuple(play_cards), pattern, pattern_cards, score, base_chips, mult)]
+
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Build the table of best plays for every 8-card hand.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help="Build (or resume building) the table on every core.")
+    build.add_argument('--workers', type=int, default=None, help="Processes to use (default: every core).")
+    build.add_argument('--limit', type=int, default=None, help="Most chunks to build in this run.")
+    subparsers.add_parser('info', help="Show how much of the table is built.")
+    args = parser.parse_args()
+
+    work_path = os.path.join(CACHE_DIR, WORK_NAME)
+    if args.command == 'info':
+        table = get_table()
+        if table is None:
+            print("No best-play table yet; run `python bestPlayTable.py build`.")
+        else:
+            print(f"{table.classes} canonical hands, {table.done()}/{table.chunks} chunks built.")
+        return
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    start = time.perf_counter()
+    try:
+        done, total = build_chunks(work_path, args.workers, args.limit,
+                                   progress=lambda done, total: print(f"Chunk {done}/{total} "
+                                                                      f"({time.perf_counter() - start:.0f} s)"))
+    except KeyboardInterrupt:
+        print("\nInterrupted; run build again to resume.")
+        return
+    except ValueError as e:
+        print(e)
+        raise SystemExit(2)
+    if done < total:
+        print(f"{done}/{total} chunks built; run build again to continue.")
+        return
+    from artifacts import register_artifact
+
+    print(f"Done: {register_artifact('bestplays', work_path)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# blinds.py
+
+from dataclasses import dataclass, field
+from cards import CardTable
+from deck import SUIT_INDEX
+
+
+@dataclass
+class BossBlind:
+    """A Boss Blind and the constraints it puts on what can be played or scored."""
+    name: str
+    description: str
+    min_cards: int = 0                 # The Psychic: plays must hold this many cards
+    unique_hand_types: bool = False    # The Eye: no hand type may be repeated this round
+    single_hand_type: bool = False     # The Mouth: only the first hand type played this round
+    debuffed_suit: str = None          # The Club, The Goad, ...: cards of this suit do not score
+    played_hand_types: list = field(default_factory=list)  # Hand types played so far this round
+
+    def allowed_patterns(self, patterns):
+        """Return the pattern names from patterns that may still be played this round."""
+        if self.unique_hand_types:
+            return [pattern for pattern in patterns if pattern not in self.played_hand_types]
+        if self.single_hand_type and self.played_hand_types:
+            return [pattern for pattern in patterns if pattern == self.played_hand_types[0]]
+        return list(patterns)
+
+    def record_play(self, pattern):
+        """Record a hand type played this round."""
+        self.played_hand_types.append(pattern)
+
+    def reset(self):
+        """Forget the hands played, e.g. when a new round starts."""
+        self.played_hand_types.clear()
+
+    def is_debuffed(self, card):
+        """Check whether a card name belongs to the debuffed suit."""
+        return self.debuffed_suit is not None and card.split()[1] == self.debuffed_suit
+
+    def debuffed_table(self, table):
+        """
+        Return a copy of a CardTable in which cards of the debuffed suit score nothing.
+
+        Debuffed cards still count toward hand detection, so only the scoring
+        columns are cleared. Wild cards belong to every suit and are debuffed too.
+        """
+        if self.debuffed_suit is None:
+            return table
+        debuffed = CardTable()
+        for column in vars(table):
+            setattr(debuffed, column, getattr(table, column)[:])
+        suit_bit = 1 << SUIT_INDEX[self.debuffed_suit]
+        for card_id in range(len(table)):
+            if table.suit_mask[card_id] & suit_bit:
+                debuffed.chips[card_id] = 0
+                debuffed.mult[card_id] = 0
+                debuffed.xmult[card_id] = 1.0
+                debuffed.held_xmult[card_id] = 1.0
+        return debuffed
+
+
+# Define the supported Boss Blinds
+BOSS_BLINDS = {
+    'The Psychic': BossBlind('The Psychic', 'Must play 5 cards', min_cards=5),
+    'The Eye': BossBlind('The Eye', 'No repeat hand types this round', unique_hand_types=True),
+    'The Mouth': BossBlind('The Mouth', 'Play only 1 hand type this round', single_hand_type=True),
+    'The Club': BossBlind('The Club', 'All Club cards are debuffed', debuffed_suit='Club'),
+    'The Goad': BossBlind('The Goad', 'All Spade cards are debuffed', debuffed_suit='Spade'),
+    'The Head': BossBlind('The Head', 'All Heart cards are debuffed', debuffed_suit='Heart'),
+    'The Window': BossBlind('The Window', 'All Diamond cards are debuffed', debuffed_suit='Diamond'),
+}
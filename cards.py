@@ -0,0 +1,191 @@
+# cards.py
+
+import re
+from array import array
+from deck import SUITS, RANK_MAP, VALUE_MAP, SUIT_INDEX
+
+ENHANCEMENTS = ['None', 'Bonus', 'Mult', 'Wild', 'Glass', 'Steel', 'Stone']
+EDITIONS = ['None', 'Foil', 'Holographic', 'Polychrome']
+SEALS = ['None', 'Gold', 'Red', 'Blue', 'Purple']
+
+# Short names accepted by parse_card_table, e.g. "ah:glass:poly"
+MODIFIER_ALIASES = {
+    **{name.lower(): ('enhancement', name) for name in ENHANCEMENTS[1:]},
+    **{name.lower(): ('edition', name) for name in EDITIONS[1:]},
+    **{name.lower(): ('seal', name) for name in SEALS[1:]},
+    'holo': ('edition', 'Holographic'),
+    'poly': ('edition', 'Polychrome'),
+}
+
+# A Wild card belongs to every suit; a Stone card to none
+ALL_SUITS_MASK = (1 << len(SUITS)) - 1
+
+
+class CardTable:
+    """
+    Playing cards stored as parallel arrays indexed by card id.
+
+    Besides the raw attributes, each card's scoring contribution is precomputed
+    into flat columns (chips, mult, xmult, triggers, held xmult) so scoring a
+    hand is a single pass over ids without building per-card objects.
+    """
+
+    def __init__(self):
+        """Initialize an empty CardTable."""
+        self.names = []
+        self.rank = array('b')         # Rank value 2..14, or 0 for rank-less Stone cards
+        self.suit_mask = array('B')    # One bit per suit in deck.SUITS order
+        self.enhancement = array('B')  # Index into ENHANCEMENTS
+        self.edition = array('B')      # Index into EDITIONS
+        self.seal = array('B')         # Index into SEALS
+        self.chips = array('h')        # Chips added when the card scores
+        self.mult = array('h')         # Mult added when the card scores
+        self.xmult = array('d')        # Mult multiplier when the card scores
+        self.triggers = array('B')     # Times the card scores (Red Seal retriggers)
+        self.held_xmult = array('d')   # Mult multiplier while held in hand (Steel)
+
+    @classmethod
+    def from_names(cls, names):
+        """
+        Build a table of plain cards.
+
+        Parameters:
+        - names (list): Card names (e.g., 'Ace Heart'); duplicates allowed.
+
+        Returns:
+        - (CardTable, list): The table and the card ids in the same order as names.
+        """
+        table = cls()
+        return table, [table.add(name) for name in names]
+
+    def add(self, card, enhancement='None', edition='None', seal='None'):
+        """
+        Add a card and return its id.
+
+        Parameters:
+        - card (str): Card name (e.g., 'Ace Heart').
+        - enhancement (str): One of ENHANCEMENTS.
+        - edition (str): One of EDITIONS.
+        - seal (str): One of SEALS.
+
+        Returns:
+        - int: The new card's id.
+        """
+        try:
+            value, suit = card.split()
+            rank = RANK_MAP[value]
+            suit_bit = 1 << SUIT_INDEX[suit]
+            enhancement_code = ENHANCEMENTS.index(enhancement)
+            edition_code = EDITIONS.index(edition)
+            seal_code = SEALS.index(seal)
+        except (ValueError, KeyError):
+            raise ValueError(f"Error: Invalid card '{card}' ({enhancement}, {edition}, {seal}).") from None
+
+        chips = VALUE_MAP[value]
+        mult = 0
+        xmult = 1.0
+        if enhancement == 'Stone':
+            rank, suit_bit, chips = 0, 0, 50
+        elif enhancement == 'Wild':
+            suit_bit = ALL_SUITS_MASK
+        elif enhancement == 'Bonus':
+            chips += 30
+        elif enhancement == 'Mult':
+            mult += 4
+        elif enhancement == 'Glass':
+            xmult *= 2
+        if edition == 'Foil':
+            chips += 50
+        elif edition == 'Holographic':
+            mult += 10
+        elif edition == 'Polychrome':
+            xmult *= 1.5
+
+        self.names.append(card)
+        self.rank.append(rank)
+        self.suit_mask.append(suit_bit)
+        self.enhancement.append(enhancement_code)
+        self.edition.append(edition_code)
+        self.seal.append(seal_code)
+        self.chips.append(chips)
+        self.mult.append(mult)
+        self.xmult.append(xmult)
+        self.triggers.append(2 if seal == 'Red' else 1)
+        self.held_xmult.append(1.5 if enhancement == 'Steel' else 1.0)
+        return len(self.names) - 1
+
+    def card_key(self, card_id):
+        """Return a tuple identifying a card up to its attributes (equal for identical copies)."""
+        return (self.names[card_id], self.enhancement[card_id], self.edition[card_id], self.seal[card_id])
+
+    def describe(self, card_id):
+        """Return the card name followed by any enhancement, edition and seal."""
+        extras = [ENHANCEMENTS[self.enhancement[card_id]], EDITIONS[self.edition[card_id]], SEALS[self.seal[card_id]]]
+        extras = [extra for extra in extras if extra != 'None']
+        return f"{self.names[card_id]} ({', '.join(extras)})" if extras else self.names[card_id]
+
+    def __len__(self):
+        return len(self.names)
+
+
+def parse_card_table(s):
+    """
+    Parses a string of cards with optional modifiers into a CardTable.
+    Example input: "ah:glass kh:wild:foil 10s:red 3c:stone"
+
+    Returns:
+    - (CardTable, list): The table and the ids of the parsed cards in input order.
+    """
+    suits = {'H': 'Heart', 'D': 'Diamond', 'S': 'Spade', 'C': 'Club'}
+    values = {'A': 'Ace', 'J': 'Jack', 'Q': 'Queen', 'K': 'King'}
+    pattern = r'([2-9]|10|[AJQK])([HDSC])((?::[A-Z]+)*)'
+    matches = re.findall(pattern, s, re.I)
+    if not matches:
+        raise ValueError("Error: No valid cards found in the input.")
+    table = CardTable()
+    ids = []
+    for v, suit, modifiers in matches:
+        attributes = {}
+        for modifier in filter(None, modifiers.lower().split(':')):
+            if modifier not in MODIFIER_ALIASES:
+                raise ValueError(f"Error: Unknown card modifier '{modifier}'.")
+            kind, name = MODIFIER_ALIASES[modifier]
+            attributes[kind] = name
+        card = f"{values.get(v.upper(), v.upper())} {suits[suit.upper()]}"
+        ids.append(table.add(card, **attributes))
+    return table, ids
+
+
+def score_cards(table, card_ids, base_chips, base_mult, held_ids=()):
+    """
+    Score played cards in one pass: chips and mult are added, xmult multiplied, per trigger.
+
+    Parameters:
+    - table (CardTable): Table holding the cards.
+    - card_ids (iterable): Ids of the scoring cards, in play order.
+    - base_chips (int): Chips of the hand type.
+    - base_mult (int): Mult of the hand type.
+    - held_ids (iterable): Ids of cards kept in hand (Steel cards multiply mult).
+
+    Returns:
+    - (score, chips, mult): The final score and the chips and mult it was computed from.
+    """
+    chips_col, mult_col, xmult_col, triggers_col = table.chips, table.mult, table.xmult, table.triggers
+    chips = base_chips
+    mult = base_mult
+    for card_id in card_ids:
+        triggers = triggers_col[card_id]
+        while triggers:
+            chips += chips_col[card_id]
+            mult += mult_col[card_id]
+            if xmult_col[card_id] != 1.0:
+                mult *= xmult_col[card_id]
+            triggers -= 1
+    held_col = table.held_xmult
+    for card_id in held_ids:
+        if held_col[card_id] != 1.0:
+            triggers = triggers_col[card_id]
+            while triggers:
+                mult *= held_col[card_id]
+                triggers -= 1
+    return int(chips * mult), chips, mult
@@ -0,0 +1,254 @@
+# clear.py
+
+import math
+import random
+from collections import Counter
+from deck import CARD_NAMES, as_deck, count_outcomes, draw_outcomes, draw_probability
+from play import parse_playing_cards, find_best_hands, update_deck
+from discard import recommend_discard_strategies
+
+# Most cards Balatro lets you discard at once
+MAX_DISCARD = 5
+
+# Score buckets per target: in memo keys, the score still needed is rounded up to 1/SCORE_BUCKETS of the target
+SCORE_BUCKETS = 20
+
+# Draws sampled after each root action
+SAMPLES = 16
+
+# Draws after a root action are enumerated exactly when there are at most this many distinct ones
+EXACT_DRAWS = 64
+
+
+class ClearSolver:
+    """
+    Memoized search for the chance of clearing a blind over the rest of a round.
+
+    The value of a state (hand, deck, hands left, discards left, score still
+    needed) is the best clear probability over its actions: playing one of
+    the best plays from find_best_hands, or making one of the best discards
+    from recommend_discard_strategies. The value of an action is its
+    expectation over the draws that follow, weighted by their probability
+    from the deck's counts.
+
+    Every draw after a root action is enumerated when there are at most
+    EXACT_DRAWS distinct ones (e.g., one card from a standard deck);
+    otherwise, and below the root, draws are sampled, so the result is an
+    estimate. States are memoized on the deck's card counts, the sorted hand,
+    the hands and discards left and the score still needed rounded up to a
+    bucket; plays are always compared with the exact score still needed.
+    """
+
+    def __init__(self, target, samples=SAMPLES, plays=2, discards=2, seed=0, blind=None):
+        """
+        Initialize a ClearSolver.
+
+        Parameters:
+        - target (int): Score the blind requires, used to size the score buckets.
+        - samples (int): Draws sampled after a root action; divided by 8 at the next level, then by 4 at each one below.
+        - plays (int): Best plays tried per state near the root (one further down).
+        - discards (int): Best discards tried per state near the root (one further down).
+        - seed (int): Seed for the sampled draws, so results are reproducible.
+        - blind: Active BossBlind, or None.
+
+        Set `tick` to a callable to have it run at every state visited; it may
+        raise to abandon the search.
+        """
+        self.bucket = max(1, math.ceil(target / SCORE_BUCKETS))
+        self.samples = samples
+        self.plays = plays
+        self.discards = discards
+        self.rng = random.Random(seed)
+        self.blind = blind
+        self.memo = {}
+        self.stats = {'states': 0, 'hits': 0}
+        self.tick = None
+
+    def round_needed(self, needed):
+        """Round a score still needed up to its bucket."""
+        return -(-needed // self.bucket) * self.bucket
+
+    def state_key(self, hand, deck, hands_left, discards_left, needed):
+        """Return the memo key of a state: deck counts, sorted hand, hands and discards left, bucketed score needed."""
+        return tuple(deck.counts), tuple(sorted(hand)), hands_left, discards_left, self.round_needed(needed)
+
+    def actions(self, hand, deck, discards_left, depth):
+        """
+        List the actions worth trying in a state.
+
+        Returns:
+        - list: Dicts with 'type' ('play' or 'discard'), 'cards', 'pattern' and,
+          for plays, 'score'.
+        """
+        width = 1 if depth >= 2 else None
+        actions = []
+        for play in find_best_hands(hand, top_n=width or self.plays, blind=self.blind):
+            actions.append({'type': 'play', 'cards': play['pattern_cards'], 'pattern': play['pattern'],
+                            'score': play['score']})
+        if discards_left and len(deck):
+            strategies = recommend_discard_strategies(hand, deck, top_n=width or self.discards, blind=self.blind)
+            for strategy in strategies:
+                if 0 < len(strategy['discard']) <= MAX_DISCARD:
+                    actions.append({'type': 'discard', 'cards': strategy['discard'], 'pattern': strategy['pattern']})
+        return actions
+
+    def draws(self, hand, deck, cards, depth):
+        """
+        Return the draws replacing cards in hand, and whether they are exact.
+
+        Returns:
+        - tuple: ([(probability, new hand, new deck)], exact). Exact draws are
+          every distinct draw with its probability; sampled ones are the
+          distinct sampled draws with their share of the samples.
+        """
+        kept = list(hand)
+        for card in cards:
+            kept.remove(card)
+        count = min(len(cards), len(deck))
+        if count == 0:
+            return [(1.0, kept, deck)], True
+        samples = max(1, self.samples >> (2 * depth + 1)) if depth else self.samples
+        exact = depth == 0 and count_outcomes(deck, count) <= EXACT_DRAWS
+        if exact:
+            total = math.comb(len(deck), count)
+            weighted = [(draw_probability(dict(outcome), deck, total), outcome)
+                        for outcome in draw_outcomes(deck, count)]
+        else:
+            pool = [index for index, copies in enumerate(deck.counts) for _ in range(copies)]
+            drawn = Counter(tuple(sorted(Counter(self.rng.sample(pool, count)).items())) for _ in range(samples))
+            weighted = [(n / samples, outcome) for outcome, n in drawn.items()]
+        results = []
+        for probability, outcome in weighted:
+            new_cards = [CARD_NAMES[index] for index, k in outcome for _ in range(k)]
+            new_deck = deck.copy()
+            new_deck.remove_cards(new_cards)
+            results.append((probability, kept + new_cards, new_deck))
+        return results, exact
+
+    def action_outcomes(self, action, hand, deck, hands_left, discards_left, needed, depth):
+        """
+        Return the clear probability after each draw that follows action.
+
+        Returns:
+        - tuple: ([(probability of the draw, clear probability after it)], exact).
+        """
+        if action['type'] == 'play':
+            if action['score'] >= needed:
+                return [(1.0, 1.0)], True
+            hands_left -= 1
+            needed -= action['score']
+            if not hands_left:
+                return [(1.0, 0.0)], True
+        else:
+            discards_left -= 1
+        draws, exact = self.draws(hand, deck, action['cards'], depth)
+        return [(probability, self.value(new_hand, new_deck, hands_left, discards_left, needed, depth + 1))
+                for probability, new_hand, new_deck in draws], exact
+
+    def action_value(self, action, hand, deck, hands_left, discards_left, needed, depth):
+        """Clear probability of taking action: its expectation over the draws that follow."""
+        outcomes, _ = self.action_outcomes(action, hand, deck, hands_left, discards_left, needed, depth)
+        return sum(probability * value for probability, value in outcomes)
+
+    def value(self, hand, deck, hands_left, discards_left, needed, depth=0):
+        """Return the chance of clearing from a state with its best action."""
+        if needed <= 0:
+            return 1.0
+        if not hands_left or not hand:
+            return 0.0
+        if self.tick is not None:
+            self.tick()
+        key = self.state_key(hand, deck, hands_left, discards_left, needed)
+        self.stats['states'] += 1
+        if key in self.memo:
+            self.stats['hits'] += 1
+            return self.memo[key]
+
+        best = 0.0
+        for action in self.actions(hand, deck, discards_left, depth):
+            best = max(best, self.action_value(action, hand, deck, hands_left, discards_left, needed, depth))
+            if best >= 1.0:
+                break
+        self.memo[key] = best
+        return best
+
+
+def clear_probability(hand, remaining_deck, target, hands_left, discards_left, samples=SAMPLES, seed=0, blind=None,
+                      progress=None):
+    """
+    Estimate the chance of reaching target chips with the hands and discards left.
+
+    Parameters:
+    - hand (list): Cards in hand.
+    - remaining_deck: Deck (or card names) still to be drawn.
+    - target (int): Chips still needed to clear the blind.
+    - hands_left (int): Hands left to play this round.
+    - discards_left (int): Discards left this round.
+    - samples (int): Draws sampled after each root action (see ClearSolver).
+    - seed (int): Seed for the sampled draws.
+    - blind: Active BossBlind, or None.
+    - progress: Optional progress(done, total) callback counting root actions; it may raise to abandon the search.
+
+    Returns:
+    - dict: 'probability' of clearing with the best action and the standard
+      'error' of its root draws (0 when they were enumerated exactly; at most
+      0.5 / sqrt(samples - 1) when sampled), 'action' to take (see
+      ClearSolver.actions), 'actions', every root action with its own
+      'probability', 'error' and 'exact' flag, best first, and 'states'
+      searched and memo 'hits'.
+    """
+    if target <= 0:
+        return {'probability': 1.0, 'error': 0.0, 'action': None, 'actions': [], 'samples': samples, 'states': 0,
+                'hits': 0}
+    deck = as_deck(remaining_deck)
+    solver = ClearSolver(target, samples=samples, seed=seed, blind=blind)
+    actions = solver.actions(hand, deck, discards_left, 0) if hands_left else []
+    for done, action in enumerate(actions):
+        if progress is not None:
+            progress(done, len(actions))
+            solver.tick = lambda: progress(done, len(actions))
+        outcomes, exact = solver.action_outcomes(action, hand, deck, hands_left, discards_left, target, 0)
+        mean = sum(probability * value for probability, value in outcomes)
+        action['probability'] = mean
+        action['exact'] = exact
+        # Standard error of the mean over the sampled draws (each weighted by its share of the samples)
+        spread = sum(probability * (value - mean) ** 2 for probability, value in outcomes)
+        action['error'] = 0.0 if exact or samples < 2 else math.sqrt(spread / (samples - 1))
+    if progress is not None:
+        progress(len(actions), len(actions))
+    # Ties go to the higher scoring play, then to plays over discards
+    actions.sort(key=lambda action: (action['probability'], action.get('score', -1)), reverse=True)
+    best = actions[0] if actions else None
+    return {'probability': best['probability'] if best else 0.0, 'error': best['error'] if best else 0.0,
+            'action': best, 'actions': actions, 'samples': samples, **solver.stats}
+
+
+def describe_action(action):
+    """Return a one-line description of a clear_probability action."""
+    if action is None:
+        return "Nothing to do"
+    if action['type'] == 'play':
+        return f"Play {action['pattern']} ({', '.join(action['cards'])}) for {action['score']}"
+    return f"Discard {', '.join(action['cards'])} aiming for {action['pattern']}"
+
+
+def main():
+    try:
+        user_input = input("Enter the playing cards string (e.g., 7h10h2s3dah9c): ").strip()
+        hand, n = parse_playing_cards(user_input)
+        target = int(input("Chips needed to clear the blind: ").strip())
+        hands_left = int(input("Hands left: ").strip())
+        discards_left = int(input("Discards left: ").strip())
+
+        result = clear_probability(hand, update_deck(hand), target, hands_left, discards_left)
+        print(f"\nEstimated chance to clear: {result['probability'] * 100:.1f}% "
+              f"± {result['error'] * 100:.1f}% ({result['samples']} sampled draws per action)")
+        print(f"Best action: {describe_action(result['action'])}")
+        for action in result['actions'][1:]:
+            print(f"  {describe_action(action)}: {action['probability'] * 100:.1f}%")
+    except ValueError as e:
+        print(e)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+# deck.py
+
+from math import comb
+
+# Card ranks and suits in matrix order; a card's index is rank_index * 4 + suit_index.
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
+SUITS = ['Heart', 'Diamond', 'Spade', 'Club']
+FACE_RANKS = {'Jack', 'Queen', 'King'}
+
+RANK_INDEX = {rank: i for i, rank in enumerate(RANKS)}
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+CARD_NAMES = [f"{rank} {suit}" for rank in RANKS for suit in SUITS]
+CARD_INDEX = {name: i for i, name in enumerate(CARD_NAMES)}
+
+# Define global maps for card ranks and chip values
+RANK_MAP = {
+    '2': 2, '3': 3, '4': 4, '5':5, '6':6,
+    '7':7, '8':8, '9':9, '10':10,
+    'Jack':11, 'Queen':12, 'King':13, 'Ace':14
+}
+
+VALUE_MAP = {
+    '2': 2, '3': 3, '4': 4, '5': 5, '6': 6,
+    '7': 7, '8': 8, '9': 9, '10': 10,
+    'Jack': 10, 'Queen': 10, 'King': 10, 'Ace': 11
+}
+
+
+def card_index(card):
+    """Return the matrix index of a card name (e.g., 'Ace Spade' -> 50)."""
+    try:
+        return CARD_INDEX[card]
+    except KeyError:
+        raise ValueError(f"Error: Unknown card '{card}'.") from None
+
+
+class Deck:
+    """
+    A multiset of cards stored as a 13 x 4 rank-by-suit count matrix.
+
+    Rank and suit totals are kept up to date on every change, so the probability
+    code reads them in constant time whatever the deck size.
+    """
+
+    def __init__(self, counts=None):
+        """
+        Initialize a Deck.
+
+        Parameters:
+        - counts (list): 52 card counts in matrix order (defaults to an empty deck).
+        """
+        self.counts = [0] * len(CARD_NAMES)
+        # Rank totals are indexed by rank value (2..14), matching RANK_MAP in play.py
+        self.rank_totals = [0] * 15
+        self.suit_totals = dict.fromkeys(SUITS, 0)
+        self.total = 0
+        for index, count in enumerate(counts or []):
+            if count:
+                self._adjust(index, count)
+
+    @classmethod
+    def from_cards(cls, cards):
+        """Build a Deck holding the given card names (duplicates allowed)."""
+        deck = cls()
+        for card in cards:
+            deck.add(card)
+        return deck
+
+    def copy(self):
+        """Return an independent copy of the deck."""
+        deck = Deck.__new__(Deck)
+        deck.counts = self.counts[:]
+        deck.rank_totals = self.rank_totals[:]
+        deck.suit_totals = dict(self.suit_totals)
+        deck.total = self.total
+        return deck
+
+    def _adjust(self, index, qty):
+        self.counts[index] += qty
+        self.rank_totals[index // 4 + 2] += qty
+        self.suit_totals[SUITS[index % 4]] += qty
+        self.total += qty
+
+    def count(self, card):
+        """Return how many copies of a card are in the deck."""
+        return self.counts[card_index(card)]
+
+    def add(self, card, qty=1):
+        """Add one or more copies of a card."""
+        self._adjust(card_index(card), qty)
+
+    def remove(self, card, qty=1):
+        """Remove one or more copies of a card, raising ValueError if there are not enough."""
+        index = card_index(card)
+        if self.counts[index] < qty:
+            raise ValueError(f"Error: '{card}' is not available in the deck.")
+        self._adjust(index, -qty)
+
+    def mask(self):
+        """Return a 52-bit mask of the cards present, bit i set for CARD_NAMES[i]."""
+        mask = 0
+        for index, count in enumerate(self.counts):
+            if count:
+                mask |= 1 << index
+        return mask
+
+    def missing(self, cards):
+        """Return the cards (with multiplicity) that the deck cannot supply."""
+        needed = {}
+        for card in cards:
+            needed[card] = needed.get(card, 0) + 1
+        missing = []
+        for card, qty in needed.items():
+            missing.extend([card] * max(0, qty - self.count(card)))
+        return missing
+
+    def remove_cards(self, cards):
+        """Remove every card in cards, or none of them if any is unavailable."""
+        cards = list(cards)
+        missing = self.missing(cards)
+        if missing:
+            raise ValueError(f"The following cards are not available in the deck: {', '.join(missing)}")
+        for card in cards:
+            self._adjust(CARD_INDEX[card], -1)
+
+    def __len__(self):
+        return self.total
+
+    def __contains__(self, card):
+        return card in CARD_INDEX and self.counts[CARD_INDEX[card]] > 0
+
+    def __iter__(self):
+        for index, count in enumerate(self.counts):
+            for _ in range(count):
+                yield CARD_NAMES[index]
+
+
+class Zones:
+    """
+    A run's cards split between the draw pile, the hand, the discard pile and the played pile.
+
+    Each zone is a Deck, so moving a card is one count update in each of two
+    zones, and the probability and search engines can be handed the draw pile
+    as is.
+    """
+
+    NAMES = ('draw', 'hand', 'discard', 'played')
+
+    def __init__(self, draw):
+        """
+        Initialize Zones with every card in the draw pile.
+
+        Parameters:
+        - draw (Deck): The full deck (e.g., from make_deck); it becomes the draw pile.
+        """
+        self.draw = draw
+        self.hand = Deck()
+        self.discard = Deck()
+        self.played = Deck()
+
+    def zone(self, name):
+        """Return the Deck of a zone by name (see NAMES)."""
+        if name not in self.NAMES:
+            raise ValueError(f"Error: Unknown zone '{name}'. Choose from {', '.join(self.NAMES)}.")
+        return getattr(self, name)
+
+    def move(self, cards, source, target):
+        """
+        Move cards from one zone to another, or none of them if the source lacks any.
+
+        Parameters:
+        - cards: Card names to move (duplicates allowed).
+        - source (str): Zone to take them from.
+        - target (str): Zone to put them in.
+        """
+        cards = list(cards)
+        source, target = self.zone(source), self.zone(target)
+        missing = source.missing(cards)
+        if missing:
+            raise ValueError(f"The following cards are not available in the deck: {', '.join(missing)}")
+        for card in cards:
+            index = CARD_INDEX[card]
+            source._adjust(index, -1)
+            target._adjust(index, 1)
+
+    def set_hand(self, cards, left_to='discard'):
+        """
+        Make cards the hand: cards no longer held go to left_to, new ones come from the draw pile.
+
+        Nothing moves if the draw pile cannot supply the new cards.
+
+        Parameters:
+        - cards: The card names now in hand.
+        - left_to (str): Zone for the cards that left the hand ('discard' or 'played').
+
+        Returns:
+        - (drawn, left): The card names drawn and the ones that left the hand.
+        """
+        cards = list(cards)
+        held = self.hand.counts[:]
+        drawn = []
+        for card in cards:
+            index = card_index(card)
+            if held[index]:
+                held[index] -= 1
+            else:
+                drawn.append(card)
+        left = [CARD_NAMES[index] for index, count in enumerate(held) for _ in range(count)]
+        missing = self.draw.missing(drawn)
+        if missing:
+            raise ValueError(f"The following cards are not available in the deck: {', '.join(missing)}")
+        self.move(left, 'hand', left_to)
+        self.move(drawn, 'draw', 'hand')
+        return drawn, left
+
+    def reset(self):
+        """Start a new blind: shuffle the hand, discard pile and played pile back into the draw pile."""
+        for zone in (self.hand, self.discard, self.played):
+            for index, count in enumerate(zone.counts):
+                if count:
+                    self.draw._adjust(index, count)
+            zone.__init__()
+
+    def __len__(self):
+        return sum(len(self.zone(name)) for name in self.NAMES)
+
+
+def as_deck(cards):
+    """Return cards as a Deck, converting any iterable of card names."""
+    return cards if isinstance(cards, Deck) else Deck.from_cards(cards)
+
+
+def count_outcomes(draw, count):
+    """Return the number of distinct sets of count cards that can be drawn from a Deck."""
+    ways = [1] + [0] * count
+    for copies in draw.counts:
+        if copies:
+            ways = [sum(ways[n - k] for k in range(min(copies, n) + 1)) for n in range(count + 1)]
+    return ways[count]
+
+
+def draw_outcomes(draw, count):
+    """
+    List every distinct set of count cards that can be drawn from a Deck.
+
+    Returns:
+    - list: Outcomes as tuples of (card index, copies drawn), by card index.
+    """
+    distinct = [(index, copies) for index, copies in enumerate(draw.counts) if copies]
+    # Cards still available from position i on, to stop walks that cannot draw enough
+    room = [0] * (len(distinct) + 1)
+    for i in range(len(distinct) - 1, -1, -1):
+        room[i] = room[i + 1] + distinct[i][1]
+    outcomes = []
+
+    def walk(i, left, drawn):
+        if not left:
+            outcomes.append(tuple(drawn.items()))
+            return
+        if room[i] < left:
+            return
+        index, copies = distinct[i]
+        for k in range(min(copies, left), 0, -1):
+            drawn[index] = k
+            walk(i + 1, left - k, drawn)
+        drawn.pop(index, None)
+        walk(i + 1, left, drawn)
+
+    walk(0, count, {})
+    return outcomes
+
+
+def draw_probability(drawn, draw, total):
+    """Probability of drawing exactly the multiset drawn (card index -> copies) from draw."""
+    ways = 1
+    for index, k in drawn.items():
+        ways *= comb(draw.counts[index], k)
+    return ways / total
+
+
+def _preset(copies):
+    """Build a preset from a function giving the number of copies of (rank, suit)."""
+    return lambda: Deck([copies(rank, suit) for rank in RANKS for suit in SUITS])
+
+
+# Starting decks; each entry builds a fresh Deck
+DECK_PRESETS = {
+    'Standard': _preset(lambda rank, suit: 1),
+    'Abandoned': _preset(lambda rank, suit: 0 if rank in FACE_RANKS else 1),
+    'Checkered': _preset(lambda rank, suit: 2 if suit in ('Spade', 'Heart') else 0),
+}
+
+
+def make_deck(preset='Standard'):
+    """
+    Build a fresh starting deck.
+
+    Parameters:
+    - preset (str): Name of a starting deck in DECK_PRESETS.
+
+    Returns:
+    - Deck: The full starting deck.
+    """
+    try:
+        return DECK_PRESETS[preset]()
+    except KeyError:
+        raise ValueError(f"Error: Unknown deck '{preset}'. Choose from {', '.join(DECK_PRESETS)}.") from None
@@ -0,0 +1,376 @@
+# differential.py
+
+import importlib
+import json
+import os
+import random
+import re
+import zlib
+from array import array
+from dataclasses import dataclass, field
+from artifacts import CACHE_DIR
+from deck import Deck, DECK_PRESETS, make_deck
+from parallel import chunks, map_chunks
+from planetCards import PLANET_CARDS
+
+CORPUS_VERSION = 3
+DEFAULT_CORPUS = os.path.join(CACHE_DIR, 'differential_corpus.bin')
+FIXTURES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tests.py')
+
+# Engines the corpus holds reference results for: the reference implementation
+# and the engine checked against it by default, as 'module:function'
+ENGINES = {
+    'evaluate_hand': ('play:evaluate_hand', 'play:evaluate_hand'),
+    'find_best_hands': ('play:_find_best_hands_exhaustive', 'play:find_best_hands'),
+    'pattern_probability': ('discard:calculate_pattern_probability_direct', 'discard:calculate_pattern_probability'),
+}
+
+# Target patterns a discard can draw to (see discard._keep_sets)
+DRAW_PATTERNS = ['Four of a Kind', 'Full House', 'Flush', 'Three of a Kind', 'Two Pair', 'Straight']
+
+# Largest generated hand; the exhaustive reference scores every 5-card subset
+MAX_HAND_SIZE = 10
+
+# Probabilities may differ by float rounding between engines
+PROBABILITY_TOLERANCE = 1e-12
+
+CARD_STRING = re.compile(r'(?:(?:[2-9]|10|[AJQK])[HDSC])+', re.I)
+
+
+@dataclass
+class Case:
+    """One corpus entry: a hand, the deck it was drawn from, planet levels and a draw to weigh."""
+    index: int
+    hand: list
+    deck: list                                   # 52 card counts of the deck left after the hand
+    planets: dict = field(default_factory=dict)  # Planet Card name -> copies held
+    pattern: str = 'Flush'                       # Pattern drawn to for calculate_pattern_probability
+    kept: list = field(default_factory=list)     # Cards kept for the draw
+    draws: int = 1                               # Cards drawn
+
+
+def load_fixtures(path=FIXTURES_FILE):
+    """
+    Read the hands listed in tests.py: bare card strings and quoted `test_n = "..."` strings.
+
+    Returns:
+    - list: Hands as lists of card names, in file order.
+    """
+    from play import parse_playing_cards
+
+    fixtures = []
+    if not os.path.exists(path):
+        return fixtures
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            quoted = re.search(r'"([^"]*)"', line)
+            text = quoted.group(1) if quoted and '=' in line else line
+            if CARD_STRING.fullmatch(text):
+                fixtures.append(parse_playing_cards(text, allow_duplicates=True)[0])
+    return fixtures
+
+
+def make_case(seed, index, fixtures=()):
+    """
+    Build corpus entry index; the same seed and index always give the same case.
+
+    The first entries are the fixture hands, dealt from a Standard deck;
+    the rest are drawn from a starting deck with some cards destroyed or copied.
+    """
+    rng = random.Random(f"{seed}:{index}")
+    if index < len(fixtures):
+        hand = list(fixtures[index])
+        # A fixture holding a card twice was dealt from a deck with a copy of it
+        deck = make_deck('Standard')
+        for card in deck.missing(hand):
+            deck.add(card)
+    else:
+        deck = make_deck(rng.choice(list(DECK_PRESETS)))
+        for _ in range(rng.randrange(4)):
+            deck.add(rng.choice(list(deck)))
+        for _ in range(rng.randrange(6)):
+            deck.remove(rng.choice(list(deck)))
+        hand = rng.sample(list(deck), rng.randint(5, MAX_HAND_SIZE))
+    deck.remove_cards(hand)
+    planets = {name: rng.randint(1, 3) for name in rng.sample(list(PLANET_CARDS), rng.randrange(4))}
+    kept = rng.sample(hand, rng.randint(0, 4))
+    draws = min(rng.randint(1, 5), len(deck))
+    return Case(index, hand, deck.counts, planets, rng.choice(DRAW_PATTERNS), kept, draws)
+
+
+def hand_scores_for(planets):
+    """Return HAND_SCORES with planets (name -> copies) applied to the base scores."""
+    from play import BASE_HAND_SCORES
+
+    hand_scores = BASE_HAND_SCORES.copy()
+    for name, quantity in planets.items():
+        card = PLANET_CARDS[name]
+        chips, mult = hand_scores[card.associated_hand]
+        hand_scores[card.associated_hand] = (chips + card.chip_value_bonus * quantity,
+                                             mult + card.multiplier_bonus * quantity)
+    return hand_scores
+
+
+def resolve(spec):
+    """Import an engine given as 'module:function'."""
+    module, name = spec.split(':')
+    return getattr(importlib.import_module(module), name)
+
+
+def run_engine(kind, engine, case):
+    """
+    Run one engine on a case under its planet levels.
+
+    Returns:
+    - The engine's result in comparable form: a checksum for hand evaluations
+      and plays, a float for probabilities.
+    """
+    import play
+
+    saved = play.HAND_SCORES
+    play.HAND_SCORES = hand_scores_for(case.planets)
+    try:
+        if kind == 'evaluate_hand':
+            result = [(pattern, list(cards)) for pattern, cards in engine(case.hand)]
+        elif kind == 'find_best_hands':
+            result = [(tuple(hand['subset']), hand['pattern'], list(hand['pattern_cards']), hand['score'])
+                      for hand in engine(case.hand, top_n=5)]
+        else:
+            return float(engine(case.kept, case.pattern, Deck(case.deck), case.draws))
+    finally:
+        play.HAND_SCORES = saved
+    return zlib.crc32(repr(result).encode())
+
+
+def _agrees(kind, expected, got):
+    if kind == 'pattern_probability':
+        return abs(expected - got) <= PROBABILITY_TOLERANCE
+    return expected == got
+
+
+def _reference_chunk(seed, start, stop, fixtures):
+    """Compute the reference results of cases start..stop-1, one array per engine kind."""
+    references = {kind: resolve(reference) for kind, (reference, engine) in ENGINES.items()}
+    columns = {kind: array('d' if kind == 'pattern_probability' else 'I') for kind in ENGINES}
+    for index in range(start, stop):
+        case = make_case(seed, index, fixtures)
+        for kind, reference in references.items():
+            columns[kind].append(run_engine(kind, reference, case))
+    return {kind: column.tobytes() for kind, column in columns.items()}
+
+
+def generate_corpus(path=DEFAULT_CORPUS, count=100000, seed=0, workers=None):
+    """
+    Write a differential corpus of count cases with their reference results.
+
+    Cases are never stored: each is rebuilt from (seed, index) by make_case,
+    so the file only holds a JSON header line followed by one packed column
+    per engine kind (a uint32 checksum per case, or a float64 probability).
+    The fixture hands from tests.py come first and are kept in the header.
+
+    Parameters:
+    - path (str): File to write.
+    - count (int): Cases to generate (millions are fine; it scales with the cores).
+    - seed (int): Seed the cases are built from.
+    - workers (int): Processes to compute with (defaults to every core).
+
+    Returns:
+    - dict: The corpus header.
+    """
+    workers = workers or os.cpu_count() or 1
+    fixtures = load_fixtures()
+    spans = chunks(count, workers)
+    results = map_chunks(_reference_chunk, [(seed, start, stop, fixtures) for start, stop in spans], workers)
+    header = {'version': CORPUS_VERSION, 'seed': seed, 'count': count, 'fixtures': fixtures,
+              'kinds': list(ENGINES), 'references': {kind: ENGINES[kind][0] for kind in ENGINES}}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(json.dumps(header).encode() + b'\n')
+        for kind in ENGINES:
+            for chunk in results:
+                f.write(chunk[kind])
+    return header
+
+
+def read_corpus(path, start=0, stop=None):
+    """
+    Read a corpus header and the reference results of cases start..stop-1.
+
+    Returns:
+    - (header, columns): The header dict and an array of results per engine kind.
+    """
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        raise ValueError(f"Error: No corpus at '{path}'. Generate one with 'python differential.py generate'.") from None
+    with f:
+        header = json.loads(f.readline())
+        if header.get('version') != CORPUS_VERSION:
+            raise ValueError(f"Error: Corpus '{path}' has version {header.get('version')}, expected {CORPUS_VERSION}.")
+        stop = header['count'] if stop is None else stop
+        offset = f.tell()
+        columns = {}
+        for kind in header['kinds']:
+            column = array('d' if kind == 'pattern_probability' else 'I')
+            f.seek(offset + start * column.itemsize)
+            column.frombytes(f.read((stop - start) * column.itemsize))
+            columns[kind] = column
+            offset += header['count'] * column.itemsize
+    return header, columns
+
+
+def minimize_case(kind, engine, reference, case):
+    """
+    Shrink a failing case while the engine and the reference still disagree.
+
+    Hand cards, kept cards and planets are dropped one at a time and the
+    draw count lowered, keeping each change that preserves the mismatch.
+    The reference is rerun on every candidate, since only the original
+    case has a stored result.
+    """
+    def fails(candidate):
+        try:
+            return not _agrees(kind, run_engine(kind, reference, candidate), run_engine(kind, engine, candidate))
+        except Exception:
+            return True
+
+    def shrink(case, attribute):
+        items = list(getattr(case, attribute))
+        i = 0
+        while i < len(items):
+            candidate = Case(**{**vars(case), attribute: items[:i] + items[i + 1:]})
+            if fails(candidate):
+                items = items[:i] + items[i + 1:]
+                case = candidate
+            else:
+                i += 1
+        return case
+
+    if kind == 'pattern_probability':
+        case = shrink(case, 'kept')
+        while case.draws > 1 and fails(Case(**{**vars(case), 'draws': case.draws - 1})):
+            case = Case(**{**vars(case), 'draws': case.draws - 1})
+    else:
+        case = shrink(case, 'hand')
+    for name in list(case.planets):
+        candidate = Case(**{**vars(case), 'planets': {k: v for k, v in case.planets.items() if k != name}})
+        if fails(candidate):
+            case = candidate
+    return case
+
+
+def describe_reproducer(kind, engine_spec, case):
+    """Return a short Python snippet reproducing a minimized case."""
+    module, name = engine_spec.split(':')
+    lines = [f"# {kind}, case {case.index}", f"import play, differential; from {module} import {name}"]
+    if case.planets:
+        lines.append(f"play.HAND_SCORES = differential.hand_scores_for({case.planets!r})")
+    if kind == 'pattern_probability':
+        lines.append(f"{name}({case.kept!r}, {case.pattern!r}, differential.Deck({case.deck!r}), {case.draws})")
+    elif kind == 'find_best_hands':
+        lines.append(f"{name}({case.hand!r}, top_n=5)")
+    else:
+        lines.append(f"{name}({case.hand!r})")
+    return "\n".join(lines)
+
+
+def _check_chunk(path, start, stop, specs, limit):
+    """Compare the engines with the stored references on cases start..stop-1."""
+    header, columns = read_corpus(path, start, stop)
+    fixtures = header['fixtures']
+    engines = {kind: resolve(spec) for kind, spec in specs.items()}
+    checked = {kind: 0 for kind in specs}
+    mismatches = {kind: [] for kind in specs}
+    for index in range(start, stop):
+        case = make_case(header['seed'], index, fixtures)
+        for kind, engine in engines.items():
+            checked[kind] += 1
+            expected = columns[kind][index - start]
+            try:
+                got = run_engine(kind, engine, case)
+            except Exception as e:
+                got = f"{type(e).__name__}: {e}"
+            if isinstance(got, str) or not _agrees(kind, expected, got):
+                mismatches[kind].append(case)
+    # Only the first few mismatches of each kind are minimized
+    reproducers = {}
+    for kind, cases in mismatches.items():
+        reference = resolve(header['references'][kind])
+        reproducers[kind] = [describe_reproducer(kind, specs[kind], minimize_case(kind, engines[kind], reference, case))
+                             for case in cases[:limit]]
+    counts = {kind: len(cases) for kind, cases in mismatches.items()}
+    return checked, counts, reproducers
+
+
+def run_differential(path=DEFAULT_CORPUS, engines=None, workers=None, limit=3, count=None):
+    """
+    Check engines against the reference results of a corpus, across every core.
+
+    Parameters:
+    - path (str): Corpus written by generate_corpus.
+    - engines (dict): Engine kind -> 'module:function' to check (defaults to the ENGINES defaults).
+    - workers (int): Processes to check with (defaults to every core).
+    - limit (int): Mismatches to minimize and report per kind.
+    - count (int): Check only the first count cases.
+
+    Returns:
+    - dict: For each kind, 'checked' and 'mismatches' counts and the first
+      minimized 'reproducers', in case order.
+    """
+    header, columns = read_corpus(path, 0, 0)
+    specs = engines or {kind: ENGINES[kind][1] for kind in header['kinds']}
+    unknown = [kind for kind in specs if kind not in header['kinds']]
+    if unknown:
+        raise ValueError(f"Error: The corpus has no reference results for {', '.join(unknown)}.")
+    workers = workers or os.cpu_count() or 1
+    count = min(count or header['count'], header['count'])
+    results = map_chunks(_check_chunk, [(path, start, stop, specs, limit) for start, stop in chunks(count, workers)],
+                          workers)
+    report = {kind: {'checked': 0, 'mismatches': 0, 'reproducers': []} for kind in specs}
+    for checked, counts, reproducers in results:
+        for kind in specs:
+            report[kind]['checked'] += checked[kind]
+            report[kind]['mismatches'] += counts[kind]
+            room = limit - len(report[kind]['reproducers'])
+            report[kind]['reproducers'].extend(reproducers[kind][:max(0, room)])
+    return report
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate a differential corpus, or check engines against it.")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS, help="Corpus file.")
+    parser.add_argument('--workers', type=int, default=None, help="Processes to use (default: every core).")
+    commands = parser.add_subparsers(dest='command', required=True)
+    generate = commands.add_parser('generate', help="Write a corpus with reference results.")
+    generate.add_argument('--count', type=int, default=100000, help="Cases to generate.")
+    generate.add_argument('--seed', type=int, default=0, help="Seed the cases are built from.")
+    run = commands.add_parser('run', help="Check engines against the corpus.")
+    run.add_argument('--engine', action='append', default=[], metavar='KIND=MODULE:FUNCTION',
+                     help=f"Engine to check for a kind ({', '.join(ENGINES)}); repeatable.")
+    run.add_argument('--count', type=int, default=None, help="Check only the first cases.")
+    run.add_argument('--limit', type=int, default=3, help="Mismatches to minimize per kind.")
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'generate':
+            header = generate_corpus(args.corpus, args.count, args.seed, args.workers)
+            print(f"Wrote {header['count']} cases ({len(header['fixtures'])} from tests.py) to {args.corpus}")
+            return
+        engines = dict(spec.split('=', 1) for spec in args.engine) or None
+        report = run_differential(args.corpus, engines, args.workers, args.limit, args.count)
+    except ValueError as e:
+        print(e)
+        raise SystemExit(2)
+    failed = False
+    for kind, result in report.items():
+        print(f"{kind}: {result['checked']} cases, {result['mismatches']} mismatches")
+        for reproducer in result['reproducers']:
+            print(reproducer)
+        failed = failed or result['mismatches'] > 0
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
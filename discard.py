@@ -1,352 +1,277 @@
 # discard.py
 import itertools
-import math
+import time
 from collections import Counter
+from drawOdds import MAX_DRAWS, pattern_signature, lookup_counts, table_counts, completion_counts, counts_to_probability
+from deck import as_deck
+from cards import CardTable
+from results import StrategyResult
+import play
 from play import (
     parse_playing_cards,
+    update_deck,
     evaluate_hand,
-    calculate_pattern_score,
-    HAND_SCORES,
-    VALUE_MAP,
+    score_pattern,
     RANK_MAP
 )
 
-def calculate_pattern_probability(kept_cards, desired_pattern, remaining_deck, num_draws):
+def _pattern_signature(kept_cards, desired_pattern, deck):
+    """Return (signature, relevant) for drawing to desired_pattern from deck, or None if it cannot be completed."""
+    kept_ranks = Counter(RANK_MAP[card.split()[0]] for card in kept_cards)
+    kept_suits = Counter(card.split()[1] for card in kept_cards)
+    # Remaining rank and suit counts come straight from the deck's count matrix
+    return pattern_signature(desired_pattern, kept_ranks, kept_suits, deck.rank_totals, deck.suit_totals)
+
+
+def calculate_pattern_probability(kept_cards, desired_pattern, remaining_deck, num_draws, use_table=True,
+                                  deadline=None):
     """
-    Calculate the probability of achieving the desired pattern after drawing num_draws cards.
+    Calculate the probability of completing the desired pattern from the kept cards
+    after drawing num_draws cards.
+
+    A Flush or Straight has to be built on the kept cards (in a kept suit,
+    through every kept rank); rank patterns also count pairs and trips drawn
+    in ranks that were not kept. The exact odds come from the precomputed
+    draw-odds table (see drawOdds.py), falling back to direct computation for
+    signatures the table does not cover, or always with use_table=False.
+    With a `deadline` (a time.perf_counter() value), a computation still
+    running past it raises TimeoutError.
     """
-    kept_ranks = [RANK_MAP[card.split()[0]] for card in kept_cards]
-    kept_suits = [card.split()[1] for card in kept_cards]
-    rank_counts = Counter(kept_ranks)
-    suit_counts = Counter(kept_suits)
-    total_remaining_cards = len(remaining_deck)
-    remaining_ranks = Counter([RANK_MAP[card.split()[0]] for card in remaining_deck])
-    remaining_suits = Counter([card.split()[1] for card in remaining_deck])
-
-    if desired_pattern == 'Four of a Kind':
-        # Check if we have three of a kind already
-        for rank, count in rank_counts.items():
-            if count == 3:
-                remaining_same_rank = 4 - count
-                probability = remaining_same_rank / total_remaining_cards
-                return probability
+    deck = as_deck(remaining_deck)
+    signature = _pattern_signature(kept_cards, desired_pattern, deck)
+    if signature is None:
         return 0
+    signature, relevant = signature
+    if use_table:
+        counts = lookup_counts(signature, num_draws, deadline)
+    else:
+        counts = completion_counts(signature, max(num_draws, MAX_DRAWS), deadline)
+    return counts_to_probability(counts, relevant, deck.total, num_draws)
+
+
+def estimate_pattern_probability(kept_cards, desired_pattern, remaining_deck, num_draws):
+    """
+    Estimate calculate_pattern_probability from the draw-odds table alone, without computing any counts.
+
+    Returns:
+    - tuple: (probability, exact). The probability is exact when the table
+      covers the signature and num_draws <= MAX_DRAWS. Otherwise it is a
+      lower bound: the chance of completing within MAX_DRAWS draws when the
+      table covers the signature, else 0.
+    """
+    deck = as_deck(remaining_deck)
+    signature = _pattern_signature(kept_cards, desired_pattern, deck)
+    if signature is None:
+        return 0.0, True
+    signature, relevant = signature
+    counts = table_counts(signature)
+    if counts is None:
+        return 0.0, False
+    draws = min(num_draws, MAX_DRAWS)
+    return counts_to_probability(counts, relevant, deck.total, draws), draws == num_draws
 
-    elif desired_pattern == 'Full House':
-        # Need at least one three of a kind and one pair
+
+def calculate_pattern_probability_direct(kept_cards, desired_pattern, remaining_deck, num_draws):
+    """Calculate the same probability as calculate_pattern_probability, never reading the draw-odds table."""
+    return calculate_pattern_probability(kept_cards, desired_pattern, remaining_deck, num_draws, use_table=False)
+
+
+def _pattern_score(pattern, cards, blind=None):
+    """Score cards as pattern, leaving out what a Boss Blind debuffs; returns (score, base chips, mult)."""
+    if blind is None or blind.debuffed_suit is None:
+        return score_pattern(pattern, cards)
+    table, ids = CardTable.from_names(cards)
+    return score_pattern(pattern, ids, blind.debuffed_table(table))
+
+
+def _keep_sets(current_hand, pattern, blind=None):
+    """
+    Yield the sets of cards worth keeping to draw to pattern.
+
+    Parameters:
+    - current_hand (list): Cards in hand.
+    - pattern (str): Target pattern (Four of a Kind, Full House, Flush, Three of a Kind, Two Pair or Straight).
+    - blind (BossBlind): Active Boss Blind, whose debuffed suit is never drawn to.
+    """
+    rank_counts = Counter([RANK_MAP[card.split()[0]] for card in current_hand])
+    rank_cards = lambda ranks: [card for card in current_hand if RANK_MAP[card.split()[0]] in ranks]
+
+    if pattern == 'Four of a Kind':
+        # Keep exactly three cards of a rank held three or more times
+        for rank, cnt in rank_counts.items():
+            if cnt >= 3:
+                yield rank_cards([rank])[:3]
+
+    elif pattern == 'Full House':
+        # Keep a Three of a Kind, alone or with a Pair
         threes = [rank for rank, cnt in rank_counts.items() if cnt >= 3]
         pairs = [rank for rank, cnt in rank_counts.items() if cnt >= 2 and rank not in threes]
+        for three in threes:
+            yield rank_cards([three])
+            for pair in pairs:
+                yield rank_cards([three, pair])
 
-        # If we already have a three of a kind, need at least one pair
-        if threes:
-            # Calculate probability to draw at least one pair in num_draws
-            # Simplified: probability to draw at least two cards of any pair
-            # This is a complex calculation; here we provide an approximation
-            prob = 0
-            for pair_rank in [rank for rank, cnt in remaining_ranks.items() if cnt >= 2]:
-                prob += (math.comb(remaining_ranks[pair_rank], 2)) / math.comb(total_remaining_cards,
-                                                                               2) if num_draws >= 2 else 0
-            return prob
-        else:
-            # Need to draw at least three of a kind
-            for rank, count in remaining_ranks.items():
-                if count >= 3:
-                    prob = math.comb(count, 3) / math.comb(total_remaining_cards, 3) if num_draws >= 3 else 0
-                    return prob
-            return 0
-
-    elif desired_pattern == 'Flush':
-        # Find the suit with the maximum number of kept cards
-        if not kept_suits:
-            return 0
-        target_suit, count = suit_counts.most_common(1)[0]
-        needed = 5 - count
-        if needed <= 0:
-            return 1.0  # Already a flush
-        remaining_same_suit = remaining_suits[target_suit]
-        if remaining_same_suit < needed:
-            return 0
-        # Calculate hypergeometric probability
-        probability = (math.comb(remaining_same_suit, needed) / math.comb(total_remaining_cards,
-                                                                          needed)) if total_remaining_cards >= needed else 0
-        return probability
-
-    elif desired_pattern == 'Three of a Kind':
-        # Check if we have a pair already
-        for rank, count in rank_counts.items():
-            if count == 2:
-                remaining_same_rank = 4 - count
-                probability = remaining_same_rank / total_remaining_cards
-                return probability
-        return 0
+    elif pattern == 'Flush':
+        # Keep every card of a suit
+        suit_counts = Counter([card.split()[1] for card in current_hand
+                               if blind is None or not blind.is_debuffed(card)])
+        for target_suit, count in suit_counts.most_common():
+            yield [card for card in current_hand if card.split()[1] == target_suit]
 
-    elif desired_pattern == 'Straight':
-        # Calculate possible straights with kept cards
-        # This is a complex calculation; we provide a simplified version
-        # Find all possible straights that include kept cards
-        possible_sequences = []
-        kept_values = set(kept_ranks)
-        for start in range(2, 11):
-            sequence = set(range(start, start + 5))
-            if kept_values.issubset(sequence):
-                possible_sequences.append(sequence)
-        # Ace-low straight
-        if {14, 2, 3, 4, 5}.issubset(kept_values):
-            possible_sequences.append({14, 2, 3, 4, 5})
-
-        if not possible_sequences:
-            return 0
-
-        # For each possible sequence, calculate missing cards
-        prob = 0
-        for seq in possible_sequences:
-            missing = seq - kept_values
-            if len(missing) > num_draws:
-                continue
-            # Calculate probability of drawing all missing cards
-            missing_cards = [card for card in remaining_deck if RANK_MAP[card.split()[0]] in missing]
-            if len(missing_cards) < len(missing):
-                continue
-            prob += math.comb(len(missing_cards), len(missing)) / math.comb(total_remaining_cards, len(missing))
-        return prob
-
-    elif desired_pattern == 'Two Pair':
-        # If we have one pair, need to draw another pair
-        existing_pairs = [rank for rank, cnt in rank_counts.items() if cnt >= 2]
-        if existing_pairs:
-            # Calculate probability to draw at least another pair
-            prob = 0
-            for pair_rank in [rank for rank, cnt in remaining_ranks.items() if cnt >= 2 and rank not in existing_pairs]:
-                prob += math.comb(remaining_ranks[pair_rank], 2) / math.comb(total_remaining_cards,
-                                                                             2) if num_draws >= 2 else 0
-            return prob
-        return 0
+    elif pattern == 'Three of a Kind':
+        # Keep exactly two cards of a Pair
+        for rank, cnt in rank_counts.items():
+            if cnt >= 2:
+                yield rank_cards([rank])[:2]
 
-    else:
-        return 0
+    elif pattern == 'Two Pair':
+        # Keep two existing pairs
+        pairs = [rank for rank, cnt in rank_counts.items() if cnt >= 2]
+        for keep_ranks in itertools.combinations(pairs, 2):
+            yield rank_cards(keep_ranks)
+
+    elif pattern == 'Straight':
+        # Keep the cards inside a straight window that holds at least one of them
+        sequences = [set(range(start, start + 5)) for start in range(2, 11)] + [{14, 2, 3, 4, 5}]
+        for seq in sequences:
+            if seq.intersection(rank_counts):
+                yield rank_cards(seq)
 
 
-def recommend_discard_strategies(current_hand, remaining_deck, top_n=5):
+def recommend_discard_strategies(current_hand, remaining_deck, top_n=5, blind=None, progress=None, deadline=None):
     """
     Recommend discard strategies to improve the hand.
+
+    A BossBlind (see blinds.py) removes target patterns it forbids before any
+    odds are computed, and steers Flush draws away from a debuffed suit.
+    `progress(done, total)` is called with the keep sets weighed so far;
+    it may raise to abandon the search.
+
+    The search is anytime: keep sets are weighed best bound first (the score of
+    the pattern they draw to), and stops once no remaining bound can reach the
+    top_n. A first pass estimates every keep set's odds from the draw-odds
+    table alone (exact for draws it covers, otherwise a lower bound); a second
+    pass then replaces the estimates with exact odds, again best bound first.
+    With a `deadline` in seconds (e.g., 0.05) either pass stops when time runs
+    out, and the strategies are ranked on the odds known so far, estimates
+    included. Every strategy has an 'exact' flag, False when the deadline cut
+    the search short.
     """
+    start = time.perf_counter()
+    remaining_deck = as_deck(remaining_deck)
+    # Read at call time, so hand levels set after import (play.HAND_SCORES is reassigned) are seen
+    hand_scores = play.HAND_SCORES
+    allowed = list(hand_scores) if blind is None else blind.allowed_patterns(hand_scores)
     # Evaluate current hand
-    current_patterns = evaluate_hand(current_hand)
+    current_patterns = evaluate_hand(current_hand, allowed=allowed)
+    if not current_patterns:
+        # Nothing in the hand may be played; any allowed target is an improvement
+        current_patterns = [('High Card', [])]
     # Find the best current pattern based on HAND_SCORES
-    best_current_pattern = max(current_patterns, key=lambda x: HAND_SCORES.get(x[0], (0, 0))[0])
+    best_current_pattern = max(current_patterns, key=lambda x: hand_scores.get(x[0], (0, 0))[0])
     best_pattern_name = best_current_pattern[0]
     best_pattern_cards = best_current_pattern[1]
     # Define strong patterns
-    strong_patterns = ['Royal Flush', 'Straight Flush', 'Four of a Kind', 'Full House']
+    strong_patterns = ['Flush Five', 'Flush House', 'Five of a Kind', 'Royal Flush', 'Straight Flush',
+                       'Four of a Kind', 'Full House']
     if best_pattern_name in strong_patterns:
         # Hand is already strong; recommend keeping it
-        score, calculation = calculate_pattern_score(best_pattern_name, best_pattern_cards)
-        return [{
-            'discard': [],
-            'pattern': best_pattern_name,
-            'score': score,
-            'probability': 1.0,
-            'kept_cards': current_hand,
-            'calculation': calculation
-        }]
+        scored = _pattern_score(best_pattern_name, best_pattern_cards, blind)
+        return [StrategyResult([], best_pattern_name, scored[0], 1.0, current_hand, scored)]
 
     # Potential patterns to aim for, prioritized by HAND_SCORES
     potential_patterns = ['Four of a Kind', 'Full House', 'Flush', 'Three of a Kind', 'Two Pair', 'Straight']
     # Filter patterns that have a higher HAND_SCORES than the current best pattern
-    current_score = HAND_SCORES.get(best_pattern_name, (0, 0))[0]
-    potential_patterns = [p for p in potential_patterns if HAND_SCORES.get(p, (0, 0))[0] > current_score]
+    current_score = hand_scores.get(best_pattern_name, (0, 0))[0]
+    potential_patterns = [p for p in potential_patterns
+                          if hand_scores.get(p, (0, 0))[0] > current_score and p in allowed]
 
     if not potential_patterns:
         # No higher patterns available; recommend keeping current hand
-        score, calculation = calculate_pattern_score(best_pattern_name, best_pattern_cards)
-        return [{
-            'discard': [],
-            'pattern': best_pattern_name,
-            'score': score,
-            'probability': 1.0,
-            'kept_cards': current_hand,
-            'calculation': calculation
-        }]
-
-    # Initialize list to hold all possible strategies
-    strategy_scores = []
-
-    # For each potential pattern, determine which cards to keep and which to discard
+        scored = _pattern_score(best_pattern_name, best_pattern_cards, blind)
+        return [StrategyResult([], best_pattern_name, scored[0], 1.0, current_hand, scored)]
+
+    # Score every keep set; a pattern's score bounds the expected score of drawing to it
+    candidates = []
     for pattern in potential_patterns:
-        if pattern == 'Four of a Kind':
-            # Keep all cards that are part of any Three of a Kind
-            rank_counts = Counter([RANK_MAP[card.split()[0]] for card in current_hand])
-            threes = [rank for rank, cnt in rank_counts.items() if cnt >= 3]
-            if threes:
-                # Assuming only one three of a kind
-                keep_rank = threes[0]
-                kept_cards = [card for card in current_hand if RANK_MAP[card.split()[0]] == keep_rank]
-                discard_cards = [card for card in current_hand if RANK_MAP[card.split()[0]] != keep_rank]
-                # Only keep three cards of the same rank
-                # To maximize probability, keep exactly three
-                kept_cards = kept_cards[:3]
-                discard_cards = [card for card in current_hand if card not in kept_cards]
-                num_draws = len(discard_cards)
-                # Ensure that remaining_deck is passed
-                probability = calculate_pattern_probability(kept_cards, pattern, remaining_deck, num_draws)
-                if probability > 0:
-                    score, calculation = calculate_pattern_score(pattern, kept_cards)
-                    expected_score = probability * score
-                    strategy_scores.append({
-                        'discard': discard_cards,
-                        'pattern': pattern,
-                        'score': expected_score,
-                        'probability': probability,
-                        'kept_cards': kept_cards,
-                        'calculation': calculation
-                    })
-
-        elif pattern == 'Full House':
-            # Keep any Three of a Kind and any Pair
-            rank_counts = Counter([RANK_MAP[card.split()[0]] for card in current_hand])
-            threes = [rank for rank, cnt in rank_counts.items() if cnt >= 3]
-            pairs = [rank for rank, cnt in rank_counts.items() if cnt >= 2 and rank not in threes]
-            if threes:
-                keep_rank = threes[0]
-                kept_cards = [card for card in current_hand if RANK_MAP[card.split()[0]] == keep_rank]
-                if pairs:
-                    # Keep the pair as well
-                    pair_rank = pairs[0]
-                    pair_cards = [card for card in current_hand if RANK_MAP[card.split()[0]] == pair_rank]
-                    kept_cards.extend(pair_cards)
-                num_draws = len(current_hand) - len(kept_cards)
-                discard_cards = [card for card in current_hand if card not in kept_cards]
-                probability = calculate_pattern_probability(kept_cards, pattern, remaining_deck, num_draws)
-                if probability > 0:
-                    score, calculation = calculate_pattern_score(pattern, kept_cards)
-                    expected_score = probability * score
-                    strategy_scores.append({
-                        'discard': discard_cards,
-                        'pattern': pattern,
-                        'score': expected_score,
-                        'probability': probability,
-                        'kept_cards': kept_cards,
-                        'calculation': calculation
-                    })
-
-        elif pattern == 'Flush':
-            # Keep the suit with the highest count
-            suit_counts = Counter([card.split()[1] for card in current_hand])
-            if suit_counts:
-                target_suit, count = suit_counts.most_common(1)[0]
-                kept_cards = [card for card in current_hand if card.split()[1] == target_suit]
-                discard_cards = [card for card in current_hand if card.split()[1] != target_suit]
-                num_draws = len(discard_cards)
-                probability = calculate_pattern_probability(kept_cards, pattern, remaining_deck, num_draws)
-                if probability > 0:
-                    score, calculation = calculate_pattern_score(pattern, kept_cards)
-                    expected_score = probability * score
-                    strategy_scores.append({
-                        'discard': discard_cards,
-                        'pattern': pattern,
-                        'score': expected_score,
-                        'probability': probability,
-                        'kept_cards': kept_cards,
-                        'calculation': calculation
-                    })
-
-        elif pattern == 'Three of a Kind':
-            # Keep all cards that are part of any Pair
-            rank_counts = Counter([RANK_MAP[card.split()[0]] for card in current_hand])
-            pairs = [rank for rank, cnt in rank_counts.items() if cnt >= 2]
-            if pairs:
-                keep_rank = pairs[0]
-                kept_cards = [card for card in current_hand if RANK_MAP[card.split()[0]] == keep_rank]
-                discard_cards = [card for card in current_hand if RANK_MAP[card.split()[0]] != keep_rank]
-                # Keep exactly two cards of the pair
-                kept_cards = kept_cards[:2]
-                discard_cards = [card for card in current_hand if card not in kept_cards]
-                num_draws = len(discard_cards)
-                probability = calculate_pattern_probability(kept_cards, pattern, remaining_deck, num_draws)
-                if probability > 0:
-                    score, calculation = calculate_pattern_score(pattern, kept_cards)
-                    expected_score = probability * score
-                    strategy_scores.append({
-                        'discard': discard_cards,
-                        'pattern': pattern,
-                        'score': expected_score,
-                        'probability': probability,
-                        'kept_cards': kept_cards,
-                        'calculation': calculation
-                    })
-
-        elif pattern == 'Two Pair':
-            # Keep the two existing pairs
-            rank_counts = Counter([RANK_MAP[card.split()[0]] for card in current_hand])
-            pairs = [rank for rank, cnt in rank_counts.items() if cnt >= 2]
-            if len(pairs) >= 2:
-                keep_ranks = pairs[:2]
-                kept_cards = [card for card in current_hand if RANK_MAP[card.split()[0]] in keep_ranks]
-                discard_cards = [card for card in current_hand if card not in kept_cards]
-                num_draws = len(discard_cards)
-                probability = calculate_pattern_probability(kept_cards, pattern, remaining_deck, num_draws)
-                if probability > 0:
-                    score, calculation = calculate_pattern_score(pattern, kept_cards)
-                    expected_score = probability * score
-                    strategy_scores.append({
-                        'discard': discard_cards,
-                        'pattern': pattern,
-                        'score': expected_score,
-                        'probability': probability,
-                        'kept_cards': kept_cards,
-                        'calculation': calculation
-                    })
-
-        elif pattern == 'Straight':
-            # Keep cards that can form a straight
-            # Simplified: keep the cards with consecutive ranks
-            kept_ranks = [RANK_MAP[card.split()[0]] for card in current_hand]
-            kept_ranks = sorted(set(kept_ranks))
-            sequences = []
-            for start in range(2, 11):
-                seq = set(range(start, start + 5))
-                if seq.intersection(kept_ranks):
-                    sequences.append(seq)
-            # Ace-low straight
-            if {14, 2, 3, 4, 5}.issubset(kept_ranks):
-                sequences.append({14, 2, 3, 4, 5})
-            # Find the sequence with the most overlap
-            best_seq = max(sequences, key=lambda s: len(s.intersection(kept_ranks)), default=None)
-            if best_seq:
-                needed = best_seq - set(kept_ranks)
-                # Keep all cards that are part of the best_seq
-                kept_cards = [card for card in current_hand if RANK_MAP[card.split()[0]] in best_seq]
-                discard_cards = [card for card in current_hand if RANK_MAP[card.split()[0]] not in best_seq]
-                num_draws = len(discard_cards)
-                probability = calculate_pattern_probability(kept_cards, pattern, remaining_deck, num_draws)
-                if probability > 0:
-                    score, calculation = calculate_pattern_score(pattern, kept_cards)
-                    expected_score = probability * score
-                    strategy_scores.append({
-                        'discard': discard_cards,
-                        'pattern': pattern,
-                        'score': expected_score,
-                        'probability': probability,
-                        'kept_cards': kept_cards,
-                        'calculation': calculation
-                    })
-
-        # Additional patterns can be added here with similar logic
-
-    # Calculate expected score and collect strategies
-
-    # Now, after collecting all strategies, sort and return top_n
-    # Sort strategies by expected score in descending order
-    sorted_strategies = sorted(strategy_scores, key=lambda x: x['score'], reverse=True)
+        for kept_cards in _keep_sets(current_hand, pattern, blind):
+            scored = _pattern_score(pattern, kept_cards, blind)
+            candidates.append((scored[0], len(candidates), pattern, kept_cards, scored))
+    # Most promising keep sets first
+    candidates.sort(key=lambda candidate: (-candidate[0], candidate[1]))
+
+    # Best expected score of each distinct discard among the top_n; a keep set
+    # whose bound is below the lowest of them cannot make the list
+    best = {}
+    threshold = -1
+
+    def admit(discard_cards, expected_score):
+        nonlocal threshold
+        discard_key = tuple(sorted(discard_cards))
+        if expected_score > best.get(discard_key, -1):
+            best[discard_key] = expected_score
+            if len(best) > top_n:
+                del best[min(best, key=best.get)]
+            if len(best) >= top_n:
+                threshold = min(best.values())
+
+    # First pass: estimate every keep set from the draw-odds table alone, best bound first
+    entries = []
+    exact = True
+    for done, (score, order, pattern, kept_cards, scored) in enumerate(candidates):
+        if progress is not None:
+            progress(done, len(candidates))
+        if score < threshold:
+            break
+        if deadline is not None and done and time.perf_counter() - start >= deadline:
+            exact = False
+            break
+        discard_cards = [card for card in current_hand if card not in kept_cards]
+        probability, known = estimate_pattern_probability(kept_cards, pattern, remaining_deck, len(discard_cards))
+        entries.append([probability, known, score, order, discard_cards, pattern, kept_cards, scored])
+        if probability > 0:
+            admit(discard_cards, probability * score)
+    if progress is not None:
+        progress(len(candidates), len(candidates))
+
+    # Second pass: replace the estimates with exact odds, best bound first, while a
+    # keep set can still reach the top_n and time is left (a computation past the
+    # deadline is abandoned, leaving the estimate)
+    pending = [entry for entry in entries if not entry[1]]
+    for done, entry in enumerate(pending):
+        if progress is not None:
+            progress(done, len(pending))
+        probability, known, score, order, discard_cards, pattern, kept_cards, scored = entry
+        if score < threshold:
+            break
+        try:
+            entry[0] = calculate_pattern_probability(kept_cards, pattern, remaining_deck, len(discard_cards),
+                                                     deadline=None if deadline is None else start + deadline)
+        except TimeoutError:
+            exact = False
+            break
+        entry[1] = True
+        if entry[0] > 0:
+            admit(discard_cards, entry[0] * score)
+    if progress is not None and pending:
+        progress(len(pending), len(pending))
+
+    # Sort strategies by expected score in descending order, ties in the order
+    # the keep sets were generated
+    strategy_scores = [(-probability * score, order, discard_cards, pattern, probability, kept_cards, scored)
+                       for probability, known, score, order, discard_cards, pattern, kept_cards, scored in entries
+                       if probability > 0]
+    sorted_strategies = sorted(strategy_scores, key=lambda x: (x[0], x[1]))
 
     # Select top_n unique discard strategies
     top_strategies = []
     seen_discards = set()
-    for strategy in sorted_strategies:
-        discard_key = tuple(sorted(strategy['discard']))
+    for negative_score, order, discard_cards, pattern, probability, kept_cards, scored in sorted_strategies:
+        discard_key = tuple(sorted(discard_cards))
         if discard_key not in seen_discards:
             seen_discards.add(discard_key)
-            top_strategies.append(strategy)
+            top_strategies.append(StrategyResult(discard_cards, pattern, -negative_score, probability,
+                                                 kept_cards, scored, exact))
             if len(top_strategies) >= top_n:
                 break
 
@@ -361,7 +286,7 @@ def main(top_n=5):
         print(f"\nParsed Cards ({n}):")
         for card in current_hand:
             print(card)
-        top_strategies = recommend_discard_strategies(current_hand, top_n)
+        top_strategies = recommend_discard_strategies(current_hand, update_deck(current_hand), top_n)
         if top_strategies:
             print("\nTop Discard Recommendations:")
             for idx, strategy in enumerate(top_strategies, 1):
@@ -0,0 +1,404 @@
+# drawOdds.py
+
+import itertools
+import math
+import mmap
+import os
+import struct
+import time
+from artifacts import artifact_path
+
+# Largest number of draws the on-disk table stores completion counts for.
+MAX_DRAWS = 8
+
+# Largest number of copies of a single rank the table covers (standard deck).
+MAX_RANK_COPIES = 4
+
+# Cards gone from a standard deck (kept, discarded or played) that the table's rank-pattern signatures cover
+MAX_MISSING = 16
+
+# Computed completion counts kept for signatures the table does not cover
+MAX_COMPUTED = 4096
+
+# Explicit table path; when unset the table built by artifacts.py is used.
+TABLE_PATH = os.environ.get('BALATRO_DRAW_ODDS')
+
+TABLE_MAGIC = b'BDOT'
+TABLE_VERSION = 2
+HEADER_FORMAT = '<4sHHI'  # magic, version, row length, entry count
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+RANK_PATTERNS = ('Four of a Kind', 'Three of a Kind', 'Two Pair', 'Full House')
+
+# Straight windows as sets of ranks, with the Ace-low window first.
+STRAIGHT_WINDOWS = [frozenset({14, 2, 3, 4, 5})] + [frozenset(range(start, start + 5)) for start in range(2, 11)]
+
+
+def pattern_signature(desired_pattern, kept_ranks, kept_suits, remaining_ranks, remaining_suits):
+    """
+    Reduce a discard decision to the small signature its completion odds depend on.
+
+    Parameters:
+    - desired_pattern (str): The pattern to aim for.
+    - kept_ranks (Counter): Kept card counts by rank value.
+    - kept_suits (Counter): Kept card counts by suit.
+    - remaining_ranks: Remaining deck counts indexed by rank value (e.g., Deck.rank_totals).
+    - remaining_suits: Remaining deck counts indexed by suit (e.g., Deck.suit_totals).
+
+    Returns:
+    - (signature, relevant): The signature tuple and the number of remaining cards
+      it covers, or None if the pattern cannot be completed from the kept cards.
+
+    Rank patterns also hold a (0, available) group for every rank not kept
+    but still in the deck, so pairs and trips drawn in new ranks count (e.g.,
+    the pair that completes a Full House on kept trips).
+    """
+    if desired_pattern in RANK_PATTERNS:
+        if not kept_ranks:
+            return None
+        groups = [(count, remaining_ranks[rank]) for rank, count in kept_ranks.items()]
+        groups += [(0, remaining_ranks[rank]) for rank in range(2, 15)
+                   if rank not in kept_ranks and remaining_ranks[rank]]
+        groups = tuple(sorted(groups))
+        return (desired_pattern, groups), sum(avail for _, avail in groups)
+
+    if desired_pattern == 'Flush':
+        if not kept_suits:
+            return None
+        groups = tuple(sorted((count, remaining_suits[suit]) for suit, count in kept_suits.items()))
+        return (desired_pattern, groups), sum(avail for _, avail in groups)
+
+    if desired_pattern == 'Straight':
+        kept_values = set(kept_ranks)
+        windows = [window for window in STRAIGHT_WINDOWS if kept_values <= window]
+        if not windows:
+            return None
+        missing = sorted(set().union(*windows) - kept_values)
+        index = {rank: i for i, rank in enumerate(missing)}
+        masks = tuple(sorted(sum(1 << index[rank] for rank in window - kept_values) for window in windows))
+        avail = tuple(remaining_ranks[rank] for rank in missing)
+        return (desired_pattern, avail, masks), sum(avail)
+
+    return None
+
+
+def _rank_state(state, final):
+    """Fold one group's final count into the capped (>=2, >=3, >=4, >=5) summary."""
+    n2, n3, n4, n5 = state
+    return (min(2, n2 + (final >= 2)), min(2, n3 + (final >= 3)),
+            min(1, n4 + (final >= 4)), min(1, n5 + (final >= 5)))
+
+
+RANK_PREDICATES = {
+    'Four of a Kind': lambda n2, n3, n4, n5: n4 >= 1,
+    'Three of a Kind': lambda n2, n3, n4, n5: n3 >= 1,
+    'Two Pair': lambda n2, n3, n4, n5: n2 >= 2,
+    'Full House': lambda n2, n3, n4, n5: n3 >= 1 and n2 >= 2,
+    'Flush': lambda n2, n3, n4, n5: n5 >= 1,
+}
+
+
+def completion_counts(signature, max_draws=MAX_DRAWS, deadline=None):
+    """
+    Count the ways to draw u relevant cards that complete the pattern, for u = 0..max_draws.
+
+    Cards outside the signature's groups never affect completion, so the probability
+    for any deck size and draw count follows from these counts (see counts_to_probability).
+
+    Parameters:
+    - signature (tuple): A signature built by pattern_signature.
+    - max_draws (int): Largest number of relevant cards to count draws for.
+    - deadline (float): time.perf_counter() value past which TimeoutError is
+      raised, checked between groups; None to always finish.
+
+    Returns:
+    - tuple: Completing draw counts indexed by the number of relevant cards drawn.
+    """
+    pattern = signature[0]
+    counts = [0] * (max_draws + 1)
+
+    if pattern == 'Straight':
+        _, avail, masks = signature
+        states = {(0, 0): 1}
+        for i, available in enumerate(avail):
+            if deadline is not None and time.perf_counter() >= deadline:
+                raise TimeoutError
+            next_states = {}
+            for (used, hit), ways in states.items():
+                for drawn in range(0, min(available, max_draws - used) + 1):
+                    key = (used + drawn, hit | (1 << i) if drawn else hit)
+                    next_states[key] = next_states.get(key, 0) + ways * math.comb(available, drawn)
+            states = next_states
+        for (used, hit), ways in states.items():
+            if any(mask & ~hit == 0 for mask in masks):
+                counts[used] += ways
+        return tuple(counts)
+
+    _, groups = signature
+    predicate = RANK_PREDICATES[pattern]
+    states = {(0, (0, 0, 0, 0)): 1}
+    for kept, available in groups:
+        if deadline is not None and time.perf_counter() >= deadline:
+            raise TimeoutError
+        next_states = {}
+        for (used, state), ways in states.items():
+            for drawn in range(0, min(available, max_draws - used) + 1):
+                key = (used + drawn, _rank_state(state, kept + drawn))
+                next_states[key] = next_states.get(key, 0) + ways * math.comb(available, drawn)
+        states = next_states
+    for (used, state), ways in states.items():
+        if predicate(*state):
+            counts[used] += ways
+    return tuple(counts)
+
+
+def counts_to_probability(counts, relevant, total, draws):
+    """
+    Turn completion counts into the probability of completing within `draws` draws.
+
+    Parameters:
+    - counts (tuple): Completion counts from completion_counts.
+    - relevant (int): Number of remaining cards covered by the signature.
+    - total (int): Number of cards left in the deck.
+    - draws (int): Number of cards that will be drawn.
+
+    Returns:
+    - float: The exact completion probability.
+    """
+    draws = max(0, min(draws, total))
+    denominator = math.comb(total, draws)
+    if denominator == 0:
+        return 0.0
+    rest = total - relevant
+    numerator = sum(counts[used] * math.comb(rest, draws - used)
+                    for used in range(min(draws, len(counts) - 1) + 1))
+    return numerator / denominator
+
+
+def signature_key(signature):
+    """Return the stable 64-bit table key for a signature."""
+    import hashlib
+    digest = hashlib.blake2b(repr(signature).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class DrawOddsTable:
+    """
+    Read-only view of a draw-odds table file through mmap.
+
+    Layout: header, then `count` sorted uint64 keys, then `count` rows of
+    MAX_DRAWS + 1 uint32 completion counts in the same order.
+    """
+
+    def __init__(self, path):
+        """
+        Open and validate a table file.
+
+        Parameters:
+        - path (str): Path to the table written by build_table.
+        """
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, row_length, count = struct.unpack_from(HEADER_FORMAT, self._mmap, 0)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION or row_length != MAX_DRAWS + 1:
+            self._mmap.close()
+            raise ValueError(f"Error: '{path}' is not a compatible draw-odds table.")
+        self.count = count
+        self._row_format = f'<{row_length}I'
+        self._row_size = struct.calcsize(self._row_format)
+        self._keys_offset = HEADER_SIZE
+        self._rows_offset = HEADER_SIZE + 8 * count
+
+    def lookup(self, key):
+        """Return the completion counts stored for key, or None if absent."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            (mid_key,) = struct.unpack_from('<Q', self._mmap, self._keys_offset + 8 * mid)
+            if mid_key < key:
+                lo = mid + 1
+            elif mid_key > key:
+                hi = mid
+            else:
+                return struct.unpack_from(self._row_format, self._mmap, self._rows_offset + self._row_size * mid)
+        return None
+
+    def close(self):
+        """Release the memory map."""
+        self._mmap.close()
+
+
+_table = None
+_table_loaded = False
+
+
+def get_table():
+    """Open the draw-odds table on first use; returns None when no table has been built."""
+    global _table, _table_loaded
+    if not _table_loaded:
+        _table_loaded = True
+        path = TABLE_PATH or artifact_path('drawodds')
+        if path and os.path.exists(path):
+            try:
+                _table = DrawOddsTable(path)
+            except ValueError as e:
+                print(f"Warning: {e} Falling back to direct computation.")
+    return _table
+
+
+# Completion counts computed for signatures the table does not cover, by (signature, max_draws)
+_computed = {}
+
+
+def _computed_counts(signature, max_draws, deadline=None):
+    key = (signature, max_draws)
+    if key not in _computed:
+        counts = completion_counts(signature, max_draws, deadline)
+        if len(_computed) >= MAX_COMPUTED:
+            del _computed[next(iter(_computed))]
+        _computed[key] = counts
+    return _computed[key]
+
+
+def table_counts(signature):
+    """Return a signature's completion counts for up to MAX_DRAWS relevant cards from the table, or None."""
+    table = get_table()
+    return None if table is None else table.lookup(signature_key(signature))
+
+
+def lookup_counts(signature, draws, deadline=None):
+    """
+    Return completion counts for a signature, from the table when it covers it.
+
+    Parameters:
+    - signature (tuple): A signature built by pattern_signature.
+    - draws (int): Number of cards that will be drawn.
+    - deadline (float): Passed to completion_counts when the counts have to be computed.
+
+    Returns:
+    - tuple: Completion counts covering at least `draws` relevant cards.
+    """
+    if draws <= MAX_DRAWS:
+        counts = table_counts(signature)
+        if counts is not None:
+            return counts
+    return _computed_counts(signature, max(draws, MAX_DRAWS), deadline)
+
+
+# --- Offline Table Generation ---
+
+def _multisets(kinds, max_size):
+    """Yield every non-empty sorted multiset of kinds with at most max_size members."""
+    for size in range(1, max_size + 1):
+        yield from itertools.combinations_with_replacement(kinds, size)
+
+
+def enumerate_signatures():
+    """
+    Enumerate the signatures the table covers, in a deterministic order.
+
+    Covers every rank-pattern shape of up to eight kept cards with at most
+    MAX_MISSING cards gone from a standard deck, Flush draws on up to two kept
+    suits, and Straight draws with at most five missing ranks.
+    """
+    signatures = []
+
+    rank_kinds = [(kept, avail) for kept in range(1, MAX_RANK_COPIES + 1)
+                  for avail in range(0, MAX_RANK_COPIES - kept + 1)]
+    for groups in _multisets(rank_kinds, MAX_DRAWS):
+        kept = sum(kept for kept, _ in groups)
+        # Cards of the kept ranks that are neither kept nor in the deck
+        gone = sum(MAX_RANK_COPIES - kept_copies - avail for kept_copies, avail in groups)
+        budget = MAX_MISSING - kept - gone
+        if kept > MAX_DRAWS or budget < 0:
+            continue
+        others = 13 - len(groups)
+        # Every other rank is in the deck less a few copies; ranks with none left are not listed
+        for size in range(min(others, budget) + 1):
+            for deficits in itertools.combinations_with_replacement(range(1, MAX_RANK_COPIES + 1), size):
+                if sum(deficits) > budget:
+                    continue
+                new_ranks = [(0, MAX_RANK_COPIES - deficit) for deficit in deficits if deficit < MAX_RANK_COPIES]
+                new_ranks += [(0, MAX_RANK_COPIES)] * (others - size)
+                for pattern in RANK_PATTERNS:
+                    signatures.append((pattern, tuple(sorted(groups + tuple(new_ranks)))))
+
+    suit_kinds = [(kept, avail) for kept in range(1, MAX_DRAWS + 1) for avail in range(0, 14 - kept)]
+    for groups in _multisets(suit_kinds, 2):
+        if sum(kept for kept, _ in groups) <= MAX_DRAWS:
+            signatures.append(('Flush', groups))
+
+    structures = set()
+    for size in range(1, 6):
+        for kept_values in itertools.combinations(range(2, 15), size):
+            kept_values = set(kept_values)
+            windows = [window for window in STRAIGHT_WINDOWS if kept_values <= window]
+            if not windows:
+                continue
+            missing = sorted(set().union(*windows) - kept_values)
+            if len(missing) > 5:
+                continue
+            index = {rank: i for i, rank in enumerate(missing)}
+            masks = tuple(sorted(sum(1 << index[rank] for rank in window - kept_values) for window in windows))
+            structures.add((len(missing), masks))
+    for width, masks in sorted(structures):
+        for avail in itertools.product(range(MAX_RANK_COPIES + 1), repeat=width):
+            signatures.append(('Straight', avail, masks))
+
+    return signatures
+
+
+def _table_entry(signature):
+    return signature_key(signature), completion_counts(signature)
+
+
+def build_table(path, processes=None, chunksize=512):
+    """
+    Generate the draw-odds table and write it to path.
+
+    The output depends only on the enumerated signatures, so repeated builds
+    produce byte-identical files regardless of the number of processes.
+
+    Parameters:
+    - path (str): Output file path.
+    - processes (int): Worker processes (defaults to the CPU count).
+    - chunksize (int): Signatures handed to a worker at a time.
+
+    Returns:
+    - int: Number of entries written.
+    """
+    from multiprocessing import Pool
+
+    signatures = enumerate_signatures()
+    with Pool(processes) as pool:
+        entries = pool.map(_table_entry, signatures, chunksize=chunksize)
+    entries.sort()
+
+    row_format = f'<{MAX_DRAWS + 1}I'
+    for (key, counts), (next_key, _) in zip(entries, entries[1:]):
+        if key == next_key:
+            raise ValueError(f"Error: Signature key collision on {key:#018x}.")
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(struct.pack(HEADER_FORMAT, TABLE_MAGIC, TABLE_VERSION, MAX_DRAWS + 1, len(entries)))
+        for key, _ in entries:
+            f.write(struct.pack('<Q', key))
+        for _, counts in entries:
+            f.write(struct.pack(row_format, *counts))
+    os.replace(tmp_path, path)
+    return len(entries)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate the draw-odds table used by discard.py.")
+    parser.add_argument('--output', required=True, help="Table file to write (artifacts.py builds it into the cache).")
+    parser.add_argument('--processes', type=int, default=None, help="Worker processes (default: all cores).")
+    args = parser.parse_args()
+    count = build_table(args.output, args.processes)
+    print(f"Wrote {count} entries to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# jokerCatalog.py
+
+from dataclasses import dataclass
+
+# What a Joker reacts to, what it does, and when it does it
+TRIGGERS = ('always', 'contains', 'suit', 'rank')
+EFFECTS = ('chips', 'mult', 'xmult')
+ORDERS = ('card', 'hand')
+
+FACE_RANKS = ('Jack', 'Queen', 'King')
+
+
+@dataclass(frozen=True)
+class JokerSpec:
+    """
+    A Joker defined as data: a trigger, an effect and when the effect applies.
+
+    'card' Jokers apply once for each played card their trigger matches, as the
+    cards score; 'hand' Jokers apply once afterwards, in loadout order.
+    """
+    name: str
+    description: str
+    trigger: str            # 'always', 'contains' (a hand type), 'suit' or 'rank' (of a played card)
+    effect: str             # 'chips' (+chips), 'mult' (+mult) or 'xmult' (x mult)
+    amount: float
+    target: object = None   # Hand type for 'contains', suit for 'suit', tuple of ranks for 'rank'
+    order: str = 'hand'     # 'card' or 'hand'
+
+    def __post_init__(self):
+        if self.trigger not in TRIGGERS or self.effect not in EFFECTS or self.order not in ORDERS:
+            raise ValueError(f"Error: Invalid definition for Joker '{self.name}'.")
+        if (self.trigger in ('suit', 'rank')) != (self.order == 'card'):
+            raise ValueError(f"Error: Joker '{self.name}' must apply per card exactly when it triggers on a card.")
+
+
+def _contains(name, pattern, effect, amount, description):
+    return JokerSpec(name, description, 'contains', effect, amount, target=pattern)
+
+
+def _suit(name, suit, effect, amount, description):
+    return JokerSpec(name, description, 'suit', effect, amount, target=suit, order='card')
+
+
+def _rank(name, ranks, effect, amount, description):
+    return JokerSpec(name, description, 'rank', effect, amount, target=ranks, order='card')
+
+
+# Define all Jokers; JokerManager loads this module on first use
+JOKER_CATALOG = {spec.name: spec for spec in [
+    JokerSpec('Joker', "+4 Mult", 'always', 'mult', 4),
+    _suit('Greedy Joker', 'Diamond', 'mult', 3, "Played cards with Diamond suit give +3 Mult when scored"),
+    _suit('Lusty Joker', 'Heart', 'mult', 3, "Played cards with Heart suit give +3 Mult when scored"),
+    _suit('Wrathful Joker', 'Spade', 'mult', 3, "Played cards with Spade suit give +3 Mult when scored"),
+    _suit('Gluttonous Joker', 'Club', 'mult', 3, "Played cards with Club suit give +3 Mult when scored"),
+    _contains('Jolly Joker', 'Pair', 'mult', 8, "+8 Mult if played hand contains a Pair"),
+    _contains('Zany Joker', 'Three of a Kind', 'mult', 12, "+12 Mult if played hand contains a Three of a Kind"),
+    _contains('Mad Joker', 'Two Pair', 'mult', 10, "+10 Mult if played hand contains a Two Pair"),
+    _contains('Crazy Joker', 'Straight', 'mult', 12, "+12 Mult if played hand contains a Straight"),
+    _contains('Droll Joker', 'Flush', 'mult', 10, "+10 Mult if played hand contains a Flush"),
+    _contains('Sly Joker', 'Pair', 'chips', 50, "+50 Chips if played hand contains a Pair"),
+    _contains('Wily Joker', 'Three of a Kind', 'chips', 100, "+100 Chips if played hand contains a Three of a Kind"),
+    _contains('Clever Joker', 'Two Pair', 'chips', 80, "+80 Chips if played hand contains a Two Pair"),
+    _contains('Devious Joker', 'Straight', 'chips', 100, "+100 Chips if played hand contains a Straight"),
+    _contains('Crafty Joker', 'Flush', 'chips', 80, "+80 Chips if played hand contains a Flush"),
+    _contains('The Duo', 'Pair', 'xmult', 2, "X2 Mult if played hand contains a Pair"),
+    _contains('The Trio', 'Three of a Kind', 'xmult', 3, "X3 Mult if played hand contains a Three of a Kind"),
+    _contains('The Family', 'Four of a Kind', 'xmult', 4, "X4 Mult if played hand contains a Four of a Kind"),
+    _contains('The Order', 'Straight', 'xmult', 3, "X3 Mult if played hand contains a Straight"),
+    _contains('The Tribe', 'Flush', 'xmult', 2, "X2 Mult if played hand contains a Flush"),
+    _suit('Arrowhead', 'Spade', 'chips', 50, "Played cards with Spade suit give +50 Chips when scored"),
+    _suit('Onyx Agate', 'Club', 'mult', 7, "Played cards with Club suit give +7 Mult when scored"),
+    _rank('Scary Face', FACE_RANKS, 'chips', 30, "Played face cards give +30 Chips when scored"),
+    _rank('Smiley Face', FACE_RANKS, 'mult', 5, "Played face cards give +5 Mult when scored"),
+    _rank('Even Steven', ('10', '8', '6', '4', '2'), 'mult', 4,
+          "Played cards with even rank give +4 Mult when scored (10, 8, 6, 4, 2)"),
+    _rank('Odd Todd', ('Ace', '9', '7', '5', '3'), 'chips', 31,
+          "Played cards with odd rank give +31 Chips when scored (A, 9, 7, 5, 3)"),
+    _rank('Fibonacci', ('Ace', '2', '3', '5', '8'), 'mult', 8,
+          "Each played Ace, 2, 3, 5, or 8 gives +8 Mult when scored"),
+]}
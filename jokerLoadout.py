@@ -0,0 +1,364 @@
+# jokerLoadout.py
+
+import heapq
+import math
+import os
+import random
+from operator import add, mul
+import play
+from deck import as_deck, make_deck
+from planetValue import HAND_SIZE
+
+# Search tables shared with the worker processes (see _init_worker)
+_tables = None
+_shared_threshold = None
+
+
+def hand_features(remaining_deck, jokers, hand_size=HAND_SIZE, samples=2000, seed=0, progress=None):
+    """
+    Sample hands from a deck and reduce each to the plays a loadout can choose between.
+
+    For every hand type a sampled hand can form, its best play (see
+    play.best_plays_by_type) is kept as (chips, mult, bonuses): the chips and
+    mult of the hand type with its pattern cards, and the (chips, mult, xmult)
+    each Joker gives that play (see Joker.bonus). Per-card Jokers count only
+    the scoring cards, not the kickers. The Jokers are run here, once per
+    distinct play, so scoring a loadout afterwards is arithmetic on these rows.
+
+    Parameters:
+    - remaining_deck: Deck (or card names) the hands are drawn from.
+    - jokers (list): Joker objects with catalog specs, in the order of the bonuses.
+    - hand_size (int): Cards per hand.
+    - samples (int): Hands to draw.
+    - seed (int): Seed for the draws, so results are reproducible.
+    - progress: Optional progress(done, total) callback counting hands; it may raise to abandon the sampling.
+
+    Returns:
+    - list: (count, plays) rows, one per distinct hand; count is how many sampled hands it stands for.
+    """
+    pool = list(as_deck(remaining_deck))
+    if len(pool) < hand_size:
+        raise ValueError(f"Error: The deck has {len(pool)} cards, fewer than a hand of {hand_size}.")
+    rng = random.Random(seed)
+    bonuses_of = {}
+    rows = {}
+    for done in range(samples):
+        if progress is not None and done % 100 == 0:
+            progress(done, samples)
+        plays = []
+        for pattern, (pattern_chips, cards, scoring) in play.best_plays_by_type(rng.sample(pool, hand_size)).items():
+            key = (tuple(sorted(cards)), tuple(sorted(scoring)))
+            if key not in bonuses_of:
+                pairs = [tuple(card.split()) for card in cards]
+                scored = [tuple(card.split()) for card in scoring]
+                bonuses_of[key] = tuple(joker.bonus(scored, pairs) for joker in jokers)
+            chips, mult = play.HAND_SCORES[pattern]
+            plays.append((chips + pattern_chips, mult, bonuses_of[key]))
+        plays = tuple(sorted(plays))
+        rows[plays] = rows.get(plays, 0) + 1
+    return [(count, plays) for plays, count in rows.items()]
+
+
+def loadout_total(rows, loadout):
+    """
+    Sum over the rows of the best play's score with the Jokers at indices loadout.
+
+    Chips and +mult bonuses are added before the xmult factors are applied,
+    the order that scores best.
+    """
+    total = 0
+    for count, plays in rows:
+        best = 0
+        for chips, mult, bonuses in plays:
+            factor = 1
+            for j in loadout:
+                bonus_chips, bonus_mult, xmult = bonuses[j]
+                chips += bonus_chips
+                mult += bonus_mult
+                factor *= xmult
+            score = int(chips * mult * factor)
+            if score > best:
+                best = score
+        total += count * best
+    return total
+
+
+def search_tables(rows, slots):
+    """
+    Lay the rows out for the loadout search as flat lists, one entry per play.
+
+    Plays are grouped by rows with the same number of plays, and within a
+    group stored play by play, so the best play of every row is one map(max)
+    over slices. Scoring a loadout is then a handful of maps over these
+    lists instead of a Python loop over the plays.
+
+    Parameters:
+    - rows (list): Rows from hand_features, bonuses in search order.
+    - slots (int): Jokers in a loadout.
+
+    Returns:
+    - dict: 'groups' as (offset, rows, plays, counts), the base 'chips' and
+      'mult' of every play, each Joker's (chips, mult, xmult) 'bonuses' per
+      play, and 'tops': for each first Joker index s, the sums (products for
+      xmult) of the a largest bonuses of every kind among Jokers s and later,
+      for a below slots.
+    """
+    jokers = len(rows[0][1][0][2]) if rows and rows[0][1] else 0
+    by_size = {}
+    for count, plays in rows:
+        by_size.setdefault(len(plays), []).append((count, plays))
+    groups = []
+    flat = []
+    for size, group in sorted(by_size.items()):
+        groups.append((len(flat), len(group), size, [count for count, plays in group]))
+        for i in range(size):
+            flat.extend(plays[i] for count, plays in group)
+
+    chips = [play[0] for play in flat]
+    mult = [play[1] for play in flat]
+    bonuses = [tuple([play[2][j][kind] for play in flat] for kind in range(3)) for j in range(jokers)]
+
+    # Top-a bonuses among Jokers s.. either skip Joker s or take it with the top a - 1 after it
+    zeros = [0] * len(flat)
+    ones = [1] * len(flat)
+    tops = [None] * (jokers + 1)
+    tops[jokers] = ([zeros] * slots, [zeros] * slots, [ones] * slots)
+    for j in range(jokers - 1, -1, -1):
+        later = tops[j + 1]
+        kinds = []
+        for kind, combine in ((0, add), (1, add), (2, mul)):
+            values = bonuses[j][kind]
+            below = later[kind]
+            kinds.append([below[0]] + [list(map(max, below[a], map(combine, values, below[a - 1])))
+                                       for a in range(1, slots)])
+        tops[j] = tuple(kinds)
+    return {'groups': groups, 'chips': chips, 'mult': mult, 'bonuses': bonuses, 'tops': tops}
+
+
+def _row_total(tables, scores):
+    """Sum over the rows of count times the best of their plays' scores (a flat list)."""
+    total = 0
+    for offset, size, plays, counts in tables['groups']:
+        columns = [scores[offset + i * size:offset + (i + 1) * size] for i in range(plays)]
+        total += sum(map(mul, counts, map(max, *columns) if plays > 1 else columns[0]))
+    return total
+
+
+def _table_bound(tables, chips, mult, factor, first, slots):
+    """loadout_bound on the flat lists: the loadout's running chips, mult and factor per play."""
+    top_chips, top_mult, top_xmult = tables['tops'][first]
+    mults = [mult] + [list(map(add, mult, top_mult[b])) for b in range(1, slots + 1)]
+    factors = [factor] + [list(map(mul, factor, top_xmult[c])) for c in range(1, slots + 1)]
+    best = None
+    for a in range(slots + 1):
+        split_chips = list(map(add, chips, top_chips[a])) if a else chips
+        for b in range(slots - a + 1):
+            scores = map(mul, map(mul, split_chips, mults[b]), factors[slots - a - b])
+            best = list(scores) if best is None else list(map(max, best, scores))
+    return _row_total(tables, best)
+
+
+def loadout_bound(rows, loadout, remaining, slots):
+    """
+    Upper bound on loadout_total for loadout plus any slots more Jokers from remaining.
+
+    Each play gets the loadout's bonuses plus the best that slots more Jokers
+    chosen for that play alone could add, which no actual choice can exceed.
+    Every Joker gives one kind of bonus, so that best is the best split of the
+    slots between the largest chip, mult and xmult bonuses among the
+    remaining Jokers.
+    """
+    remaining = list(remaining)
+    total = 0
+    for count, plays in rows:
+        best = 0
+        for chips, mult, bonuses in plays:
+            factor = 1
+            for j in loadout:
+                bonus_chips, bonus_mult, xmult = bonuses[j]
+                chips += bonus_chips
+                mult += bonus_mult
+                factor *= xmult
+            extras = [bonuses[j] for j in remaining]
+            top_chips = sorted((extra[0] for extra in extras), reverse=True)
+            top_mult = sorted((extra[1] for extra in extras), reverse=True)
+            top_xmult = sorted((extra[2] for extra in extras), reverse=True)
+            for used_chips in range(slots + 1):
+                split_chips = chips + sum(top_chips[:used_chips])
+                for used_mult in range(slots - used_chips + 1):
+                    split_factor = factor
+                    for xmult in top_xmult[:slots - used_chips - used_mult]:
+                        split_factor *= xmult
+                    score = split_chips * (mult + sum(top_mult[:used_mult])) * split_factor
+                    if score > best:
+                        best = score
+        total += count * best
+    return total
+
+
+def _init_worker(tables, shared_threshold):
+    global _tables, _shared_threshold
+    _tables = tables
+    _shared_threshold = shared_threshold
+
+
+def _search_from(first, size, count, top_n):
+    """
+    Branch and bound over the loadouts of size Jokers (indices below count) whose lowest index is first.
+
+    Each partial loadout carries its running chips, mult and factor for every
+    play, so adding a Joker is three maps over the search tables.
+
+    Returns:
+    - (top, evaluated, pruned): the top_n (total, loadout) pairs, and the
+      loadouts scored and branches cut by their bound.
+    """
+    top = []  # Min-heap of the top_n (total, loadout) found
+    stats = {'evaluated': 0, 'pruned': 0}
+    bonuses = _tables['bonuses']
+
+    def threshold():
+        local = top[0][0] if len(top) >= top_n else -1
+        if _shared_threshold is None:
+            return local
+        # Any worker's top_n-th best is a lower bound on the overall top_n-th best
+        with _shared_threshold.get_lock():
+            if local > _shared_threshold.value:
+                _shared_threshold.value = local
+            return _shared_threshold.value
+
+    def score(loadout, scores):
+        stats['evaluated'] += 1
+        total = _row_total(_tables, list(map(int, scores)))
+        if len(top) < top_n:
+            heapq.heappush(top, (total, loadout))
+        elif total > top[0][0]:
+            heapq.heapreplace(top, (total, loadout))
+
+    def visit(loadout, chips, mult, factor):
+        slots = size - len(loadout)
+        if slots == 0:
+            score(loadout, map(mul, map(mul, chips, mult), factor))
+            return
+        if _table_bound(_tables, chips, mult, factor, loadout[-1] + 1, slots) < threshold():
+            stats['pruned'] += 1
+            return
+        for j in range(loadout[-1] + 1, count - slots + 1):
+            bonus_chips, bonus_mult, xmult = bonuses[j]
+            if slots == 1:
+                # The last Joker: score the loadout without keeping its running lists
+                score(loadout + (j,), map(mul, map(mul, map(add, chips, bonus_chips), map(add, mult, bonus_mult)),
+                                          map(mul, factor, xmult)))
+            else:
+                visit(loadout + (j,), list(map(add, chips, bonus_chips)), list(map(add, mult, bonus_mult)),
+                      list(map(mul, factor, xmult)))
+
+    bonus_chips, bonus_mult, xmult = bonuses[first]
+    visit((first,), list(map(add, _tables['chips'], bonus_chips)), list(map(add, _tables['mult'], bonus_mult)),
+          xmult)
+    return top, stats['evaluated'], stats['pruned']
+
+
+def optimize_loadout(jokers, remaining_deck, slots=5, top_n=5, samples=2000, seed=0, workers=None, stats=None,
+                     progress=None):
+    """
+    Find the Joker loadouts with the highest expected score per hand.
+
+    Every hand in a sampled pool is reduced once to its plays (see
+    hand_features); each loadout of `slots` Jokers then picks the best play
+    of every hand. Jokers are tried best single gain first, and a partial
+    loadout is dropped once even its best completion cannot reach the top_n.
+    The search is split by the loadout's first Joker across `workers`
+    processes (defaults to every core), which share the best top_n-th score.
+
+    Parameters:
+    - jokers (dict): Jokers by name, e.g. JokerManager.all_jokers.
+    - remaining_deck: Deck (or card names) hands are drawn from.
+    - slots (int): Jokers in a loadout.
+    - top_n (int): Loadouts to return.
+    - samples (int): Hands in the pool.
+    - seed (int): Seed for the sampled hands.
+    - workers (int): Processes to search with; 1 searches in this process.
+    - stats (dict): Optional dict filled with the 'loadouts' possible, 'evaluated' and 'pruned'.
+    - progress: Optional progress(done, total) callback counting hands sampled, then
+      first Jokers searched; it may raise to abandon the search.
+
+    Returns:
+    - list: Dicts with 'jokers' (names), 'expected_score' per hand and 'gain'
+      over playing without Jokers, best first.
+    """
+    names = list(jokers)
+    if not 0 < slots <= len(names):
+        raise ValueError(f"Error: A loadout needs between 1 and {len(names)} Jokers.")
+    rows = hand_features(remaining_deck, [jokers[name] for name in names], samples=samples, seed=seed,
+                         progress=progress)
+    hands = sum(count for count, plays in rows)
+    baseline = loadout_total(rows, ())
+
+    # Strong Jokers first, so good loadouts are found early and prune the rest
+    singles = {j: loadout_total(rows, (j,)) for j in range(len(names))}
+    order = sorted(singles, key=singles.get, reverse=True)
+    names = [names[j] for j in order]
+    rows = [(count, tuple((chips, mult, tuple(bonuses[j] for j in order)) for chips, mult, bonuses in plays))
+            for count, plays in rows]
+
+    tables = search_tables(rows, slots)
+    firsts = range(len(names) - slots + 1)
+    workers = workers or os.cpu_count() or 1
+    results = []
+    if progress is not None:
+        progress(0, len(firsts))
+    if workers == 1:
+        _init_worker(tables, None)
+        for first in firsts:
+            results.append(_search_from(first, slots, len(names), top_n))
+            if progress is not None:
+                progress(len(results), len(firsts))
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        shared = multiprocessing.Value('d', -1.0)
+        pool = ProcessPoolExecutor(max_workers=min(workers, len(firsts)), initializer=_init_worker,
+                                   initargs=(tables, shared))
+        try:
+            futures = [pool.submit(_search_from, first, slots, len(names), top_n) for first in firsts]
+            for future in as_completed(futures):
+                results.append(future.result())
+                if progress is not None:
+                    progress(len(results), len(firsts))
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    found = [entry for top, evaluated, pruned in results for entry in top]
+    found.sort(key=lambda entry: (-entry[0], entry[1]))
+    if stats is not None:
+        stats['loadouts'] = math.comb(len(names), slots)
+        stats['evaluated'] = sum(evaluated for top, evaluated, pruned in results)
+        stats['pruned'] = sum(pruned for top, evaluated, pruned in results)
+    return [{
+        'jokers': [names[j] for j in loadout],
+        'expected_score': total / hands,
+        'gain': (total - baseline) / hands
+    } for total, loadout in found[:top_n]]
+
+
+def main():
+    from jokers import JokerManager
+
+    try:
+        slots = int(input("Joker slots (e.g., 5): ").strip() or 5)
+        play.update_hand_scores()
+        stats = {}
+        loadouts = optimize_loadout(JokerManager().all_jokers, make_deck(), slots=slots, stats=stats)
+        print(f"\nBest loadouts of {slots} Jokers, expected score per hand from a full deck:")
+        for idx, loadout in enumerate(loadouts, 1):
+            print(f"{idx}. {', '.join(loadout['jokers'])}: {loadout['expected_score']:.2f} "
+                  f"(+{loadout['gain']:.2f})")
+        print(f"\nLoadouts scored: {stats['evaluated']} of {stats['loadouts']}, branches pruned: {stats['pruned']}")
+    except ValueError as e:
+        print(e)
+
+
+if __name__ == "__main__":
+    main()
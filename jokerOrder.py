@@ -0,0 +1,237 @@
+# jokerOrder.py
+
+import math
+import random
+import play
+from deck import as_deck
+from jokers import compile_jokers
+from planetValue import HAND_SIZE
+
+# Effects whose order changes the mult: runs of one kind commute, so only their interleaving matters
+ORDERED_EFFECTS = ('mult', 'xmult')
+
+
+def order_features(remaining_deck, jokers, hand_size=HAND_SIZE, samples=2000, seed=0, progress=None):
+    """
+    Sample hands from a deck and reduce each to what a Joker order acts on.
+
+    Like jokerLoadout.hand_features, every hand type a sampled hand can form
+    gives its best play. Each play is kept as (chips, mult, bonuses): the
+    chips and mult after the Jokers applied per scoring card (which always
+    run first, see compile_jokers; kickers do not trigger them), and the
+    (chips, mult, xmult) each of the other Jokers gives the play.
+
+    Parameters:
+    - remaining_deck: Deck (or card names) the hands are drawn from.
+    - jokers (list): Joker objects with catalog specs, in loadout order.
+    - hand_size (int): Cards per hand.
+    - samples (int): Hands to draw.
+    - seed (int): Seed for the draws, so results are reproducible.
+    - progress: Optional progress(done, total) callback counting hands; it may raise to abandon the sampling.
+
+    Returns:
+    - list: (count, plays) rows, one per distinct hand, with bonuses for the
+      Jokers applied per hand, in loadout order.
+    """
+    pool = list(as_deck(remaining_deck))
+    if len(pool) < hand_size:
+        raise ValueError(f"Error: The deck has {len(pool)} cards, fewer than a hand of {hand_size}.")
+    card_phase = compile_jokers([joker.spec for joker in jokers if joker.spec.order == 'card'])
+    hand_jokers = [joker for joker in jokers if joker.spec.order == 'hand']
+    rng = random.Random(seed)
+    features = {}
+    rows = {}
+    for done in range(samples):
+        if progress is not None and done % 100 == 0:
+            progress(done, samples)
+        plays = []
+        for pattern, (pattern_chips, cards, scoring) in play.best_plays_by_type(rng.sample(pool, hand_size)).items():
+            key = (pattern, tuple(sorted(cards)), tuple(sorted(scoring)))
+            if key not in features:
+                pairs = [tuple(card.split()) for card in cards]
+                scored = [tuple(card.split()) for card in scoring]
+                chips, mult = play.HAND_SCORES[pattern]
+                chips, mult = card_phase(chips + pattern_chips, mult, scored, pairs)
+                features[key] = (chips, mult, tuple(joker.bonus(scored, pairs) for joker in hand_jokers))
+            plays.append(features[key])
+        plays = tuple(sorted(plays))
+        rows[plays] = rows.get(plays, 0) + 1
+    return [(count, plays) for plays, count in rows.items()]
+
+
+def order_total(rows, order):
+    """
+    Sum over the rows of the best play's score with the per-hand Jokers applied in order.
+
+    Parameters:
+    - rows (list): Rows from order_features.
+    - order (list): Indices of the per-hand Jokers, in the order they apply.
+    """
+    total = 0
+    for count, plays in rows:
+        best = 0
+        for chips, mult, bonuses in plays:
+            for j in order:
+                bonus_chips, bonus_mult, xmult = bonuses[j]
+                chips += bonus_chips
+                mult = (mult + bonus_mult) * xmult
+            score = int(chips * mult)
+            if score > best:
+                best = score
+        total += count * best
+    return total
+
+
+def count_orders(additive, multiplicative):
+    """
+    Count the orders of additive and multiplicative effects that can score differently.
+
+    Effects of one kind in a row commute, so an order is a sequence of runs of
+    alternating kinds, each run a set.
+    """
+    memo = {}
+
+    def orders(a, x, last):
+        if not a and not x:
+            return 1
+        if (a, x, last) not in memo:
+            memo[a, x, last] = (
+                (sum(math.comb(a, k) * orders(a - k, x, 'mult') for k in range(1, a + 1)) if last != 'mult' else 0)
+                + (sum(math.comb(x, k) * orders(a, x - k, 'xmult') for k in range(1, x + 1)) if last != 'xmult'
+                   else 0))
+        return memo[a, x, last]
+
+    return orders(additive, multiplicative, None)
+
+
+def _search(rows, movable, kinds, stats):
+    """
+    Branch and bound over the orders of the movable per-hand Jokers.
+
+    An order is built one Joker at a time, each partial order carrying the
+    running chips and mult of every play, so a prefix shared by many orders is
+    computed once. A Joker of the same kind as the one before it must have a
+    higher index, which keeps one order per run of commuting effects. A
+    partial order is dropped when even adding every remaining +mult and
+    multiplying by every remaining xmult above 1 cannot beat the best found.
+
+    Returns:
+    - (total, order): The best order of the movable Jokers and its total.
+    """
+    state = [[[chips, mult] for chips, mult, bonuses in plays] for count, plays in rows]
+    # The chips bonuses commute with everything, so they are added up front
+    for r, (count, plays) in enumerate(rows):
+        for p, (chips, mult, bonuses) in enumerate(plays):
+            state[r][p][0] += sum(bonuses[j][0] for j in range(len(bonuses)) if j not in movable)
+    best = [-1, None]
+
+    def bound(state, remaining):
+        total = 0
+        for (count, plays), values in zip(rows, state):
+            top = 0
+            for (chips, mult, bonuses), (chips_now, mult_now) in zip(plays, values):
+                if mult_now < 0:
+                    return math.inf
+                adds = sum(max(bonuses[j][1], 0) for j in remaining)
+                factor = math.prod(max(bonuses[j][2], 1) for j in remaining)
+                top = max(top, chips_now * (mult_now + adds) * factor)
+            total += count * top
+        return total
+
+    def visit(order, state, remaining):
+        if not remaining:
+            stats['evaluated'] += 1
+            total = sum(count * max([0] + [int(chips * mult) for chips, mult in values])
+                        for (count, plays), values in zip(rows, state))
+            if total > best[0]:
+                best[:] = [total, tuple(order)]
+            return
+        if best[1] is not None and bound(state, remaining) <= best[0]:
+            stats['pruned'] += 1
+            return
+        # Additive effects first: that order is the best one whenever no xmult is below 1
+        for j in sorted(remaining, key=lambda j: kinds[j] == 'xmult'):
+            if order and kinds[order[-1]] == kinds[j] and j < order[-1]:
+                continue
+            new_state = [[[chips_now, (mult_now + bonuses[j][1]) * bonuses[j][2]]
+                          for (chips, mult, bonuses), (chips_now, mult_now) in zip(plays, values)]
+                         for (count, plays), values in zip(rows, state)]
+            visit(order + [j], new_state, remaining - {j})
+
+    visit([], state, frozenset(movable))
+    return best[0], list(best[1])
+
+
+def optimize_order(jokers, remaining_deck, samples=2000, seed=0, stats=None, progress=None):
+    """
+    Find the order of a loadout that scores best.
+
+    Jokers apply left to right (see JokerManager.apply_jokers_effects), so a
+    +mult Joker after an xmult one adds less. Only the per-hand +mult and
+    xmult Jokers can be reordered to any effect: Jokers applied per card
+    always run first, and chips are added whatever the order.
+
+    Parameters:
+    - jokers (list): The enabled Jokers, in their current order (e.g., JokerManager.enabled_jokers).
+    - remaining_deck: Deck (or card names) hands are drawn from.
+    - samples (int): Hands in the pool.
+    - seed (int): Seed for the sampled hands.
+    - stats (dict): Optional dict filled with the 'permutations' of the
+      reorderable Jokers, the 'orders' that can score differently, and the
+      orders 'evaluated' and branches 'pruned'.
+    - progress: Optional progress(done, total) callback counting hands sampled; it may raise to abandon the search.
+
+    Returns:
+    - dict: 'order' (names, the whole loadout), 'expected_score' per hand
+      with it, 'current_score' with the current order, and the 'gain'.
+    """
+    rows = order_features(remaining_deck, jokers, samples=samples, seed=seed, progress=progress)
+    hands = sum(count for count, plays in rows)
+    hand_jokers = [joker for joker in jokers if joker.spec.order == 'hand']
+    kinds = [joker.spec.effect for joker in hand_jokers]
+    movable = [j for j, kind in enumerate(kinds) if kind in ORDERED_EFFECTS]
+    current = order_total(rows, range(len(hand_jokers)))
+
+    counters = {'evaluated': 0, 'pruned': 0}
+    total, best = _search(rows, movable, kinds, counters)
+    if not movable:
+        total = current
+    # The reorderable Jokers take the places they hold now, in the best order
+    placed = iter(best)
+    order = []
+    for joker in jokers:
+        if joker.spec.order == 'hand' and joker.spec.effect in ORDERED_EFFECTS:
+            joker = hand_jokers[next(placed)]
+        order.append(joker.name)
+    if stats is not None:
+        stats['permutations'] = math.factorial(len(movable))
+        stats['orders'] = count_orders(kinds.count('mult'), kinds.count('xmult'))
+        stats.update(counters)
+    return {'order': order, 'expected_score': total / hands, 'current_score': current / hands,
+            'gain': (total - current) / hands}
+
+
+def main():
+    from deck import make_deck
+    from jokers import JokerManager
+
+    try:
+        names = [name.strip() for name in input("Jokers in order, separated by commas: ").split(',') if name.strip()]
+        manager = JokerManager()
+        unknown = [name for name in names if name not in manager.all_jokers]
+        if unknown:
+            raise ValueError(f"Error: Unknown Jokers: {', '.join(unknown)}.")
+        play.update_hand_scores()
+        stats = {}
+        result = optimize_order([manager.all_jokers[name] for name in names], make_deck(), stats=stats)
+        print(f"\nBest order: {', '.join(result['order'])}")
+        print(f"Expected score per hand from a full deck: {result['expected_score']:.2f} "
+              f"(current order {result['current_score']:.2f}, +{result['gain']:.2f})")
+        print(f"Orders: {stats['permutations']} permutations, {stats['orders']} distinct, "
+              f"{stats['evaluated']} scored, {stats['pruned']} branches pruned")
+    except ValueError as e:
+        print(e)
+
+
+if __name__ == "__main__":
+    main()
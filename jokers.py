@@ -8,18 +8,64 @@ class Joker:
     Represents a single Joker with a name and an effect function.
     """
 
-    def __init__(self, name: str, effect: Callable[[Dict[str, Any]], None]):
+    def __init__(self, name: str, effect: Callable[[Dict[str, Any]], None] = None, spec=None):
         """
         Initialize a Joker.
 
         Parameters:
         - name (str): The name of the Joker.
         - effect (Callable): A function that applies the Joker's effect to the game state.
+        - spec (JokerSpec): The Joker's catalog entry; its effect is compiled from it on first use.
         """
         self.name = name
-        self.effect = effect
+        self.spec = spec
+        self._effect = effect
+        self._scorer = None
         self.enabled = False  # Indicates whether the Joker is enabled
 
+    @property
+    def effect(self) -> Callable[[Dict[str, Any]], None]:
+        if self._effect is None:
+            self._effect = self._spec_effect
+        return self._effect
+
+    def scorer(self):
+        """Return the compiled scoring function of this Joker alone (see compile_jokers)."""
+        if self._scorer is None:
+            self._scorer = compile_jokers([self.spec])
+        return self._scorer
+
+    def bonus(self, scored, played=None):
+        """
+        Return what this Joker adds to a play on its own.
+
+        Parameters:
+        - scored (list): The scoring cards as (rank, suit) pairs; per-card Jokers trigger on these.
+        - played (list): Every card played, kickers included, for the 'contains' checks (defaults to scored).
+
+        Returns:
+        - (chips, mult, xmult): Chips and mult added, and the factor the mult is multiplied by.
+        """
+        score = self.scorer()
+        played = scored if played is None else played
+        if self.spec.effect == 'xmult':
+            return 0, 0, score(0, 1, scored, played)[1]
+        chips, mult = score(0, 0, scored, played)
+        return chips, mult, 1
+
+    def _spec_effect(self, game_state: Dict[str, Any]):
+        chips = game_state.get('chips', 0)
+        mult = game_state['multiplier']
+        new_chips, new_mult = self.scorer()(chips, mult, card_pairs(game_state.get('played_cards', [])),
+                                            card_pairs(game_state.get('hand', [])))
+        if (new_chips, new_mult) == (chips, mult):
+            print(f"Joker '{self.name}' not applied: {self.spec.description}.")
+            return
+        if new_chips != chips:
+            game_state['chips'] = new_chips
+        game_state['multiplier'] = new_mult
+        print(f"Joker '{self.name}' applied: {self.spec.description}. Total Multiplier: {new_mult}")
+
     def apply_effect(self, game_state: Dict[str, Any]):
         """
         Apply the Joker's effect to the game state if enabled.
@@ -36,151 +82,33 @@ class Joker:
 class JokerManager:
     """
     Manages all Jokers: enabling, disabling, listing, and applying their effects.
+
+    The Joker catalog (jokerCatalog.py) is loaded on first use, and the enabled
+    Jokers are compiled into a single scoring function that is rebuilt only
+    when the loadout changes.
     """
 
     def __init__(self):
         """
-        Initialize the JokerManager with all Jokers defined.
+        Initialize the JokerManager with no Jokers enabled.
         """
-        self.all_jokers: Dict[str, Joker] = {}
+        self._all_jokers: Dict[str, Joker] = None
         self.enabled_jokers: List[Joker] = []
-        self._initialize_jokers()
+        self._scorer = None
+
+    @property
+    def all_jokers(self) -> Dict[str, Joker]:
+        if self._all_jokers is None:
+            self._initialize_jokers()
+        return self._all_jokers
 
     def _initialize_jokers(self):
         """
-        Define and initialize all Jokers with their respective effects.
+        Create a Joker for every entry of the catalog; effects are compiled when first used.
         """
+        from jokerCatalog import JOKER_CATALOG
 
-        # Define effect functions for each Joker
-
-        def joker_effect(game_state: Dict[str, Any]):
-            """
-            "Joker": +4 Mult.
-            """
-            game_state['multiplier'] += 4
-            print(f"Joker 'Joker' applied: +4 Multiplier. Total Multiplier: {game_state['multiplier']}")
-
-        def greedy_joker_effect(game_state: Dict[str, Any]):
-            """
-            "Greedy Joker": Played cards with Diamond suit give +3 Mult when scored.
-            """
-            played_cards = game_state.get('played_cards', [])
-            if any(card['suit'].lower() == 'diamond' for card in played_cards):
-                game_state['multiplier'] += 3
-                print(
-                    f"Joker 'Greedy Joker' applied: +3 Multiplier for Diamond suit. Total Multiplier: {game_state['multiplier']}")
-            else:
-                print("Joker 'Greedy Joker' not applied: No played cards with Diamond suit.")
-
-        def lusty_joker_effect(game_state: Dict[str, Any]):
-            """
-            "Lusty Joker": Played cards with Heart suit give +3 Mult when scored.
-            """
-            played_cards = game_state.get('played_cards', [])
-            if any(card['suit'].lower() == 'heart' for card in played_cards):
-                game_state['multiplier'] += 3
-                print(
-                    f"Joker 'Lusty Joker' applied: +3 Multiplier for Heart suit. Total Multiplier: {game_state['multiplier']}")
-            else:
-                print("Joker 'Lusty Joker' not applied: No played cards with Heart suit.")
-
-        def wrathful_joker_effect(game_state: Dict[str, Any]):
-            """
-            "Wrathful Joker": Played cards with Spade suit give +3 Mult when scored.
-            """
-            played_cards = game_state.get('played_cards', [])
-            if any(card['suit'].lower() == 'spade' for card in played_cards):
-                game_state['multiplier'] += 3
-                print(
-                    f"Joker 'Wrathful Joker' applied: +3 Multiplier for Spade suit. Total Multiplier: {game_state['multiplier']}")
-            else:
-                print("Joker 'Wrathful Joker' not applied: No played cards with Spade suit.")
-
-        def gluttonous_joker_effect(game_state: Dict[str, Any]):
-            """
-            "Gluttonous Joker": Played cards with Club suit give +3 Mult when scored.
-            """
-            played_cards = game_state.get('played_cards', [])
-            if any(card['suit'].lower() == 'club' for card in played_cards):
-                game_state['multiplier'] += 3
-                print(
-                    f"Joker 'Gluttonous Joker' applied: +3 Multiplier for Club suit. Total Multiplier: {game_state['multiplier']}")
-            else:
-                print("Joker 'Gluttonous Joker' not applied: No played cards with Club suit.")
-
-        def jolly_joker_effect(game_state: Dict[str, Any]):
-            """
-            "Jolly Joker": +8 Mult if played hand contains a Pair.
-            """
-            hand = game_state.get('hand', [])
-            if check_hand_pattern(hand, "Pair"):
-                game_state['multiplier'] += 8
-                print(
-                    f"Joker 'Jolly Joker' applied: +8 Multiplier for Pair. Total Multiplier: {game_state['multiplier']}")
-            else:
-                print("Joker 'Jolly Joker' not applied: Hand does not contain a Pair.")
-
-        def zany_joker_effect(game_state: Dict[str, Any]):
-            """
-            "Zany Joker": +12 Mult if played hand contains a Three of a Kind.
-            """
-            hand = game_state.get('hand', [])
-            if check_hand_pattern(hand, "Three of a Kind"):
-                game_state['multiplier'] += 12
-                print(
-                    f"Joker 'Zany Joker' applied: +12 Multiplier for Three of a Kind. Total Multiplier: {game_state['multiplier']}")
-            else:
-                print("Joker 'Zany Joker' not applied: Hand does not contain a Three of a Kind.")
-
-        def mad_joker_effect(game_state: Dict[str, Any]):
-            """
-            "Mad Joker": +10 Mult if played hand contains a Two Pair.
-            """
-            hand = game_state.get('hand', [])
-            if check_hand_pattern(hand, "Two Pair"):
-                game_state['multiplier'] += 10
-                print(
-                    f"Joker 'Mad Joker' applied: +10 Multiplier for Two Pair. Total Multiplier: {game_state['multiplier']}")
-            else:
-                print("Joker 'Mad Joker' not applied: Hand does not contain a Two Pair.")
-
-        def crazy_joker_effect(game_state: Dict[str, Any]):
-            """
-            "Crazy Joker": +12 Mult if played hand contains a Straight.
-            """
-            hand = game_state.get('hand', [])
-            if check_hand_pattern(hand, "Straight"):
-                game_state['multiplier'] += 12
-                print(
-                    f"Joker 'Crazy Joker' applied: +12 Multiplier for Straight. Total Multiplier: {game_state['multiplier']}")
-            else:
-                print("Joker 'Crazy Joker' not applied: Hand does not contain a Straight.")
-
-        def droll_joker_effect(game_state: Dict[str, Any]):
-            """
-            "Droll Joker": +10 Mult if played hand contains a Flush.
-            """
-            hand = game_state.get('hand', [])
-            if check_hand_pattern(hand, "Flush"):
-                game_state['multiplier'] += 10
-                print(
-                    f"Joker 'Droll Joker' applied: +10 Multiplier for Flush. Total Multiplier: {game_state['multiplier']}")
-            else:
-                print("Joker 'Droll Joker' not applied: Hand does not contain a Flush.")
-
-        # Create Joker instances
-        self.all_jokers = {
-            "Joker": Joker("Joker", joker_effect),
-            "Greedy Joker": Joker("Greedy Joker", greedy_joker_effect),
-            "Lusty Joker": Joker("Lusty Joker", lusty_joker_effect),
-            "Wrathful Joker": Joker("Wrathful Joker", wrathful_joker_effect),
-            "Gluttonous Joker": Joker("Gluttonous Joker", gluttonous_joker_effect),
-            "Jolly Joker": Joker("Jolly Joker", jolly_joker_effect),
-            "Zany Joker": Joker("Zany Joker", zany_joker_effect),
-            "Mad Joker": Joker("Mad Joker", mad_joker_effect),
-            "Crazy Joker": Joker("Crazy Joker", crazy_joker_effect),
-            "Droll Joker": Joker("Droll Joker", droll_joker_effect)
-        }
+        self._all_jokers = {name: Joker(name, spec=spec) for name, spec in JOKER_CATALOG.items()}
 
     def enable_joker(self, joker_name: str):
         """
@@ -194,6 +122,7 @@ class JokerManager:
             if not joker.enabled:
                 joker.enabled = True
                 self.enabled_jokers.append(joker)
+                self._scorer = None
                 print(f"Joker '{joker.name}' is now Enabled.")
             else:
                 print(f"Joker '{joker.name}' is already Enabled.")
@@ -212,12 +141,25 @@ class JokerManager:
             if joker.enabled:
                 joker.enabled = False
                 self.enabled_jokers.remove(joker)
+                self._scorer = None
                 print(f"Joker '{joker.name}' has been Disabled.")
             else:
                 print(f"Joker '{joker.name}' is already Disabled.")
         else:
             print(f"Joker '{joker_name}' does not exist.")
 
+    def reorder_jokers(self, names: List[str]):
+        """
+        Put the enabled Jokers in a new order; they apply left to right.
+
+        Parameters:
+        - names (list): The names of every enabled Joker, in the new order.
+        """
+        if sorted(names) != sorted(joker.name for joker in self.enabled_jokers):
+            raise ValueError("Error: The new order must hold exactly the enabled Jokers.")
+        self.enabled_jokers = [self.all_jokers[name] for name in names]
+        self._scorer = None
+
     def list_enabled_jokers(self):
         """
         List all currently enabled Jokers.
@@ -229,21 +171,83 @@ class JokerManager:
         for joker in self.enabled_jokers:
             print(f"- {joker.name} [Enabled]")
 
+    def scoring_function(self):
+        """Return the enabled Jokers compiled into one scoring function (see compile_jokers)."""
+        if self._scorer is None:
+            self._scorer = compile_jokers([joker.spec for joker in self.enabled_jokers])
+        return self._scorer
+
     def apply_jokers_effects(self, event: str, game_state: Dict[str, Any]):
         """
         Apply effects of all enabled Jokers based on the triggered event.
 
         Parameters:
         - event (str): The game event triggering the effects (e.g., "scoring").
-        - game_state (dict): The current state of the game.
+        - game_state (dict): The current state of the game; 'chips' is added to it if a Joker gives chips.
         """
         print(f"\n--- Applying Joker Effects for Event: '{event}' ---")
-        for joker in self.enabled_jokers:
-            if event.lower() == "scoring":
-                joker.apply_effect(game_state)
+        if event.lower() == "scoring":
+            chips = game_state.get('chips', 0)
+            chips, game_state['multiplier'] = self.scoring_function()(
+                chips, game_state['multiplier'], card_pairs(game_state.get('played_cards', [])),
+                card_pairs(game_state.get('hand', [])))
+            if chips or 'chips' in game_state:
+                game_state['chips'] = chips
+            print(f"{len(self.enabled_jokers)} Joker(s) applied. Total Multiplier: {game_state['multiplier']}")
         print("--- Joker Effects Applied ---\n")
 
 
+def card_pairs(cards: List[Dict[str, str]]) -> List[tuple]:
+    """Convert card dictionaries with 'rank' and 'suit' to (rank, suit) pairs as spelled in deck.py."""
+    return [(card['rank'].title(), card['suit'].title()) for card in cards]
+
+
+def compile_jokers(specs) -> Callable:
+    """
+    Compile Joker specs into one scoring function specialized to them.
+
+    The function is generated as Python source: one test and update per
+    Joker, with no lookups of what each Joker does at scoring time. 'card'
+    Jokers run first, for each played card, then 'hand' Jokers in the order
+    given. Only the hand types the Jokers ask about are checked for.
+
+    Parameters:
+    - specs (list): JokerSpec entries, in loadout order.
+
+    Returns:
+    - Callable: score(chips, mult, played, hand) -> (chips, mult), where played
+      and hand are lists of (rank, suit) pairs (see card_pairs).
+    """
+    operations = {'chips': 'chips += {!r}', 'mult': 'mult += {!r}', 'xmult': 'mult *= {!r}'}
+    patterns = list(dict.fromkeys(spec.target for spec in specs if spec.trigger == 'contains'))
+    lines = ['def score(chips, mult, played, hand):']
+    if patterns:
+        lines.append('    ranks = [rank.lower() for rank, suit in hand]')
+        lines.append('    suits = [suit.lower() for rank, suit in hand]')
+        for i, pattern in enumerate(patterns):
+            lines.append(f'    contains_{i} = _contains(ranks, suits, {pattern!r})')
+    card_specs = [spec for spec in specs if spec.order == 'card']
+    if card_specs:
+        lines.append('    for rank, suit in played:')
+        for spec in card_specs:
+            test = f'suit == {spec.target!r}' if spec.trigger == 'suit' else f'rank in {tuple(spec.target)!r}'
+            lines.append(f'        if {test}:')
+            lines.append(f'            {operations[spec.effect].format(spec.amount)}')
+    for spec in specs:
+        if spec.order != 'hand':
+            continue
+        operation = operations[spec.effect].format(spec.amount)
+        if spec.trigger == 'always':
+            lines.append(f'    {operation}')
+        else:
+            lines.append(f'    if contains_{patterns.index(spec.target)}:')
+            lines.append(f'        {operation}')
+    lines.append('    return chips, mult')
+    namespace = {'_contains': _contains}
+    exec('\n'.join(lines), namespace)
+    return namespace['score']
+
+
 def check_hand_pattern(hand: List[Dict[str, str]], pattern: str) -> bool:
     """
     Check if the hand contains the specified pattern.
@@ -257,11 +261,17 @@ def check_hand_pattern(hand: List[Dict[str, str]], pattern: str) -> bool:
     """
     ranks = [card['rank'].lower() for card in hand]
     suits = [card['suit'].lower() for card in hand]
+    return _contains(ranks, suits, pattern)
+
 
+def _contains(ranks: List[str], suits: List[str], pattern: str) -> bool:
+    """check_hand_pattern on lowercase rank and suit lists."""
     if pattern.lower() == "pair":
         return any(ranks.count(rank) >= 2 for rank in set(ranks))
     elif pattern.lower() == "three of a kind":
         return any(ranks.count(rank) >= 3 for rank in set(ranks))
+    elif pattern.lower() == "four of a kind":
+        return any(ranks.count(rank) >= 4 for rank in set(ranks))
     elif pattern.lower() == "two pair":
         return sum(ranks.count(rank) >= 2 for rank in set(ranks)) >= 2
     elif pattern.lower() == "straight":
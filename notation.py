@@ -0,0 +1,128 @@
+# notation.py
+
+import re
+from deck import CARD_NAMES
+
+# Rank and suit spellings accepted by tokenize_cards, mapped to their index in
+# deck.RANKS and deck.SUITS. Words must end at a non-letter; single characters
+# may run straight into the next card (e.g., 'ah10s').
+RANK_WORDS = {'ace': 12, 'king': 11, 'queen': 10, 'jack': 9, 'ten': 8}
+RANK_CHARS = {**{str(value): value - 2 for value in range(2, 10)}, '10': 8, 'a': 12, 'k': 11, 'q': 10, 'j': 9, 't': 8}
+SUIT_WORDS = {'hearts': 0, 'heart': 0, 'diamonds': 1, 'diamond': 1, 'spades': 2, 'spade': 2, 'clubs': 3, 'club': 3}
+SUIT_CHARS = {'h': 0, 'd': 1, 's': 2, 'c': 3,
+              '♥': 0, '♡': 0, '♦': 1, '♢': 1, '♠': 2, '♤': 2, '♣': 3, '♧': 3}
+RANKS_BY_SPELLING = {**RANK_WORDS, **RANK_CHARS}
+SUITS_BY_SPELLING = {**SUIT_WORDS, **SUIT_CHARS}
+
+_RANK = r'(?:ace|king|queen|jack|ten)(?![a-z])|10|[2-9akqjt]'
+_SUIT = r'(?:hearts?|diamonds?|spades?|clubs?)(?![a-z])|[hdsc♥♡♦♢♠♤♣♧]'
+# One token per match: a run of separators, a card (rank and suit, with
+# optional spaces or ' of ' between), or any other single character
+TOKEN = re.compile(rf'[\s,;|]+|({_RANK})(?: +of +| *)({_SUIT})|(.)', re.S)
+RANK_TOKEN = re.compile(rf'({_RANK})(?: +of +| *)')
+
+
+class CardParseError(ValueError):
+    """A card string that cannot be parsed; position is the 0-based offset of the problem."""
+
+    def __init__(self, message, position):
+        super().__init__(f"Error: {message} at column {position + 1}.")
+        self.position = position
+
+
+def tokenize_cards(s, allow_duplicates=False):
+    """
+    Parse cards in any of the supported notations in a single scan of the string.
+
+    Accepts shorthand ('ah10s', 'kh qh'), full names ('Ace Heart', 'ten of
+    spades') and the suit symbols format_hand prints ('A♥ 10♠'), mixed freely
+    and separated by nothing, spaces, commas, semicolons or '|'. Cards come out
+    already encoded as their deck.CARD_NAMES index; duplicates are caught with
+    a 52-bit mask of the cards seen.
+
+    Parameters:
+    - s (str): The cards.
+    - allow_duplicates (bool): Accept several copies of a card.
+
+    Returns:
+    - list: Card indices in input order.
+
+    Raises:
+    - CardParseError: For the first character that does not start a card, with its position.
+    """
+    lowered = s.lower()
+    cards = []
+    seen = 0
+    # The regex scans the string once; each match is a separator, a card or a stray character
+    for rank, suit, stray in TOKEN.findall(lowered):
+        if rank:
+            card = RANKS_BY_SPELLING[rank] * 4 + SUITS_BY_SPELLING[suit]
+            if seen >> card & 1 and not allow_duplicates:
+                _raise_at(s, lowered, len(cards), duplicate=card)
+            seen |= 1 << card
+            cards.append(card)
+        elif stray:
+            _raise_at(s, lowered, len(cards))
+    return cards
+
+
+def _raise_at(s, lowered, parsed, duplicate=None):
+    """Find where parsing failed after `parsed` cards and raise a CardParseError pointing there."""
+    count = 0
+    for match in TOKEN.finditer(lowered):
+        rank, suit, stray = match.groups()
+        if rank:
+            count += 1
+            if duplicate is not None and count > parsed:
+                raise CardParseError(f"Duplicate card '{CARD_NAMES[duplicate]}'", match.start())
+        elif stray:
+            start = match.start()
+            partial = RANK_TOKEN.match(lowered, start)
+            if partial:
+                raise CardParseError(f"Missing or invalid suit for '{s[start:start + len(partial.group(1))]}'",
+                                     partial.end())
+            raise CardParseError(f"Unrecognized card '{s[start:start + 3].strip()}'", start)
+
+
+def parse_card_lines(text, allow_duplicates=False):
+    """
+    Parse newline-delimited hands, one hand per line, for bulk input.
+
+    Blank lines and lines starting with '#' are skipped. A line that fails to
+    parse is reported and the rest are still parsed.
+
+    Parameters:
+    - text (str): The hands, or any iterable of lines (e.g., an open file).
+    - allow_duplicates (bool): Accept several copies of a card within a hand.
+
+    Returns:
+    - (hands, errors): hands is a list of (line number, card names); errors is
+      a list of (line number, column, message). Line numbers and columns start at 1.
+    """
+    lines = text.splitlines() if isinstance(text, str) else text
+    hands = []
+    errors = []
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        try:
+            hands.append((number, [CARD_NAMES[card] for card in tokenize_cards(line, allow_duplicates)]))
+        except CardParseError as e:
+            errors.append((number, e.position + 1, str(e)))
+    return hands, errors
+
+
+def main():
+    import sys
+
+    hands, errors = parse_card_lines(sys.stdin)
+    for number, cards in hands:
+        print(f"{number}: {', '.join(cards)}")
+    for number, column, message in errors:
+        print(f"line {number}, column {column}: {message}", file=sys.stderr)
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+# parallel.py
+
+
+def chunks(count, workers):
+    """
+    Split range(count) into (start, stop) chunks, about four per worker and at most 1000 long.
+
+    Parameters:
+    - count (int): Number of items.
+    - workers (int): Processes the chunks will be spread over.
+
+    Returns:
+    - list: (start, stop) pairs covering 0..count in order.
+    """
+    size = max(1, min(1000, -(-count // (workers * 4))))
+    return [(start, min(count, start + size)) for start in range(0, count, size)]
+
+
+def map_chunks(function, chunk_args, workers):
+    """Run function(*args) for every chunk, over a process pool when workers > 1, in chunk order."""
+    if workers == 1:
+        return [function(*args) for args in chunk_args]
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(function, *zip(*chunk_args)))
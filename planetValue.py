@@ -0,0 +1,192 @@
+# planetValue.py
+
+import random
+from array import array
+import play
+from deck import as_deck, make_deck
+from planetCards import PLANET_CARDS
+
+# Cards drawn into a hand at the start of a round
+HAND_SIZE = 8
+
+# Pattern chips stored for a hand type the hand cannot form
+NOT_FORMED = -1
+
+
+class PatternSample:
+    """
+    Hands sampled from a deck, classified once by the hand types they can form.
+
+    Planet Cards only change a hand type's base chips and mult, never which
+    types a hand can form or which cards make them up. Each sampled hand is
+    therefore reduced to its pattern class: the most pattern chips it can play
+    for every hand type (see play.pattern_chip_sums). Identical classes are
+    merged and counted, and the classes are kept as one array column per hand
+    type, so rescoring the whole sample under other hand scores is a pass over
+    the columns without evaluating a hand again.
+    """
+
+    def __init__(self, patterns):
+        """
+        Initialize an empty PatternSample.
+
+        Parameters:
+        - patterns (list): Hand types to keep a column for.
+        """
+        self.patterns = list(patterns)
+        self.counts = array('I')     # Sampled hands in each class
+        self.chip_sums = {pattern: array('h') for pattern in self.patterns}  # NOT_FORMED where the type is missing
+        self.hands = 0
+        self._index = {}
+
+    def add(self, sums, qty=1):
+        """Count qty hands whose pattern chips are sums (a dict as returned by play.pattern_chip_sums)."""
+        key = tuple(sums.get(pattern, NOT_FORMED) for pattern in self.patterns)
+        if key not in self._index:
+            self._index[key] = len(self.counts)
+            self.counts.append(0)
+            for pattern, chips in zip(self.patterns, key):
+                self.chip_sums[pattern].append(chips)
+        self.counts[self._index[key]] += qty
+        self.hands += qty
+
+    def best_scores(self, hand_scores):
+        """
+        Score the best play of every class.
+
+        Parameters:
+        - hand_scores (dict): (chips, mult) of each hand type, like play.HAND_SCORES.
+
+        Returns:
+        - list: Best score of each class, in class order.
+        """
+        best = [0] * len(self.counts)
+        for pattern in self.patterns:
+            base_chips, base_mult = hand_scores[pattern]
+            column = self.chip_sums[pattern]
+            for i, chips in enumerate(column):
+                if chips != NOT_FORMED:
+                    score = int((base_chips + chips) * base_mult)
+                    if score > best[i]:
+                        best[i] = score
+        return best
+
+    def expected_score(self, hand_scores, best=None):
+        """Average best score per sampled hand under hand_scores (best: precomputed best_scores)."""
+        if best is None:
+            best = self.best_scores(hand_scores)
+        return sum(count * score for count, score in zip(self.counts, best)) / max(1, self.hands)
+
+    def upgrade_gain(self, best, pattern, chips, mult):
+        """
+        Average score gained per sampled hand when one hand type is rescored.
+
+        Raising a single type only changes the classes where that type now
+        beats the best play, so only its column is read.
+
+        Parameters:
+        - best (list): Best score of each class before the upgrade (see best_scores).
+        - pattern (str): The hand type upgraded.
+        - chips (int): Its chips after the upgrade.
+        - mult (int): Its mult after the upgrade.
+
+        Returns:
+        - float: Expected gain in score per hand.
+        """
+        if pattern not in self.chip_sums:
+            return 0.0
+        gain = 0
+        for count, score, pattern_chips in zip(self.counts, best, self.chip_sums[pattern]):
+            if pattern_chips != NOT_FORMED:
+                upgraded = int((chips + pattern_chips) * mult)
+                if upgraded > score:
+                    gain += count * (upgraded - score)
+        return gain / max(1, self.hands)
+
+    def __len__(self):
+        return len(self.counts)
+
+
+def sample_patterns(remaining_deck, hand_size=HAND_SIZE, samples=5000, seed=0, progress=None):
+    """
+    Classify hands drawn at random from a deck.
+
+    Parameters:
+    - remaining_deck: Deck (or card names) the hands are drawn from.
+    - hand_size (int): Cards per hand.
+    - samples (int): Hands to draw.
+    - seed (int): Seed for the draws, so results are reproducible.
+    - progress: Optional progress(done, total) callback counting hands; it may raise to abandon the sampling.
+
+    Returns:
+    - PatternSample: The pattern classes of the sampled hands.
+    """
+    pool = list(as_deck(remaining_deck))
+    if len(pool) < hand_size:
+        raise ValueError(f"Error: The deck has {len(pool)} cards, fewer than a hand of {hand_size}.")
+    rng = random.Random(seed)
+    sample = PatternSample(play.HAND_SCORES)
+    for done in range(samples):
+        if progress is not None and done % 100 == 0:
+            progress(done, samples)
+        sample.add(play.pattern_chip_sums(rng.sample(pool, hand_size)))
+    if progress is not None:
+        progress(samples, samples)
+    return sample
+
+
+def rank_planets(remaining_deck, hand_size=HAND_SIZE, samples=5000, seed=0, planets=None, progress=None):
+    """
+    Rank Planet Cards by the expected score one more level of each would add.
+
+    The sampled hands are classified once; every planet is then rescored
+    from the stored classes. Levels already held (see update_hand_scores)
+    are the starting point.
+
+    Parameters:
+    - remaining_deck: Deck (or card names) future hands are drawn from.
+    - hand_size (int): Cards per hand.
+    - samples (int): Hands to draw.
+    - seed (int): Seed for the draws.
+    - planets (list): Planet names to rank (defaults to every card in PLANET_CARDS).
+    - progress: Optional progress(done, total) callback (see sample_patterns).
+
+    Returns:
+    - list: Dicts with 'planet', 'hand', 'gain' (expected score added per hand)
+      and 'expected_score' (per hand, after buying it), best gain first.
+    """
+    sample = sample_patterns(remaining_deck, hand_size, samples, seed, progress)
+    hand_scores = play.HAND_SCORES
+    best = sample.best_scores(hand_scores)
+    current = sample.expected_score(hand_scores, best)
+    ranking = []
+    for name in planets or PLANET_CARDS:
+        card = PLANET_CARDS[name]
+        chips, mult = hand_scores[card.associated_hand]
+        gain = sample.upgrade_gain(best, card.associated_hand,
+                                   chips + card.chip_value_bonus, mult + card.multiplier_bonus)
+        ranking.append({
+            'planet': name,
+            'hand': card.associated_hand,
+            'gain': gain,
+            'expected_score': current + gain
+        })
+    ranking.sort(key=lambda entry: entry['gain'], reverse=True)
+    return ranking
+
+
+def main():
+    try:
+        samples = int(input("Hands to sample (e.g., 5000): ").strip() or 5000)
+        play.update_hand_scores()
+        ranking = rank_planets(make_deck(), samples=samples)
+        print(f"\nExpected score per hand from a full deck, {samples} hands sampled:")
+        for idx, entry in enumerate(ranking, 1):
+            print(f"{idx}. {entry['planet']} ({entry['hand']}): +{entry['gain']:.2f} "
+                  f"-> {entry['expected_score']:.2f}")
+    except ValueError as e:
+        print(e)
+
+
+if __name__ == "__main__":
+    main()
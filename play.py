@@ -1,9 +1,14 @@
 # play.py
 
-import re
 from collections import Counter
 import itertools
+import math
 from planetCards import get_active_planet_cards
+from artifacts import straight_windows
+from deck import make_deck, RANK_MAP, VALUE_MAP, SUITS, CARD_NAMES
+from notation import tokenize_cards
+from cards import CardTable, score_cards, ALL_SUITS_MASK
+from results import PlayResult, format_calculation
 
 # Defines the base hand scores
 BASE_HAND_SCORES = {
@@ -16,143 +21,161 @@ BASE_HAND_SCORES = {
     'Full House': (40, 4),
     'Four of a Kind': (60, 7),
     'Straight Flush': (100, 8),
-    'Royal Flush': (100, 8)
+    'Royal Flush': (100, 8),
+    # Only reachable with duplicated cards
+    'Five of a Kind': (120, 12),
+    'Flush House': (140, 14),
+    'Flush Five': (160, 16)
 }
 
 # Initialize HAND_SCORES as a copy of BASE_HAND_SCORES
 HAND_SCORES = BASE_HAND_SCORES.copy()
 
-# Define global maps for card ranks and chip values
-RANK_MAP = {
-    '2': 2, '3': 3, '4': 4, '5':5, '6':6,
-    '7':7, '8':8, '9':9, '10':10,
-    'Jack':11, 'Queen':12, 'King':13, 'Ace':14
-}
+# Most cards a pattern of each hand type scores (the rest score all five)
+PATTERN_SIZES = {'High Card': 5, 'Pair': 2, 'Two Pair': 4, 'Three of a Kind': 3, 'Four of a Kind': 4}
 
-VALUE_MAP = {
-    '2': 2, '3': 3, '4': 4, '5': 5, '6': 6,
-    '7': 7, '8': 8, '9': 9, '10': 10,
-    'Jack': 10, 'Queen': 10, 'King': 10, 'Ace': 11
-}
+# Score bounds are padded slightly so float rounding never prunes an exact tie
+BOUND_SLACK = 1 + 1e-9
 
-def parse_playing_cards(s):
+
+def parse_playing_cards(s, allow_duplicates=False):
     """
     Parses a string of playing cards and returns a list of card names.
-    Example input: "ah kh qh jh 10h"
+    Example input: "ah kh qh jh 10h", "Ace Heart, King Heart" or "A♥ K♥"
+
+    Set allow_duplicates for decks holding several copies of a card.
+    See notation.tokenize_cards for the notations accepted.
     """
-    suits = {'H': 'Heart', 'D': 'Diamond', 'S': 'Spade', 'C': 'Club'}
-    values = {'A': 'Ace', 'J': 'Jack', 'Q': 'Queen', 'K': 'King'}
-    # Use case-insensitive matching and allow multiple characters for card values (e.g., 10)
-    pattern = r'([2-9]|10|[AJQK])([HDSC])'
-    matches = re.findall(pattern, s, re.I)
-    if not matches:
+    cards = [CARD_NAMES[card] for card in tokenize_cards(s, allow_duplicates)]
+    if not cards:
         raise ValueError("Error: No valid cards found in the input.")
-    cards = []
-    for v, s in matches:
-        v_upper = v.upper()
-        s_upper = s.upper()
-        card_value = values.get(v_upper, v_upper)
-        card_suit = suits.get(s_upper)
-        if not card_suit:
-            raise ValueError(f"Error: Invalid suit '{s}'. Use H, D, S, or C.")
-        card_full = f"{card_value} {card_suit}"
-        if card_full in cards:
-            raise ValueError(f"Error: Duplicate card '{card_full}' detected.")
-        cards.append(card_full)
     return cards, len(cards)
 
-def update_deck(cards):
+def update_deck(cards, preset='Standard'):
     """
     Generates a full deck and removes the user’s cards to get the remaining deck.
     """
-    full_deck = {f"{v} {s}"
-                 for v in (list(map(str, range(2, 11))) + ['Ace', 'Jack', 'Queen', 'King'])
-                 for s in ['Heart', 'Diamond', 'Spade', 'Club']}
-    return full_deck - set(cards)
+    remaining_deck = make_deck(preset)
+    remaining_deck.remove_cards(cards)
+    return remaining_deck
 
-def evaluate_hand(cards):
+def evaluate_hand(cards, table=None, allowed=None):
     """
     Evaluates the given set of cards and identifies possible poker hands.
     Returns a list of tuples: (pattern_name, list_of_cards_in_pattern)
+
+    Cards are card names, or card ids into `table` (a CardTable) when one is
+    given; the patterns hold cards in the same form. `allowed` limits the
+    pattern names looked for.
+    """
+    if table is None:
+        table, ids = CardTable.from_names(cards)
+        return [(pattern, [cards[i] for i in pattern_ids])
+                for pattern, pattern_ids in _evaluate_ids(ids, table, allowed)]
+    return _evaluate_ids(cards, table, allowed)
+
+def _evaluate_ids(cards, table, allowed=None):
     """
-    ranks = [RANK_MAP[card.split()[0]] for card in cards]
-    suits = [card.split()[1] for card in cards]
+    Evaluate card ids in table; Wild cards match every suit and Stone cards have no rank.
+
+    When `allowed` is given, patterns outside it are never looked for.
+    """
+    allowed = set(HAND_SCORES) if allowed is None else set(allowed)
+    rank_of = table.rank
+    suit_mask = table.suit_mask
+    ranked = [card for card in cards if rank_of[card]]
+    ranks = [rank_of[card] for card in ranked]
     rank_counts = Counter(ranks)
-    suit_counts = Counter(suits)
+    # Suits in order of first appearance; a Wild card appears in every suit
+    suit_order = []
+    for card in cards:
+        for s in range(len(SUITS)):
+            if suit_mask[card] >> s & 1 and s not in suit_order:
+                suit_order.append(s)
 
     def find_sequences(vals):
-        sequences = []
-        unique_vals = sorted(set(vals))
-        for i in range(len(unique_vals) - 4):
-            seq = unique_vals[i:i+5]
-            if all(seq[j] - seq[j-1] == 1 for j in range(1, 5)):
-                sequences.append(seq)
-        # Check for Ace-low straight (A-2-3-4-5)
-        if set([14, 2, 3, 4, 5]).issubset(unique_vals):
-            sequences.append([14, 2, 3, 4, 5])
-        return sequences
+        # Look the completed straights up by rank mask (bit 0 = rank 2, bit 12 = Ace)
+        return _straight_rank_sets(sum(1 << (v - 2) for v in set(vals)))
+
+    def same_suit(pattern_cards):
+        common = ALL_SUITS_MASK
+        for card in pattern_cards:
+            common &= suit_mask[card]
+        return common != 0
 
     patterns = []
 
     # Royal Flush and Straight Flush
-    for suit in suit_counts:
-        suited_cards = [card for card in cards if card.split()[1] == suit]
+    for s in suit_order if allowed & {'Royal Flush', 'Straight Flush', 'Flush'} else ():
+        suited_cards = [card for card in cards if suit_mask[card] >> s & 1]
         if len(suited_cards) >= 5:
-            suited_ranks = [RANK_MAP[card.split()[0]] for card in suited_cards]
+            suited_ranks = [rank_of[card] for card in suited_cards]
             sequences = find_sequences(suited_ranks)
             for seq in sequences:
                 if len(seq) >= 5:
-                    sequence_cards = [card for card in suited_cards if RANK_MAP[card.split()[0]] in seq]
-                    if set(seq) == {10, 11, 12, 13, 14}:
-                        patterns.append(('Royal Flush', sequence_cards))
-                    else:
-                        patterns.append(('Straight Flush', sequence_cards))
-            if not sequences:
+                    sequence_cards = [card for card in suited_cards if rank_of[card] in seq]
+                    pattern = 'Royal Flush' if set(seq) == {10, 11, 12, 13, 14} else 'Straight Flush'
+                    if pattern in allowed:
+                        patterns.append((pattern, sequence_cards))
+            if not sequences and 'Flush' in allowed:
                 patterns.append(('Flush', suited_cards))
 
-    # Four of a Kind
+    # Five of a Kind and Flush Five (only possible with duplicated cards)
     for rank, count in rank_counts.items():
+        if count >= 5:
+            fiveoak_cards = [card for card in ranked if rank_of[card] == rank]
+            pattern = 'Flush Five' if same_suit(fiveoak_cards) else 'Five of a Kind'
+            if pattern in allowed:
+                patterns.append((pattern, fiveoak_cards))
+
+    # Four of a Kind
+    for rank, count in rank_counts.items() if 'Four of a Kind' in allowed else ():
         if count == 4:
-            foak_cards = [card for card in cards if RANK_MAP[card.split()[0]] == rank]
+            foak_cards = [card for card in ranked if rank_of[card] == rank]
             patterns.append(('Four of a Kind', foak_cards))
 
-    # Full House
+    # Full House and Flush House
     threes = [rank for rank, count in rank_counts.items() if count == 3]
     pairs = [rank for rank, count in rank_counts.items() if count >= 2 and rank not in threes]
-    for three in threes:
+    for three in threes if allowed & {'Full House', 'Flush House'} else ():
         for pair in pairs + [rank for rank in threes if rank != three]:
-            fh_cards = [card for card in cards if RANK_MAP[card.split()[0]] in [three, pair]]
-            patterns.append(('Full House', fh_cards))
+            fh_cards = [card for card in ranked if rank_of[card] in [three, pair]]
+            pattern = 'Flush House' if same_suit(fh_cards) else 'Full House'
+            if pattern in allowed:
+                patterns.append((pattern, fh_cards))
 
     # Straight
-    sequences = find_sequences(ranks)
+    sequences = find_sequences(ranks) if 'Straight' in allowed else []
     for seq in sequences:
         if len(seq) >= 5:
-            straight_cards = [card for card in cards if RANK_MAP[card.split()[0]] in seq]
+            straight_cards = [card for card in ranked if rank_of[card] in seq]
             patterns.append(('Straight', straight_cards))
 
     # Three of a Kind
-    for rank, count in rank_counts.items():
+    for rank, count in rank_counts.items() if 'Three of a Kind' in allowed else ():
         if count == 3:
-            toak_cards = [card for card in cards if RANK_MAP[card.split()[0]] == rank]
+            toak_cards = [card for card in ranked if rank_of[card] == rank]
             patterns.append(('Three of a Kind', toak_cards))
 
     # Two Pair
     pair_ranks = [rank for rank, count in rank_counts.items() if count == 2]
-    if len(pair_ranks) >= 2:
+    if len(pair_ranks) >= 2 and 'Two Pair' in allowed:
         for i, j in itertools.combinations(pair_ranks, 2):
-            tp_cards = [card for card in cards if RANK_MAP[card.split()[0]] in [i, j]]
+            tp_cards = [card for card in ranked if rank_of[card] in [i, j]]
             patterns.append(('Two Pair', tp_cards))
 
     # Pair
-    for rank in pair_ranks:
-        pair_cards = [card for card in cards if RANK_MAP[card.split()[0]] == rank]
+    for rank in pair_ranks if 'Pair' in allowed else ():
+        pair_cards = [card for card in ranked if rank_of[card] == rank]
         patterns.append(('Pair', pair_cards))
 
-    # High Card
-    if not patterns:
-        max_rank = max(ranks)
-        high_cards = [card for card in cards if RANK_MAP[card.split()[0]] == max_rank]
+    # High Card (only Stone cards are played when no card has a rank)
+    if not patterns and 'High Card' in allowed:
+        if ranks:
+            max_rank = max(ranks)
+            high_cards = [card for card in ranked if rank_of[card] == max_rank]
+        else:
+            high_cards = list(cards)
         patterns.append(('High Card', high_cards))
 
     return patterns
@@ -194,52 +217,453 @@ def update_hand_scores():
         else:
             print(f"Warning: Associated hand '{associated_hand}' for Planet Card '{card.name}' not found in HAND_SCORES.")
 
-def calculate_pattern_score(pattern_name, pattern_cards):
+def calculate_pattern_score(pattern_name, pattern_cards, table=None, held_cards=()):
     """
     Calculate the score for a given pattern and its cards, considering active Planet Cards.
+
+    With a CardTable, pattern_cards and held_cards are card ids and enhancements,
+    editions and seals are applied; otherwise they are plain card names.
     """
-    base_chip_value, base_multiplier = HAND_SCORES[pattern_name]
-    adjusted_chip_value = base_chip_value
-    adjusted_multiplier = base_multiplier
+    score, base_chips, multiplier = score_pattern(pattern_name, pattern_cards, table, held_cards)
+    return score, format_calculation(base_chips, multiplier, score)
+
+def score_pattern(pattern_name, pattern_cards, table=None, held_cards=()):
+    """
+    Score a pattern like calculate_pattern_score, without building the calculation text.
 
-    card_values = sum(get_card_value(card) for card in pattern_cards)
-    score = (adjusted_chip_value + card_values) * adjusted_multiplier
-    calculation = f"({adjusted_chip_value} + sum of card values) x {adjusted_multiplier} = {score}"
-    return score, calculation
+    Returns:
+    - (score, base_chips, mult): The score, the hand type's chips and the final mult.
+    """
+    base_chip_value, base_multiplier = HAND_SCORES[pattern_name]
+    if table is None:
+        table, pattern_cards = CardTable.from_names(pattern_cards)
+    score, chips, multiplier = score_cards(table, pattern_cards, base_chip_value, base_multiplier, held_cards)
+    return score, base_chip_value, multiplier
 
 # --- New Function to Find the Best Hands ---
 
-def find_best_hands(cards, top_n=5):
-    """Find the top_n best subsets of 5 cards with the highest scores."""
-    hand_scores = []
+def _card_bounds(table, ids):
+    """
+    Per-card upper bounds on what each card can add to a score.
 
-    # Generate all possible subsets of size 5
-    subsets = list(itertools.combinations(cards, 5))
+    Returns lists (in the order of ids) of chips and mult added over all
+    triggers, the mult multiplier when scored and the mult multiplier when held.
+    """
+    chips, mult, scored_x, held_x = [], [], [], []
+    for card in ids:
+        triggers = table.triggers[card]
+        chips.append(table.chips[card] * triggers)
+        mult.append(table.mult[card] * triggers)
+        scored_x.append(table.xmult[card] ** triggers)
+        held_x.append(table.held_xmult[card] ** triggers)
+    return chips, mult, scored_x, held_x
+
+def _score_bound(pattern, chips_sums, mult_sums, xmult):
+    """Upper bound on a pattern's score given prefix sums of the best chips and mult available."""
+    base_chip, base_mult = HAND_SCORES[pattern]
+    size = PATTERN_SIZES.get(pattern, 5)
+    return (base_chip + chips_sums[size]) * (base_mult + mult_sums[size]) * xmult * BOUND_SLACK
+
+def _prefix_sums(values, size=5):
+    """Sums of the 0..size largest values."""
+    sums = [0]
+    for value in sorted(values, reverse=True)[:size]:
+        sums.append(sums[-1] + value)
+    sums.extend([sums[-1]] * (size + 1 - len(sums)))
+    return sums
+
+def _straight_rank_sets(rank_mask):
+    """Rank lists of the straights completed by a rank mask (bit 0 = rank 2, bit 12 = Ace)."""
+    windows = straight_windows(rank_mask)
+    sequences = [list(range(start + 1, start + 6)) for start in range(1, 10) if windows >> start & 1]
+    # Check for Ace-low straight (A-2-3-4-5)
+    if windows & 1:
+        sequences.append([14, 2, 3, 4, 5])
+    return sequences
+
+class _Buckets:
+    """A hand's card positions grouped by rank and by suit, for building candidate plays."""
+
+    def __init__(self, table, ids):
+        self.rank_of = [table.rank[card] for card in ids]
+        self.suit_of = [table.suit_mask[card] for card in ids]
+        self.by_rank = {}
+        for p, rank in enumerate(self.rank_of):
+            if rank:
+                self.by_rank.setdefault(rank, []).append(p)
+        self.stones = [p for p, rank in enumerate(self.rank_of) if not rank]
+        self.by_suit = [[p for p, mask in enumerate(self.suit_of) if mask >> s & 1] for s in range(len(SUITS))]
+
+    def same_suit(self, positions):
+        common = ALL_SUITS_MASK
+        for p in positions:
+            common &= self.suit_of[p]
+        return common != 0
+
+    def of_a_kind(self, size):
+        """Yield (rank, positions) for every choice of size cards of one rank."""
+        for rank, bucket in self.by_rank.items():
+            for positions in itertools.combinations(bucket, size):
+                yield rank, positions
+
+    def straights(self):
+        """Yield the positions of every straight, one card per rank."""
+        for seq in _straight_rank_sets(sum(1 << (rank - 2) for rank in self.by_rank)):
+            for positions in itertools.product(*(self.by_rank[rank] for rank in seq)):
+                yield tuple(sorted(positions)), seq
+
+# Candidate plays of each hand type: (positions of the pattern cards, ranks
+# kickers may not have). Patterns under five cards are padded with kickers.
+def _pairs(buckets):
+    for rank, positions in buckets.of_a_kind(2):
+        yield positions, {rank}
+
+def _threes(buckets):
+    for rank, positions in buckets.of_a_kind(3):
+        yield positions, {rank}
+
+def _fours(buckets):
+    for rank, positions in buckets.of_a_kind(4):
+        yield positions, {rank}
+
+def _two_pairs(buckets):
+    pairs = list(buckets.of_a_kind(2))
+    for (low, low_cards), (high, high_cards) in itertools.combinations(pairs, 2):
+        if low != high:
+            yield tuple(sorted(low_cards + high_cards)), {low, high}
+
+def _full_houses(buckets, suited):
+    for three, three_cards in buckets.of_a_kind(3):
+        for pair, pair_cards in buckets.of_a_kind(2):
+            positions = tuple(sorted(three_cards + pair_cards))
+            if pair != three and buckets.same_suit(positions) == suited:
+                yield positions, set()
+
+def _fives(buckets, suited):
+    for rank, positions in buckets.of_a_kind(5):
+        if buckets.same_suit(positions) == suited:
+            yield positions, set()
+
+def _straights(buckets):
+    for positions, seq in buckets.straights():
+        yield positions, set()
+
+def _straight_flushes(buckets, royal):
+    for positions, seq in buckets.straights():
+        if buckets.same_suit(positions) and (set(seq) == {10, 11, 12, 13, 14}) == royal:
+            yield positions, set()
+
+def _flushes(buckets):
+    seen = set()
+    for bucket in buckets.by_suit:
+        for positions in itertools.combinations(bucket, 5):
+            ranks = {buckets.rank_of[p] for p in positions}
+            if positions in seen or (len(ranks) == 5 and _straight_rank_sets(sum(1 << (r - 2) for r in ranks))):
+                continue
+            seen.add(positions)
+            yield positions, set()
+
+CANDIDATES = {
+    'High Card': None,  # Depends on the other cards played; see _high_cards
+    'Pair': _pairs,
+    'Two Pair': _two_pairs,
+    'Three of a Kind': _threes,
+    'Straight': _straights,
+    'Flush': _flushes,
+    'Full House': lambda buckets: _full_houses(buckets, suited=False),
+    'Four of a Kind': _fours,
+    'Straight Flush': lambda buckets: _straight_flushes(buckets, royal=False),
+    'Royal Flush': lambda buckets: _straight_flushes(buckets, royal=True),
+    'Five of a Kind': lambda buckets: _fives(buckets, suited=False),
+    'Flush House': lambda buckets: _full_houses(buckets, suited=True),
+    'Flush Five': lambda buckets: _fives(buckets, suited=True),
+}
 
-    for subset in subsets:
-        patterns = evaluate_hand(list(subset))
+# Order in which _evaluate_ids lists the patterns of a subset, used to break score ties
+# before the cards of the plays (a Flush goes before a Straight of the same score)
+PATTERN_ORDER = {
+    'Royal Flush': 0, 'Straight Flush': 0, 'Flush': 0, 'Five of a Kind': 1, 'Flush Five': 1,
+    'Four of a Kind': 2, 'Full House': 3, 'Flush House': 3, 'Straight': 4,
+    'Three of a Kind': 5, 'Two Pair': 6, 'Pair': 7, 'High Card': 8,
+}
+
+def _canonical_order(table, ids):
+    """
+    Return the positions of ids by rank, then by card, for searching a hand in the same order however it is given.
+
+    Searched in this order, ties between plays are broken by the cards alone,
+    lower ranks first, so the same cards in any order give the same plays.
+    """
+    return sorted(range(len(ids)), key=lambda i: (table.rank[ids[i]], table.card_key(ids[i])))
+
+def _pad_play(positions, forbidden, buckets, held_x):
+    """
+    Add kickers to a pattern to make up a play of five, or return None if there are too few.
+
+    Kickers may not share a rank in forbidden; the cards least worth holding
+    (Steel cards are worth holding) are picked first.
+    """
+    needed = 5 - len(positions)
+    if not needed:
+        return positions
+    chosen = set(positions)
+    pool = [p for p in range(len(buckets.rank_of)) if p not in chosen and buckets.rank_of[p] not in forbidden]
+    if len(pool) < needed:
+        return None
+    return tuple(sorted(positions + tuple(sorted(pool, key=lambda p: (held_x[p], p))[:needed])))
+
+def _high_cards(buckets, table, ids, allowed, held_x):
+    """
+    Yield (pattern positions, play positions) for High Card plays.
+
+    A High Card play scores the cards of the highest rank played, so it
+    exists when some other cards of lower rank (or Stone cards) can go with them
+    without forming any allowed pattern; candidate plays are checked with
+    _evaluate_ids. Usually a single card: several of a rank only count as High
+    Card when a Boss Blind rules out the pair they make. With no ranked card
+    played, the High Card is the five Stone cards.
+    """
+    for stones in itertools.combinations(buckets.stones, 5):
+        yield stones, stones
+    of_a_kind = {2: 'Pair', 3: 'Three of a Kind', 4: 'Four of a Kind'}
+    distinct_kickers = all(pattern in allowed for pattern in of_a_kind.values())
+    seen = set()
+    for rank, bucket in buckets.by_rank.items():
+        pool = [q for q, other in enumerate(buckets.rank_of) if other < rank]
+        pool.sort(key=lambda q: (held_x[q], q))
+        lower_ranks = len({buckets.rank_of[q] for q in pool if buckets.rank_of[q]})
+        for size in range(1, min(5, len(bucket)) + 1):
+            if of_a_kind.get(size) in allowed:
+                continue
+            # With every of-a-kind allowed the kickers need distinct ranks (or no rank)
+            if distinct_kickers and len(buckets.stones) + lower_ranks < 5 - size:
+                continue
+            for positions in itertools.combinations(bucket, size):
+                key = tuple(sorted(table.card_key(ids[p]) for p in positions))
+                if key in seen:
+                    continue
+                seen.add(key)
+                pattern = [('High Card', [ids[p] for p in positions])]
+                for kickers in itertools.combinations(pool, 5 - size):
+                    subset = tuple(sorted(kickers + positions))
+                    if _evaluate_ids([ids[q] for q in subset], table, allowed) == pattern:
+                        yield positions, subset
+                        break
+
+def find_best_hands(cards, top_n=5, table=None, blind=None, stats=None, progress=None):
+    """
+    Find the top_n best plays of 5 cards with the highest scores.
+
+    Cards are card names, or card ids into `table` (a CardTable) when one is given.
+    A BossBlind (see blinds.py) prunes the hand types searched for and the
+    plays considered, and stops debuffed cards from scoring.
+
+    Candidate plays are built directly from the hand's rank and suit buckets
+    (pairs from each rank, flushes from each suit, straights from the rank mask),
+    so each distinct set of pattern cards is produced once and the work grows
+    with the number of patterns rather than with every 5-card subset. Hand types
+    are searched best upper bound first, and a type whose bound cannot beat the
+    current top_n-th best score is skipped. Pass a dict as `stats` to get the
+    counts of candidates built and scored and of hand types pruned.
+
+    `progress(done, total)` is called with the hand types searched so far as
+    the search advances; it may raise to abandon the search.
+    """
+    if table is None:
+        table, ids = CardTable.from_names(cards)
+    else:
+        ids = list(cards)
+    canonical = _canonical_order(table, ids)
+    ids = [ids[i] for i in canonical]
+    as_input = lambda positions: [cards[canonical[p]] for p in sorted(positions, key=canonical.__getitem__)]
+
+    allowed = list(HAND_SCORES)
+    if blind is not None:
+        allowed = blind.allowed_patterns(allowed)
+        table = blind.debuffed_table(table)
+        if not allowed or len(ids) < blind.min_cards:
+            return []
+
+    search = {'subsets': math.comb(len(ids), 5), 'candidates': 0, 'duplicates': 0, 'scored': 0, 'types_pruned': 0}
+    if stats is not None:
+        stats.clear()
+        stats.update(search)
+        search = stats
+    if len(ids) < 5:
+        return []
+
+    # Bound every hand type by the best cards of the whole hand; a card is either
+    # scored or held, so the larger of its two multipliers bounds its effect
+    chips, mult, scored_x, held_x = _card_bounds(table, ids)
+    best_x = 1.0
+    for scored, held in zip(scored_x, held_x):
+        best_x *= max(scored, held)
+    hand_chips, hand_mult = _prefix_sums(chips), _prefix_sums(mult)
+    type_bounds = {pattern: _score_bound(pattern, hand_chips, hand_mult, best_x) for pattern in allowed}
+
+    buckets = _Buckets(table, ids)
+    # Only cards with a held multiplier (Steel) change a score by staying in hand
+    held_scoring = [p for p, held in enumerate(held_x) if held != 1.0]
+    # Best play found for each distinct set of pattern cards, and the scores of
+    # the top_n best; a hand type must beat the lowest of those to be searched
+    plays = {}
+    best = {}
+    threshold = -1
+    for done, pattern in enumerate(sorted(allowed, key=type_bounds.get, reverse=True)):
+        if progress is not None:
+            progress(done, len(allowed))
+        if type_bounds[pattern] <= threshold:
+            search['types_pruned'] += 1
+            continue
+        if pattern == 'High Card':
+            candidates = _high_cards(buckets, table, ids, allowed, held_x)
+        else:
+            candidates = ((positions, _pad_play(positions, forbidden, buckets, held_x))
+                          for positions, forbidden in CANDIDATES[pattern](buckets))
+        for positions, subset in candidates:
+            search['candidates'] += 1
+            if progress is not None:
+                progress(done, len(allowed))
+            if subset is None:
+                continue
+            pattern_cards = [ids[p] for p in positions]
+            key = tuple(sorted(table.card_key(card) for card in pattern_cards))
+            held_cards = [ids[p] for p in held_scoring if p not in subset]
+            search['scored'] += 1
+            score, base_chips, mult = score_pattern(pattern, pattern_cards, table, held_cards)
+            # Ties go to the play the exhaustive search would list first
+            order = (-score, PATTERN_ORDER[pattern], subset, positions)
+            if key in plays and plays[key][0] <= order:
+                search['duplicates'] += 1
+                continue
+            # Plays are kept as plain tuples; results are only built for the top_n
+            plays[key] = (order, pattern, positions, base_chips, mult)
+            if score > threshold and score > best.get(key, -1):
+                best[key] = score
+                if len(best) > top_n:
+                    del best[min(best, key=best.get)]
+                if len(best) >= top_n:
+                    threshold = min(best.values())
+
+    if progress is not None:
+        progress(len(allowed), len(allowed))
+    top = sorted(plays.values(), key=lambda play: play[0])[:top_n]
+    return [PlayResult(tuple(as_input(order[2])), pattern, as_input(positions), -order[0], base_chips, mult)
+            for order, pattern, positions, base_chips, mult in top]
+
+def best_plays_by_type(cards, table=None):
+    """
+    Find the play of five with the most pattern chips for each hand type the cards can form.
+
+    A hand type's base chips and mult are left out, so the result holds
+    whatever HAND_SCORES is: for cards without mult modifiers, a play of a
+    type scores (base chips + pattern chips) x base mult, and the best play of
+    the type is the one with the most pattern chips.
+
+    Parameters:
+    - cards (list): Card names, or card ids into `table` (a CardTable) when one is given.
+    - table (CardTable): Optional table holding the cards.
+
+    Returns:
+    - dict: (pattern chips, play, scoring cards) for each hand type the cards
+      can form, the play being the five cards and the scoring cards its
+      pattern cards, in the form given; types they cannot form are left out.
+    """
+    if table is None:
+        table, ids = CardTable.from_names(cards)
+        as_input = lambda positions: [cards[p] for p in positions]
+    else:
+        ids = list(cards)
+        as_input = lambda positions: [ids[p] for p in positions]
+    plays = {}
+    if len(ids) < 5:
+        return plays
+
+    chips = [table.chips[card] * table.triggers[card] for card in ids]
+    held_x = [1.0] * len(ids)
+    buckets = _Buckets(table, ids)
+    allowed = list(HAND_SCORES)
+    for pattern in allowed:
+        if pattern == 'High Card':
+            candidates = _high_cards(buckets, table, ids, allowed, held_x)
+        else:
+            candidates = ((positions, _pad_play(positions, forbidden, buckets, held_x))
+                          for positions, forbidden in CANDIDATES[pattern](buckets))
+        best = None
+        for positions, subset in candidates:
+            if subset is not None:
+                pattern_chips = sum(chips[p] for p in positions)
+                if best is None or pattern_chips > best[0]:
+                    best = (pattern_chips, subset, positions)
+        if best is not None:
+            plays[pattern] = (best[0], as_input(best[1]), as_input(best[2]))
+    return plays
+
+def pattern_chip_sums(cards, table=None):
+    """
+    Find the most chips the pattern cards of each hand type can add (see best_plays_by_type).
+
+    Returns:
+    - dict: Pattern chips for each hand type the cards can form; types they cannot form are left out.
+    """
+    return {pattern: chips for pattern, (chips, play, scoring) in best_plays_by_type(cards, table).items()}
+
+def _find_best_hands_exhaustive(cards, top_n=5, table=None, blind=None):
+    """
+    Reference version of find_best_hands that scores every pattern of every 5-card subset.
+
+    Kept to cross-check the candidate generator; it is too slow for large hands.
+    """
+    hand_scores = []
+    if table is None:
+        table, ids = CardTable.from_names(cards)
+    else:
+        ids = list(cards)
+    canonical = _canonical_order(table, ids)
+    ids = [ids[i] for i in canonical]
+    as_input = lambda positions: [cards[canonical[p]] for p in sorted(positions, key=canonical.__getitem__)]
+
+    allowed = list(HAND_SCORES)
+    if blind is not None:
+        allowed = blind.allowed_patterns(allowed)
+        table = blind.debuffed_table(table)
+        if not allowed or len(ids) < blind.min_cards:
+            return []
+
+    # Generate all possible subsets of size 5, skipping repeats of the same
+    # cards when the hand holds duplicates
+    seen_subsets = set()
+    for subset in itertools.combinations(range(len(ids)), 5):
+        subset_key = tuple(sorted(table.card_key(ids[p]) for p in subset))
+        if subset_key in seen_subsets:
+            continue
+        seen_subsets.add(subset_key)
+        held_cards = [ids[p] for p in range(len(ids)) if p not in subset]
+        patterns = _evaluate_ids([ids[p] for p in subset], table, allowed)
         # For each pattern in this subset, calculate the score
         for pattern, pattern_cards in patterns:
-            # Ensure that pattern_cards are part of the current subset
-            if all(card in subset for card in pattern_cards):
-                score, calculation_str = calculate_pattern_score(pattern, pattern_cards)
-                hand_scores.append({
-                    'subset': subset,
-                    'pattern': pattern,
-                    'pattern_cards': pattern_cards,
-                    'score': score,
-                    'calculation': calculation_str
-                })
-
-    # Sort the hand_scores by score in descending order
-    hand_scores.sort(key=lambda x: x['score'], reverse=True)
+            positions = [p for p in subset if ids[p] in pattern_cards]
+            score, calculation_str = calculate_pattern_score(pattern, pattern_cards, table, held_cards)
+            hand_scores.append({
+                'subset': tuple(as_input(subset)),
+                'pattern': pattern,
+                'pattern_cards': as_input(positions),
+                'score': score,
+                'calculation': calculation_str,
+                'key': tuple(sorted(table.card_key(card) for card in pattern_cards)),
+                'order': (-score, PATTERN_ORDER[pattern], subset)
+            })
+
+    # Sort the hand_scores by score in descending order, then as find_best_hands breaks ties
+    hand_scores.sort(key=lambda x: x['order'])
 
     # Remove duplicates based on the main pattern cards
     unique_hand_scores = []
     seen_patterns = set()
     for hand in hand_scores:
         # Use the sorted main pattern cards as the key
-        main_cards_key = tuple(sorted(hand['pattern_cards']))
+        main_cards_key = hand.pop('key')
+        del hand['order']
         if main_cards_key not in seen_patterns:
             seen_patterns.add(main_cards_key)
             unique_hand_scores.append(hand)
@@ -266,7 +690,8 @@ def main():
         update_hand_scores()
 
         # Find the best subsets of 5 cards
-        top_hands = find_best_hands(cards, top_n=5)
+        search = {}
+        top_hands = find_best_hands(cards, top_n=5, stats=search)
         if top_hands:
             print("\nTop 5 Best Combinations:")
             for idx, hand in enumerate(top_hands, 1):
@@ -277,6 +702,8 @@ def main():
                 print(f"Total Score: {hand['score']}")
         else:
             print("\nNo valid combinations found.")
+        print(f"\nCandidate plays scored: {search['scored']} (of {search['subsets']} 5-card subsets), "
+              f"hand types pruned by bound: {search['types_pruned']}")
     except ValueError as e:
         print(e)
 
@@ -0,0 +1,210 @@
+# prefetch.py
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from math import comb
+from deck import CARD_NAMES, count_outcomes, draw_outcomes, draw_probability
+
+# CPU seconds a prefetch may spend, and the most next hands it considers
+PREFETCH_BUDGET = 2.0
+MAX_CANDIDATES = 20000
+
+# Next hands looked up in the cache per query
+CHUNK = 64
+
+
+def likely_hands(kept, draw, count, limit=MAX_CANDIDATES, seed=0):
+    """
+    List the hands that can follow a discard, most probable first.
+
+    Every outcome is enumerated when there are at most `limit` of them;
+    otherwise `limit` distinct outcomes are sampled by drawing from the deck,
+    so the likelier ones tend to be found first. Outcomes only differ in
+    probability when the deck holds duplicate cards; from a deck of unique
+    cards every outcome is equally likely and the order is arbitrary.
+
+    Parameters:
+    - kept (list): Card names kept in hand.
+    - draw (Deck): The draw pile.
+    - count (int): Cards to be drawn (capped at the draw pile's size).
+    - limit (int): Most hands returned.
+    - seed (int): Seed for sampling.
+
+    Returns:
+    - list: (probability, hand) pairs, hand being the kept cards followed by the ones drawn.
+    """
+    count = min(count, len(draw))
+    if count <= 0:
+        return [(1.0, list(kept))]
+    total = comb(len(draw), count)
+    outcomes = {}
+    if count_outcomes(draw, count) <= limit:
+        outcomes = dict.fromkeys(draw_outcomes(draw, count))
+    else:
+        rng = random.Random(seed)
+        cards = [index for index, copies in enumerate(draw.counts) for _ in range(copies)]
+        for _ in range(limit * 4):
+            drawn = {}
+            for index in rng.sample(cards, count):
+                drawn[index] = drawn.get(index, 0) + 1
+            outcomes[tuple(sorted(drawn.items()))] = None
+            if len(outcomes) >= limit:
+                break
+    hands = []
+    for outcome in outcomes:
+        drawn = dict(outcome)
+        hand = list(kept) + [CARD_NAMES[index] for index, k in outcome for _ in range(k)]
+        hands.append((draw_probability(drawn, draw, total), hand))
+    hands.sort(key=lambda pair: -pair[0])
+    return hands[:limit]
+
+
+class Prefetcher:
+    """
+    Computes best plays for the likely next hands on a background thread.
+
+    After a discard is recommended, start() lists the hands the draw can
+    produce (see likely_hands) and finds the best play for each one not
+    already cached, storing it in the recommendation cache, until the CPU
+    budget is spent. The budget covers roughly 9,000 hands, so a 1- to
+    3-card draw is covered entirely or mostly, but a 5-card draw from 44
+    cards (about 1.09 million outcomes) under 1%. Foreground analyses pause it (pause() and resume(), or paused()); a new hand or a
+    change of planets, Jokers, deck or blind stops it. check() counts whether
+    the hand that actually followed had been prefetched.
+    """
+
+    def __init__(self, cache, budget=PREFETCH_BUDGET, limit=MAX_CANDIDATES):
+        """
+        Initialize a Prefetcher with nothing running.
+
+        Parameters:
+        - cache (RecommendationCache): Where the plays are stored.
+        - budget (float): CPU seconds each prefetch may spend.
+        - limit (int): Most next hands each prefetch considers.
+        """
+        self.cache = cache
+        self.budget = budget
+        self.limit = limit
+        self.stats = {'runs': 0, 'hands': 0, 'computed': 0, 'cpu_seconds': 0.0, 'coverage': 0.0,
+                      'lookups': 0, 'hits': 0}
+        self._thread = None
+        self._stop = threading.Event()
+        self._resume = threading.Event()
+        self._resume.set()
+        self._pauses = 0
+        self._keys = None  # Keys covered by the last prefetch, until the next hand is checked
+        self._lock = threading.Lock()
+
+    def start(self, kept, draw, count, blind=None, jokers=()):
+        """
+        Start prefetching the hands that follow discarding down to kept, stopping any earlier prefetch.
+
+        Parameters:
+        - kept (list): Card names kept in hand.
+        - draw (Deck): The draw pile (not changed; the prefetch works on a copy).
+        - count (int): Cards that will be drawn.
+        - blind: Active BossBlind, or None.
+        - jokers (list): Names of the enabled Jokers, in order.
+        """
+        self.stop()
+        self._stop = threading.Event()
+        self._keys = set()
+        self._thread = threading.Thread(target=self._run, name='prefetch', daemon=True,
+                                        args=(self._stop, self._keys, list(kept), draw.copy(), count, blind,
+                                              list(jokers)))
+        self._thread.start()
+
+    def _run(self, stop, keys, kept, draw, count, blind, jokers):
+        from play import find_best_hands
+        from recommendationCache import cache_key
+
+        start = time.thread_time()
+        hands = covered = 0
+        computed = 0
+        try:
+            candidates = likely_hands(kept, draw, count, self.limit)
+            for offset in range(0, len(candidates), CHUNK):
+                chunk = candidates[offset:offset + CHUNK]
+                chunk_keys = [cache_key('plays', hand, blind=blind, jokers=jokers) for _, hand in chunk]
+                found = self.cache.get_many(chunk_keys, record=False)
+                for (probability, hand), key in zip(chunk, chunk_keys):
+                    while not self._resume.wait(0.05):
+                        if stop.is_set():
+                            return
+                    if stop.is_set() or time.thread_time() - start > self.budget:
+                        return
+                    if key not in found:
+                        self.cache.put(key, 'plays', find_best_hands(hand, top_n=1, blind=blind))
+                        computed += 1
+                    keys.add(key)
+                    hands += 1
+                    covered += probability
+        finally:
+            with self._lock:
+                self.stats['runs'] += 1
+                self.stats['hands'] += hands
+                self.stats['computed'] += computed
+                self.stats['coverage'] += covered
+                self.stats['cpu_seconds'] += time.thread_time() - start
+
+    def stop(self):
+        """Stop the running prefetch, if any, and wait until what it computed is in the cache."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.cache.flush()
+
+    def pause(self):
+        """Pause the prefetch until every pause() has been matched by a resume()."""
+        with self._lock:
+            self._pauses += 1
+            self._resume.clear()
+
+    def resume(self):
+        """Release one pause(); the prefetch continues once none is left."""
+        with self._lock:
+            self._pauses -= 1
+            if not self._pauses:
+                self._resume.set()
+
+    @contextmanager
+    def paused(self):
+        """Pause the prefetch while foreground work runs."""
+        self.pause()
+        try:
+            yield
+        finally:
+            self.resume()
+
+    def check(self, key):
+        """
+        Count the lookup of the hand that followed a prefetch.
+
+        Parameters:
+        - key (str): The cache key of the new hand's plays.
+
+        Returns:
+        - bool: Whether the prefetch had it ready (False if no prefetch preceded it).
+        """
+        keys, self._keys = self._keys, None
+        if keys is None:
+            return False
+        hit = key in keys
+        with self._lock:
+            self.stats['lookups'] += 1
+            self.stats['hits'] += hit
+        return hit
+
+    def summary(self):
+        """Return a one-line report of the prefetch hit rate and the work done."""
+        stats = self.stats
+        if not stats['runs']:
+            return "Prefetch: not run."
+        line = (f"Prefetch: {stats['hits']}/{stats['lookups']} next hands ready"
+                f" ({stats['hits'] / stats['lookups']:.0%})" if stats['lookups'] else "Prefetch: no next hands yet")
+        return (f"{line}; {stats['runs']} runs covered {stats['coverage'] / stats['runs']:.0%} of the draws"
+                f" on average, {stats['hands']} hands ({stats['computed']} computed) in"
+                f" {stats['cpu_seconds']:.2f} CPU s.")
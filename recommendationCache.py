@@ -0,0 +1,308 @@
+# recommendationCache.py
+
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from artifacts import CACHE_DIR
+from results import PlayResult, StrategyResult
+
+CACHE_PATH = os.path.join(CACHE_DIR, 'recommendations.sqlite')
+
+# Part of every key; bump it when an engine change alters results, so old entries stop matching
+ENGINE_VERSION = 3
+
+# Eviction limits: total size of the stored results, and days since an entry was last used
+MAX_BYTES = 32 << 20
+MAX_AGE_DAYS = 30
+
+# Writes between eviction passes
+EVICT_EVERY = 200
+
+KINDS = ('plays', 'discards')
+
+
+def _encode(kind, results):
+    """Serialize find_best_hands ('plays') or recommend_discard_strategies ('discards') results."""
+    if kind == 'plays':
+        rows = [[list(r.subset), r.pattern, r.pattern_cards, r.score, r.base_chips, r.mult] for r in results]
+    else:
+        rows = [[r.discard, r.pattern, r.score, r.probability, r.kept_cards,
+                 [r.pattern_score, r.base_chips, r.mult], r.exact] for r in results]
+    return json.dumps(rows, separators=(',', ':')).encode()
+
+
+def _decode(kind, blob):
+    rows = json.loads(blob)
+    if kind == 'plays':
+        return [PlayResult(tuple(row[0]), *row[1:]) for row in rows]
+    return [StrategyResult(*row[:5], tuple(row[5]), row[6]) for row in rows]
+
+
+def scoring_context(blind=None, jokers=()):
+    """
+    Return what, besides the cards, a recommendation depends on: the engine
+    version, the current HAND_SCORES (planet levels), the Boss Blind and the
+    Joker loadout.
+    """
+    import play
+
+    return [ENGINE_VERSION, sorted(play.HAND_SCORES.items()),
+            None if blind is None else [blind.name, blind.played_hand_types], list(jokers)]
+
+
+def cache_key(kind, hand, deck=None, blind=None, jokers=(), top_n=1):
+    """
+    Return the cache key of a recommendation.
+
+    Parameters:
+    - kind (str): 'plays' or 'discards'.
+    - hand (list): Card names in hand; their order does not matter.
+    - deck (Deck): The draw pile, for discards (plays do not depend on it).
+    - blind: Active BossBlind, or None.
+    - jokers (list): Names of the enabled Jokers, in order.
+    - top_n (int): Results asked for.
+
+    Returns:
+    - str: A 32-digit hex digest of the canonical (hand, deck signature, scoring context, loadout).
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Error: Unknown recommendation kind '{kind}'. Choose from {', '.join(KINDS)}.")
+    signature = None if deck is None else deck.counts
+    text = json.dumps([kind, top_n, sorted(hand), signature, scoring_context(blind, jokers)],
+                      separators=(',', ':'))
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+class RecommendationCache:
+    """
+    Recommendations kept across sessions in an sqlite database.
+
+    Reads fetch any number of keys in one query. Writes and last-used updates
+    are queued to a background thread, which commits them in batches and
+    evicts entries unused for max_age_days, then the least recently used
+    ones while the results stored exceed max_bytes. Hits and misses, and the
+    time taken to serve each, are counted in stats.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=MAX_BYTES, max_age_days=MAX_AGE_DAYS):
+        """
+        Initialize a RecommendationCache, creating the database if needed.
+
+        Parameters:
+        - path (str): Database file.
+        - max_bytes (int): Size limit of the stored results.
+        - max_age_days (float): Entries unused for longer are evicted.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.stats = {'hits': 0, 'misses': 0, 'computed': 0, 'writes': 0, 'evicted': 0,
+                      'hit_seconds': 0.0, 'miss_seconds': 0.0}
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        self._writer = None
+        self._lock = threading.Lock()
+        with self._connection() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, kind TEXT NOT NULL, "
+                               "value BLOB NOT NULL, created REAL NOT NULL, used REAL NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS results_used ON results (used)")
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=5)
+        # Readers are not blocked by the writer thread's commits
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _connection(self):
+        """Return this thread's connection (sqlite connections stay on the thread that made them)."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def get_many(self, keys, record=True):
+        """
+        Look up several keys in one query.
+
+        Parameters:
+        - keys: Keys from cache_key.
+        - record (bool): Count the lookups in stats and mark the hits as used
+          (off for lookups the user is not waiting on, such as prefetching).
+
+        Returns:
+        - dict: The results found, by key; missing keys are counted as misses.
+        """
+        keys = list(dict.fromkeys(keys))
+        start = time.perf_counter()
+        found = {}
+        for offset in range(0, len(keys), 500):
+            chunk = keys[offset:offset + 500]
+            rows = self._connection().execute(
+                f"SELECT key, kind, value FROM results WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+            for key, kind, value in rows:
+                found[key] = _decode(kind, value)
+        if not record:
+            return found
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.stats['hits'] += len(found)
+            self.stats['misses'] += len(keys) - len(found)
+            if found:
+                self.stats['hit_seconds'] += elapsed
+        if found:
+            self._submit(('touch', list(found), time.time()))
+        return found
+
+    def get(self, key):
+        """Look up one key; returns its results or None."""
+        return self.get_many([key]).get(key)
+
+    def put(self, key, kind, results, seconds=None):
+        """
+        Queue results for writing.
+
+        Parameters:
+        - key (str): From cache_key.
+        - kind (str): 'plays' or 'discards'.
+        - results (list): PlayResult or StrategyResult objects.
+        - seconds (float): Time the engine took for them, for stats.
+        """
+        if seconds is not None:
+            with self._lock:
+                self.stats['computed'] += 1
+                self.stats['miss_seconds'] += seconds
+        self._submit(('put', key, kind, _encode(kind, results), time.time()))
+
+    def _submit(self, item):
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name='recommendation-cache', daemon=True)
+                self._writer.start()
+        self._queue.put(item)
+
+    def _write_loop(self):
+        connection = None
+        writes = 0
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            try:
+                if connection is None:
+                    connection = self._connect()
+                    self._evict(connection)
+                with connection:
+                    for item in batch:
+                        if item is None:
+                            continue
+                        if item[0] == 'put':
+                            key, kind, value, now = item[1:]
+                            connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                                               (key, kind, value, now, now))
+                            writes += 1
+                        else:
+                            keys, now = item[1:]
+                            connection.executemany("UPDATE results SET used = ? WHERE key = ?",
+                                                   [(now, key) for key in keys])
+                with self._lock:
+                    self.stats['writes'] += sum(1 for item in batch if item is not None and item[0] == 'put')
+                if writes >= EVICT_EVERY:
+                    writes = 0
+                    self._evict(connection)
+            except Exception as e:
+                # A cache that cannot be written to only costs recomputation; the writer keeps
+                # running so flush() and close() still return
+                print(f"Recommendation cache: write failed: {e!r}", file=sys.stderr)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                if connection is not None:
+                    connection.close()
+                return
+
+    def _evict(self, connection):
+        """Delete entries past max_age, then the least recently used ones until under max_bytes."""
+        with connection:
+            evicted = connection.execute("DELETE FROM results WHERE used < ?", (time.time() - self.max_age,)).rowcount
+            total = connection.execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM results").fetchone()[0]
+            if total > self.max_bytes:
+                stale = []
+                # Evict down to 90% of the limit so the next pass is not right away
+                for key, size in connection.execute("SELECT key, LENGTH(value) FROM results ORDER BY used"):
+                    if total <= self.max_bytes * 0.9:
+                        break
+                    stale.append((key,))
+                    total -= size
+                connection.executemany("DELETE FROM results WHERE key = ?", stale)
+                evicted += len(stale)
+        with self._lock:
+            self.stats['evicted'] += evicted
+
+    def flush(self):
+        """Wait until every queued write is committed."""
+        self._queue.join()
+
+    def close(self):
+        """Commit the queued writes and stop the writer thread."""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def info(self):
+        """Return the number of entries and the bytes of results stored."""
+        entries, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM results").fetchone()
+        return {'entries': entries, 'bytes': size}
+
+    def summary(self):
+        """Return a one-line report of this session's hit rate and the time saved per hit."""
+        hits, misses = self.stats['hits'], self.stats['misses']
+        lookups = hits + misses
+        if not lookups:
+            return "Recommendation cache: no lookups."
+        line = f"Recommendation cache: {hits}/{lookups} hits ({hits / lookups:.0%})"
+        if hits:
+            line += f", {self.stats['hit_seconds'] / hits * 1000:.2f} ms per hit"
+        if self.stats['computed']:
+            line += f", {self.stats['miss_seconds'] / self.stats['computed'] * 1000:.1f} ms per miss computed"
+        return line + "."
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or clear the recommendation cache.")
+    parser.add_argument('command', choices=['info', 'clear'])
+    parser.add_argument('--path', default=CACHE_PATH, help="Cache database.")
+    args = parser.parse_args()
+    cache = RecommendationCache(args.path)
+    if args.command == 'clear':
+        with cache._connection() as connection:
+            connection.execute("DELETE FROM results")
+        connection.execute("VACUUM")
+    info = cache.info()
+    print(f"{args.path}: {info['entries']} entries, {info['bytes'] / 1024:.1f} KiB of results")
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+# results.py
+
+
+def format_number(value):
+    """Format a chip or mult value without a trailing '.0'."""
+    return str(int(value)) if value == int(value) else f"{value:.2f}"
+
+
+def format_calculation(base_chips, mult, score):
+    """Return the score calculation shown for a play: its base chips, final mult and score."""
+    return f"({base_chips} + sum of card values) x {format_number(mult)} = {score}"
+
+
+class Result:
+    """
+    A search result with fixed fields, read like the dicts the engines used to return.
+
+    Subclasses list their stored attributes in __slots__ and the fields they
+    expose in FIELDS; derived fields such as 'calculation' are properties,
+    so their text is only built for the results that are shown.
+    """
+
+    __slots__ = ()
+    FIELDS = ()
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.FIELDS
+
+    def get(self, key, default=None):
+        """Return a field, or default if there is no such field."""
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def keys(self):
+        return self.FIELDS
+
+    def to_dict(self):
+        """Return the fields as a plain dict (e.g., for json.dumps)."""
+        return {key: getattr(self, key) for key in self.FIELDS}
+
+    def __eq__(self, other):
+        if isinstance(other, Result):
+            other = other.to_dict()
+        return self.to_dict() == other if isinstance(other, dict) else NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class PlayResult(Result):
+    """A play from find_best_hands: the five cards, the pattern they score and its score."""
+
+    __slots__ = ('subset', 'pattern', 'pattern_cards', 'score', 'base_chips', 'mult')
+    FIELDS = ('subset', 'pattern', 'pattern_cards', 'score', 'calculation')
+
+    def __init__(self, subset, pattern, pattern_cards, score, base_chips, mult):
+        """
+        Initialize a PlayResult.
+
+        Parameters:
+        - subset (tuple): The five cards played.
+        - pattern (str): The hand type scored.
+        - pattern_cards (list): The cards that score.
+        - score (int): The play's score.
+        - base_chips (int): Chips of the hand type, for the calculation text.
+        - mult: Final mult, for the calculation text.
+        """
+        self.subset = subset
+        self.pattern = pattern
+        self.pattern_cards = pattern_cards
+        self.score = score
+        self.base_chips = base_chips
+        self.mult = mult
+
+    @property
+    def calculation(self):
+        return format_calculation(self.base_chips, self.mult, self.score)
+
+
+class StrategyResult(Result):
+    """A discard strategy from recommend_discard_strategies."""
+
+    __slots__ = ('discard', 'pattern', 'score', 'probability', 'kept_cards', 'exact',
+                 'pattern_score', 'base_chips', 'mult')
+    FIELDS = ('discard', 'pattern', 'score', 'probability', 'kept_cards', 'calculation', 'exact')
+
+    def __init__(self, discard, pattern, score, probability, kept_cards, scored, exact=True):
+        """
+        Initialize a StrategyResult.
+
+        Parameters:
+        - discard (list): Cards to discard.
+        - pattern (str): Pattern to aim for.
+        - score (float): Expected score of the strategy.
+        - probability (float): Chance of completing the pattern.
+        - kept_cards (list): Cards kept.
+        - scored (tuple): (score, base chips, mult) of the pattern on the kept cards, for the calculation text.
+        - exact (bool): False when a deadline cut the search short.
+        """
+        self.discard = discard
+        self.pattern = pattern
+        self.score = score
+        self.probability = probability
+        self.kept_cards = kept_cards
+        self.pattern_score, self.base_chips, self.mult = scored
+        self.exact = exact
+
+    @property
+    def calculation(self):
+        return format_calculation(self.base_chips, self.mult, self.pattern_score)
+
+
+class DistributionResult(Result):
+    """The distribution of the best play's score after a discard, from scoreDistribution.py."""
+
+    __slots__ = ('discard', 'kept_cards', 'mass', 'exact', 'outcomes')
+    FIELDS = ('discard', 'kept_cards', 'mass', 'mean', 'percentiles', 'exact', 'outcomes')
+    PERCENTILES = (10, 25, 50, 75, 90)
+
+    def __init__(self, discard, kept_cards, mass, exact=True, outcomes=1):
+        """
+        Initialize a DistributionResult.
+
+        Parameters:
+        - discard (list): Cards discarded.
+        - kept_cards (list): Cards kept.
+        - mass (list): (score, probability) pairs, by increasing score; the probabilities add up to 1.
+        - exact (bool): False when the draws were sampled rather than enumerated.
+        - outcomes (int): Draws enumerated or sampled.
+        """
+        self.discard = discard
+        self.kept_cards = kept_cards
+        self.mass = mass
+        self.exact = exact
+        self.outcomes = outcomes
+
+    @property
+    def mean(self):
+        return sum(score * probability for score, probability in self.mass)
+
+    @property
+    def percentiles(self):
+        return {p: self.percentile(p) for p in self.PERCENTILES}
+
+    def percentile(self, p):
+        """Return the p-th percentile: the lowest score s with P(score <= s) >= p / 100."""
+        cumulative = 0.0
+        for score, probability in self.mass:
+            cumulative += probability
+            # A little slack so rounding in the sum does not skip a score
+            if cumulative >= p / 100 - 1e-12:
+                return score
+        return self.mass[-1][0] if self.mass else 0
+
+    def probability_at_least(self, target):
+        """Return the chance that the best play scores target or more."""
+        return sum(probability for score, probability in self.mass if score >= target)
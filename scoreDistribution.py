@@ -0,0 +1,181 @@
+# scoreDistribution.py
+
+import json
+import random
+from math import comb
+from deck import CARD_NAMES, as_deck, count_outcomes, draw_outcomes, draw_probability
+from results import DistributionResult
+
+# Draws enumerated exactly up to this many distinct outcomes; past it, SAMPLES draws are sampled
+MAX_OUTCOMES = 20000
+SAMPLES = 4000
+
+# Deck signatures whose draws and scores are kept
+MAX_DECKS = 16
+
+
+# Per deck signature and scoring context: the draws of each size, and each keep set's score mass
+_decks = {}
+
+
+def _draws(entry, deck, count, limit, samples, seed):
+    """
+    Return (draws, exact) for drawing count cards from deck, computed once per deck signature.
+
+    Draws are (probability, card indices) pairs. Every keep set drawing the
+    same number of cards shares them, sampled ones included, so keep sets are
+    compared on the same draws.
+    """
+    key = (count, limit, samples, seed)
+    if key not in entry['draws']:
+        if count_outcomes(deck, count) <= limit:
+            total = comb(len(deck), count)
+            draws = [(draw_probability(dict(outcome), deck, total),
+                      tuple(index for index, k in outcome for _ in range(k)))
+                     for outcome in draw_outcomes(deck, count)]
+            entry['draws'][key] = draws, True
+        else:
+            rng = random.Random(seed)
+            cards = [index for index, copies in enumerate(deck.counts) for _ in range(copies)]
+            drawn = {}
+            for _ in range(samples):
+                outcome = tuple(sorted(rng.sample(cards, count)))
+                drawn[outcome] = drawn.get(outcome, 0) + 1
+            entry['draws'][key] = [(n / samples, outcome) for outcome, n in drawn.items()], False
+    return entry['draws'][key]
+
+
+def _best_score(hand, blind):
+    from play import find_best_hands
+    from bestPlayTable import lookup_best_play
+
+    plays = lookup_best_play(hand, blind) or find_best_hands(hand, top_n=1, blind=blind)
+    return plays[0]['score'] if plays else 0
+
+
+def score_distributions(current_hand, remaining_deck, keep_sets, blind=None, limit=MAX_OUTCOMES, samples=SAMPLES,
+                        seed=0, progress=None):
+    """
+    Find the distribution of the best play's score after each of several discards.
+
+    Every draw that can follow a discard is enumerated, weighted by its
+    probability from the deck's counts, when there are at most `limit`
+    distinct draws; otherwise `samples` draws are sampled (seeded, so
+    results are reproducible) and the result is marked inexact. The draws
+    for a deck signature and the score mass of each keep set are cached, so
+    asking again for the same deck, or for another keep set of the same
+    size, reuses them.
+
+    Parameters:
+    - current_hand (list): Cards in hand.
+    - remaining_deck: Deck (or card names) the replacements are drawn from.
+    - keep_sets (list): Lists of the cards kept, e.g. each strategy's 'kept_cards'.
+    - blind: Active BossBlind, or None.
+    - limit (int): Most distinct draws enumerated exactly.
+    - samples (int): Draws sampled past the limit.
+    - seed (int): Seed for sampling.
+    - progress: Optional progress(done, total) callback counting draws scored; it may raise to abandon the work.
+
+    Returns:
+    - list: A DistributionResult per keep set, in order.
+    """
+    from recommendationCache import scoring_context
+
+    deck = as_deck(remaining_deck)
+    signature = json.dumps([deck.counts, scoring_context(blind)], separators=(',', ':'))
+    if signature not in _decks:
+        if len(_decks) >= MAX_DECKS:
+            del _decks[next(iter(_decks))]
+        _decks[signature] = {'draws': {}, 'mass': {}}
+    entry = _decks[signature]
+
+    plans = []
+    for kept_cards in keep_sets:
+        discard = [card for card in current_hand if card not in kept_cards]
+        count = min(len(discard), len(deck))
+        draws, exact = _draws(entry, deck, count, limit, samples, seed)
+        plans.append((discard, list(kept_cards), (tuple(sorted(kept_cards)), count, limit, samples, seed), draws,
+                      exact))
+    total = sum(len(draws) for _, _, key, draws, _ in plans if key not in entry['mass'])
+    done = 0
+
+    results = []
+    for discard, kept_cards, key, draws, exact in plans:
+        if key not in entry['mass']:
+            mass = {}
+            for probability, drawn in draws:
+                if progress is not None and done % 256 == 0:
+                    progress(done, total)
+                score = _best_score(kept_cards + [CARD_NAMES[index] for index in drawn], blind)
+                mass[score] = mass.get(score, 0.0) + probability
+                done += 1
+            entry['mass'][key] = sorted(mass.items())
+        results.append(DistributionResult(discard, kept_cards, entry['mass'][key], exact, len(draws)))
+    if progress is not None:
+        progress(total, total)
+    return results
+
+
+def strategy_distributions(current_hand, remaining_deck, strategies, blind=None, progress=None, **options):
+    """Return the score distribution after each discard strategy (see score_distributions)."""
+    return score_distributions(current_hand, remaining_deck, [strategy['kept_cards'] for strategy in strategies],
+                               blind, progress=progress, **options)
+
+
+def format_distribution(distribution, target=None, width=40):
+    """Return the lines describing a DistributionResult: mean, percentiles, chance to reach target and a histogram."""
+    percentiles = ', '.join(f"p{p} {score}" for p, score in distribution['percentiles'].items())
+    how = (f"exact over {distribution['outcomes']} draws" if distribution['exact']
+           else f"estimated from {distribution['outcomes']} distinct sampled draws")
+    lines = [f"Mean {distribution['mean']:.1f}; {percentiles} ({how})"]
+    if target is not None:
+        lines.append(f"P(score >= {target}): {distribution.probability_at_least(target) * 100:.2f}%")
+    mass = distribution['mass']
+    if mass:
+        # Ten equal-width bins from the lowest to the highest score
+        low, high = mass[0][0], mass[-1][0]
+        step = max(1, -(-(high - low + 1) // 10))
+        bins = {}
+        for score, probability in mass:
+            start = low + (score - low) // step * step
+            bins[start] = bins.get(start, 0.0) + probability
+        widest = max(bins.values())
+        for start, probability in sorted(bins.items()):
+            bar = '#' * round(probability / widest * width)
+            lines.append(f"   {start:>6}-{start + step - 1:<6} {probability * 100:6.2f}% {bar}")
+    return lines
+
+
+def main():
+    import argparse
+    from play import parse_playing_cards, update_deck, update_hand_scores
+    from discard import recommend_discard_strategies
+
+    parser = argparse.ArgumentParser(description="Show the distribution of the best play's score after each "
+                                                 "recommended discard.")
+    parser.add_argument('hand', help="Cards in hand, e.g. 7h10h2s3dah9ckd5c.")
+    parser.add_argument('--target', type=int, default=None, help="Score to reach; shows the chance of reaching it.")
+    parser.add_argument('--top', type=int, default=3, help="Discard strategies to show.")
+    parser.add_argument('--limit', type=int, default=MAX_OUTCOMES, help="Most draws enumerated exactly.")
+    parser.add_argument('--samples', type=int, default=SAMPLES, help="Draws sampled past the limit.")
+    args = parser.parse_args()
+
+    try:
+        hand, _ = parse_playing_cards(args.hand)
+    except ValueError as e:
+        print(e)
+        raise SystemExit(2)
+    update_hand_scores()
+    deck = update_deck(hand)
+    strategies = recommend_discard_strategies(hand, deck, top_n=args.top)
+    distributions = strategy_distributions(hand, deck, strategies, limit=args.limit, samples=args.samples)
+    for idx, (strategy, distribution) in enumerate(zip(strategies, distributions), 1):
+        discard = ', '.join(strategy['discard']) or 'nothing'
+        print(f"\nRank {idx}: discard {discard}, aiming for {strategy['pattern']} "
+              f"({strategy['probability'] * 100:.2f}%)")
+        for line in format_distribution(distribution, args.target):
+            print(f"   {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# screen.py
+
+import os
+import shutil
+import sys
+
+# ANSI control sequences
+CLEAR = '\x1b[H\x1b[2J'  # Home the cursor and clear the screen
+ERASE_LINE = '\x1b[K'  # Erase from the cursor to the end of the line
+ERASE_BELOW = '\x1b[J'  # Erase from the cursor to the end of the screen
+
+
+def move_to(row):
+    """Return the control sequence moving the cursor to the start of a 1-based row."""
+    return f'\x1b[{row};1H'
+
+
+def enable_ansi(stream):
+    """
+    Return whether stream is a terminal that understands ANSI control sequences.
+
+    Windows consoles are switched to virtual terminal processing first; no
+    process is started either way.
+    """
+    try:
+        if not stream.isatty():
+            return False
+    except (AttributeError, ValueError):
+        return False
+    if os.name != 'nt':
+        return True
+    try:
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+    except Exception:
+        return False
+
+
+def split_rows(lines, width):
+    """Split lines into the terminal rows they occupy; lines holding color codes are assumed to fit."""
+    rows = []
+    for line in lines:
+        if len(line) <= width or '\x1b' in line:
+            rows.append(line)
+        else:
+            rows.extend(line[start:start + width] for start in range(0, len(line), width))
+    return rows
+
+
+class Screen:
+    """
+    A full-screen frame that is redrawn by rewriting only the rows that changed.
+
+    The last frame drawn is kept in memory. render() compares the new frame
+    row by row and sends, in a single write, cursor moves to the rows that
+    differ, their new text, and an erase of everything below the frame, so
+    whatever was typed or printed after the previous frame is wiped as well.
+    The whole screen is only redrawn after clear(), forget() or a resize, or
+    when the previous frame filled the terminal and may have scrolled.
+
+    When the output is not a terminal, frames are printed as plain lines.
+    """
+
+    def __init__(self, stream=None, reserve=1):
+        """
+        Initialize a Screen with nothing drawn.
+
+        Parameters:
+        - stream: Output to draw on (defaults to sys.stdout at the time of drawing).
+        - reserve (int): Rows printed below a frame before the next one (e.g., a prompt and its answer).
+        """
+        self.stream = stream
+        self.reserve = reserve
+        self._ansi = None
+        self._rows = None  # Rows of the frame on screen, or None if unknown
+        self._size = None
+
+    def _out(self):
+        out = self.stream or sys.stdout
+        if self._ansi is None:
+            self._ansi = enable_ansi(out)
+        return out
+
+    def clear(self):
+        """Clear the screen and forget the last frame."""
+        out = self._out()
+        self._rows = None
+        if self._ansi:
+            out.write(CLEAR)
+            out.flush()
+
+    def forget(self):
+        """Forget the last frame (e.g., after other output), so the next one is drawn in full."""
+        self._rows = None
+
+    def render(self, lines):
+        """
+        Draw a frame from the top of the screen, rewriting only the rows that changed.
+
+        Parameters:
+        - lines (list): The frame's lines, without newlines.
+
+        Returns:
+        - int: The number of rows written.
+        """
+        out = self._out()
+        lines = list(lines)
+        if not self._ansi:
+            out.write(''.join(f"{line}\n" for line in lines))
+            out.flush()
+            return len(lines)
+
+        size = shutil.get_terminal_size()
+        rows = split_rows(lines, size.columns)
+        if self._rows is None or size != self._size:
+            parts = [CLEAR]
+            previous = []
+        else:
+            parts = []
+            previous = self._rows
+        written = 0
+        for row, line in enumerate(rows):
+            if row >= len(previous) or previous[row] != line:
+                parts.append(f"{move_to(row + 1)}{line}{ERASE_LINE}")
+                written += 1
+        parts.append(f"{move_to(len(rows) + 1)}{ERASE_BELOW}")
+        out.write(''.join(parts))
+        out.flush()
+
+        # A frame that leaves no room for the rows after it scrolls the
+        # terminal, so its rows are no longer where they were drawn
+        self._rows = rows if len(rows) + self.reserve < size.lines else None
+        self._size = size
+        return written
@@ -0,0 +1,269 @@
+# simulate.py
+
+import os
+import random
+from array import array
+from dataclasses import replace
+from deck import make_deck
+from differential import resolve
+from parallel import chunks, map_chunks
+
+# Round rules: cards held, hands and discards per round, and most cards discarded at once
+HAND_SIZE = 8
+HANDS = 4
+DISCARDS = 3
+MAX_DISCARD = 5
+
+# Score histogram: bins as fractions of the target, the last one open-ended
+HISTOGRAM_BINS = [0, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0]
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def baseline_policy(hand, deck, hands_left, discards_left, needed, blind=None):
+    """
+    The advisor's advice: play the best hand (find_best_hands) if it clears the
+    blind or no discard is left, otherwise make the best discard
+    (recommend_discard_strategies) of at most MAX_DISCARD cards.
+
+    Returns:
+    - dict: 'type' ('play' or 'discard') and 'cards'; plays are the five cards
+      find_best_hands picked, so kickers are played (and replaced) too.
+    """
+    from play import find_best_hands
+    from discard import recommend_discard_strategies
+
+    plays = find_best_hands(hand, top_n=1, blind=blind)
+    play = {'type': 'play', 'cards': list(plays[0]['subset']) if plays else hand[:5]}
+    if plays and plays[0]['score'] >= needed or not discards_left or not len(deck):
+        return play
+    for strategy in recommend_discard_strategies(hand, deck, top_n=3, blind=blind):
+        if 0 < len(strategy['discard']) <= MAX_DISCARD:
+            return {'type': 'discard', 'cards': strategy['discard']}
+    return play
+
+
+def play_only_policy(hand, deck, hands_left, discards_left, needed, blind=None):
+    """Play the best hand every turn and never discard."""
+    return baseline_policy(hand, deck, hands_left, 0, needed, blind)
+
+
+# Built-in policies; any function with the same signature can be given as 'module:function'
+POLICIES = {
+    'baseline': baseline_policy,
+    'play-only': play_only_policy,
+}
+
+
+def get_policy(name):
+    """Return a policy by its POLICIES name or as 'module:function'."""
+    if name in POLICIES:
+        return POLICIES[name]
+    if ':' in name:
+        return resolve(name)
+    raise ValueError(f"Error: Unknown policy '{name}'. Choose from {', '.join(POLICIES)} or give module:function.")
+
+
+def deal(seed, index, preset='Standard'):
+    """Return the shuffled draw order of round index; the same seed and index always give the same deck."""
+    cards = list(make_deck(preset))
+    random.Random(f"{seed}:{index}").shuffle(cards)
+    return cards
+
+
+def play_round(policy, order, target, hands=HANDS, discards=DISCARDS, hand_size=HAND_SIZE, blind=None):
+    """
+    Play one round with a policy, drawing from a fixed card order.
+
+    Every policy sees the same order for a given round, so policies are
+    compared on the same deals. A play is scored as find_best_hands scores
+    the cards played, so it must hold five cards (or every card held, when
+    fewer are left).
+
+    Parameters:
+    - policy: Function (hand, deck, hands_left, discards_left, needed, blind) -> action.
+    - order (list): Card names in draw order (see deal).
+    - target (int): Score the blind requires.
+    - hands, discards (int): Hands and discards for the round.
+    - hand_size (int): Cards held.
+    - blind: Active BossBlind, or None.
+
+    Returns:
+    - (score, hands used, discards used): The round is cleared when score >= target.
+    """
+    from deck import Deck
+    from play import find_best_hands
+
+    if blind is not None:
+        # The hand types played this round, for The Eye and The Mouth
+        blind = replace(blind, played_hand_types=[])
+    hand = order[:hand_size]
+    position = len(hand)
+    deck = Deck.from_cards(order[position:])
+    score = 0
+    hands_left, discards_left = hands, discards
+    while hands_left and score < target and hand:
+        action = policy(hand, deck, hands_left, discards_left, target - score, blind)
+        cards = action['cards']
+        if action['type'] == 'play' and len(cards) == min(5, len(hand)):
+            played = find_best_hands(cards, top_n=1, blind=blind)
+            if played:
+                score += played[0]['score']
+                if blind is not None:
+                    blind.played_hand_types.append(played[0]['pattern'])
+            hands_left -= 1
+        elif action['type'] == 'discard' and discards_left and 0 < len(cards) <= MAX_DISCARD:
+            discards_left -= 1
+        else:
+            raise ValueError(f"Error: Illegal {action['type']} of {len(cards)} cards "
+                             f"with {discards_left} discards left.")
+        for card in cards:
+            hand.remove(card)
+        drawn = order[position:position + len(cards)]
+        position += len(drawn)
+        deck.remove_cards(drawn)
+        hand = hand + drawn
+    return score, hands - hands_left, discards - discards_left
+
+
+def _simulate_chunk(seed, start, stop, policies, targets, rules):
+    """Play rounds start..stop-1 with every policy and target; returns packed scores and totals."""
+    from blinds import BOSS_BLINDS
+
+    blind = BOSS_BLINDS[rules['blind']] if rules['blind'] else None
+    functions = {name: get_policy(name) for name in policies}
+    out = {(name, target): {'scores': array('I'), 'hands': 0, 'discards': 0}
+           for name in policies for target in targets}
+    for index in range(start, stop):
+        order = deal(seed, index, rules['deck'])
+        for name, policy in functions.items():
+            for target in targets:
+                score, hands, discards = play_round(policy, order, target, rules['hands'], rules['discards'],
+                                                    rules['hand_size'], blind)
+                entry = out[name, target]
+                entry['scores'].append(score)
+                entry['hands'] += hands
+                entry['discards'] += discards
+    return {key: dict(entry, scores=entry['scores'].tobytes()) for key, entry in out.items()}
+
+
+def percentile(sorted_values, p):
+    """Return the p-th percentile (nearest rank) of sorted values."""
+    if not sorted_values:
+        return 0
+    rank = max(1, -(-p * len(sorted_values) // 100))
+    return sorted_values[rank - 1]
+
+
+def simulate(rounds=1000, policies=('baseline',), targets=(300,), hands=HANDS, discards=DISCARDS,
+             hand_size=HAND_SIZE, deck='Standard', blind=None, seed=0, workers=None):
+    """
+    Play rounds with each policy against each target, across every core.
+
+    Round i is dealt from the same shuffled deck for every policy and target,
+    and from the same one whatever the number of workers, so a run is
+    reproducible from its seed.
+
+    Parameters:
+    - rounds (int): Rounds per policy and target (millions are fine; it scales with the cores).
+    - policies (list): Policy names (see POLICIES) or 'module:function'.
+    - targets (list): Blind targets.
+    - hands, discards, hand_size (int): Round rules.
+    - deck (str): Starting deck preset.
+    - blind (str): Boss Blind name, or None.
+    - seed (int): Seed the deals are built from.
+    - workers (int): Processes to play on (defaults to every core).
+
+    Returns:
+    - dict: For each (policy, target): 'rounds', 'cleared', 'clear_rate',
+      'mean', 'percentiles' (by PERCENTILES), 'histogram' (counts per
+      HISTOGRAM_BINS bin of score / target), 'hands' and 'discards' used per round.
+    """
+    from blinds import BOSS_BLINDS
+
+    for name in policies:
+        get_policy(name)
+    if blind is not None and blind not in BOSS_BLINDS:
+        raise ValueError(f"Error: Unknown Boss Blind '{blind}'.")
+    make_deck(deck)
+    workers = workers or os.cpu_count() or 1
+    rules = {'hands': hands, 'discards': discards, 'hand_size': hand_size, 'deck': deck, 'blind': blind}
+    results = map_chunks(_simulate_chunk, [(seed, start, stop, list(policies), list(targets), rules)
+                                         for start, stop in chunks(rounds, workers)], workers)
+    report = {}
+    for name in policies:
+        for target in targets:
+            scores = array('I')
+            used_hands = used_discards = 0
+            for chunk in results:
+                entry = chunk[name, target]
+                scores.frombytes(entry['scores'])
+                used_hands += entry['hands']
+                used_discards += entry['discards']
+            values = sorted(scores)
+            cleared = sum(1 for score in values if score >= target)
+            histogram = [0] * len(HISTOGRAM_BINS)
+            for score in values:
+                ratio = score / target
+                histogram[max(i for i, edge in enumerate(HISTOGRAM_BINS) if ratio >= edge)] += 1
+            count = len(values) or 1
+            report[name, target] = {
+                'rounds': len(values), 'cleared': cleared, 'clear_rate': cleared / count,
+                'mean': sum(values) / count, 'percentiles': {p: percentile(values, p) for p in PERCENTILES},
+                'histogram': histogram, 'hands': used_hands / count, 'discards': used_discards / count,
+            }
+    return report
+
+
+def format_report(report):
+    """Return the lines of a simulate() report, one block per policy and target."""
+    lines = []
+    for (name, target), result in report.items():
+        percentiles = ', '.join(f"p{p} {value}" for p, value in result['percentiles'].items())
+        lines += [
+            f"{name} vs {target}: cleared {result['cleared']}/{result['rounds']} ({result['clear_rate']:.1%}),"
+            f" mean score {result['mean']:.0f}, {result['hands']:.2f} hands and {result['discards']:.2f}"
+            f" discards per round",
+            f"   {percentiles}",
+        ]
+        widest = max(result['histogram']) or 1
+        for i, count in enumerate(result['histogram']):
+            upper = f"{HISTOGRAM_BINS[i + 1]:.2f}" if i + 1 < len(HISTOGRAM_BINS) else '   +'
+            bar = '#' * round(count / widest * 40)
+            lines.append(f"   {HISTOGRAM_BINS[i]:.2f}-{upper} x target {count:>9} {bar}")
+    return lines
+
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Play simulated rounds to compare advisor policies.")
+    parser.add_argument('--rounds', type=int, default=1000, help="Rounds per policy and target.")
+    parser.add_argument('--policy', action='append', default=[], metavar='NAME',
+                        help=f"Policy to play ({', '.join(POLICIES)} or module:function); repeatable.")
+    parser.add_argument('--target', type=int, action='append', default=[], help="Blind target; repeatable.")
+    parser.add_argument('--hands', type=int, default=HANDS, help="Hands per round.")
+    parser.add_argument('--discards', type=int, default=DISCARDS, help="Discards per round.")
+    parser.add_argument('--hand-size', type=int, default=HAND_SIZE, help="Cards held.")
+    parser.add_argument('--deck', default='Standard', help="Starting deck preset.")
+    parser.add_argument('--blind', default=None, help="Boss Blind to play against.")
+    parser.add_argument('--seed', type=int, default=0, help="Seed the deals are built from.")
+    parser.add_argument('--workers', type=int, default=None, help="Processes to use (default: every core).")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        report = simulate(args.rounds, args.policy or ['baseline', 'play-only'], args.target or [300],
+                          args.hands, args.discards, args.hand_size, args.deck, args.blind, args.seed,
+                          args.workers)
+    except ValueError as e:
+        print(e)
+        raise SystemExit(2)
+    print("\n".join(format_report(report)))
+    elapsed = time.perf_counter() - start
+    played = sum(result['rounds'] for result in report.values())
+    print(f"\n{played} rounds in {elapsed:.1f} s ({played / elapsed:.0f} per second)")
+
+
+if __name__ == "__main__":
+    main()
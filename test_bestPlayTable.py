@@ -0,0 +1,75 @@
+# test_bestPlayTable.py
+
+import random
+import struct
+
+import pytest
+
+import bestPlayTable
+import play
+from blinds import BOSS_BLINDS
+from deck import CARD_NAMES
+from differential import hand_scores_for
+from planetCards import PLANET_CARDS
+
+HANDS = 300
+
+
+@pytest.fixture(scope='module')
+def sampled_table(tmp_path_factory):
+    """A table file with the records of HANDS sampled hands written in, as the build writes them."""
+    rng = random.Random(0)
+    hands = [rng.sample(CARD_NAMES, bestPlayTable.HAND_SIZE) for _ in range(HANDS)]
+    path = str(tmp_path_factory.mktemp('table') / bestPlayTable.WORK_NAME)
+    bestPlayTable._create_work_file(path)
+    table = bestPlayTable.BestPlayTable(path)
+    saved = play.HAND_SCORES
+    play.HAND_SCORES = play.BASE_HAND_SCORES.copy()
+    try:
+        with open(path, 'r+b') as f:
+            for hand in hands:
+                masks = bestPlayTable.canonical_masks(hand)[0]
+                f.seek(table._records_offset + 4 * table.rank(masks))
+                f.write(struct.pack('<I', bestPlayTable.encode_record(masks)))
+    finally:
+        play.HAND_SCORES = saved
+    saved_table = bestPlayTable._table, bestPlayTable._table_loaded
+    bestPlayTable._table, bestPlayTable._table_loaded = bestPlayTable.BestPlayTable(path), True
+    yield hands
+    bestPlayTable._table, bestPlayTable._table_loaded = saved_table
+
+
+def _ranks(cards):
+    return sorted(card.split()[0] for card in cards)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_lookup_matches_search_under_planet_levels(sampled_table, seed):
+    hands = sampled_table
+    rng = random.Random(seed)
+    planets = {} if seed == 0 else {name: rng.randint(1, 4) for name in rng.sample(list(PLANET_CARDS), 4)}
+    saved = play.HAND_SCORES
+    play.HAND_SCORES = hand_scores_for(planets)
+    looked_up = 0
+    try:
+        for hand in hands:
+            hand = rng.sample(hand, len(hand))
+            found = bestPlayTable.lookup_best_play(hand)
+            if found is None:
+                continue
+            looked_up += 1
+            best = play.find_best_hands(hand, top_n=1)[0]
+            # The table shares entries between suit relabellings, so only the suits of a tied play may differ
+            assert (found[0]['pattern'], found[0]['score'], _ranks(found[0]['subset']),
+                    _ranks(found[0]['pattern_cards'])) == \
+                   (best['pattern'], best['score'], _ranks(best['subset']), _ranks(best['pattern_cards']))
+    finally:
+        play.HAND_SCORES = saved
+    assert looked_up > HANDS // 2
+
+
+def test_lookup_skips_hands_the_table_does_not_cover(sampled_table):
+    hand = sampled_table[0]
+    assert bestPlayTable.lookup_best_play(hand[:7]) is None
+    assert bestPlayTable.lookup_best_play(hand[:7] + hand[:1]) is None
+    assert bestPlayTable.lookup_best_play(hand, BOSS_BLINDS['The Club']) is None
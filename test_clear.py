@@ -0,0 +1,34 @@
+# test_clear.py
+
+import pytest
+
+from clear import clear_probability
+from deck import CARD_NAMES
+
+HAND = ['Ace Heart', 'Ace Spade', 'Ace Diamond', 'King Heart', 'King Spade', '2 Club', '3 Diamond', '7 Spade']
+
+
+def _rest(hand):
+    return [card for card in CARD_NAMES if card not in hand]
+
+
+@pytest.mark.parametrize('target', [367, 371, 372])
+def test_clears_exactly_at_the_best_score(target):
+    # The Full House of Aces over Kings scores 372; rounding the chips needed must not turn it into a miss
+    result = clear_probability(HAND, _rest(HAND), target, hands_left=1, discards_left=0)
+    assert result['probability'] == 1.0
+    assert result['error'] == 0.0
+
+
+def test_misses_just_above_the_best_score():
+    assert clear_probability(HAND, _rest(HAND), 373, hands_left=1, discards_left=0)['probability'] == 0.0
+
+
+def test_small_draws_are_enumerated_exactly():
+    # After the Full House (372), five of these six cards are drawn; 250 more needs the Flush of
+    # Hearts (Ace of Clubs left in the deck) or the 5-9 Straight (4 of Hearts left): 2 draws in 6
+    deck = ['Ace Club', '4 Heart', '5 Heart', '6 Heart', '8 Heart', '9 Heart']
+    result = clear_probability(HAND, deck, 622, hands_left=2, discards_left=0)
+    assert all(action['exact'] and action['error'] == 0.0 for action in result['actions'])
+    assert result['probability'] == pytest.approx(1 / 3)
+    assert result['action']['pattern'] == 'Full House'
@@ -0,0 +1,45 @@
+# test_jokerLoadout.py
+
+import itertools
+
+import pytest
+
+from deck import make_deck
+from jokerLoadout import hand_features, loadout_total, optimize_loadout
+from jokers import JokerManager
+
+SAMPLES = 200
+
+
+@pytest.fixture(scope='module')
+def jokers():
+    return JokerManager().all_jokers
+
+
+def _brute_force(jokers, slots, top_n):
+    """Totals of every loadout of slots Jokers, best first, over the same sampled hands."""
+    names = list(jokers)
+    rows = hand_features(make_deck(), [jokers[name] for name in names], samples=SAMPLES)
+    totals = sorted((loadout_total(rows, loadout) for loadout in itertools.combinations(range(len(names)), slots)),
+                    reverse=True)
+    hands = sum(count for count, plays in rows)
+    return [total / hands for total in totals[:top_n]]
+
+
+@pytest.mark.parametrize('slots', [1, 2, 3])
+def test_optimizer_matches_brute_force(jokers, slots):
+    stats = {}
+    found = optimize_loadout(jokers, make_deck(), slots=slots, top_n=5, samples=SAMPLES, workers=1, stats=stats)
+    assert [loadout['expected_score'] for loadout in found] == pytest.approx(_brute_force(jokers, slots, 5))
+    assert all(len(loadout['jokers']) == len(set(loadout['jokers'])) == slots for loadout in found)
+    assert stats['evaluated'] <= stats['loadouts']
+
+
+def test_single_joker_gains_match_its_total(jokers):
+    found = optimize_loadout(jokers, make_deck(), slots=1, top_n=1, samples=SAMPLES, workers=1)[0]
+    names = list(jokers)
+    rows = hand_features(make_deck(), [jokers[name] for name in names], samples=SAMPLES)
+    hands = sum(count for count, plays in rows)
+    total = loadout_total(rows, (names.index(found['jokers'][0]),))
+    assert found['expected_score'] == pytest.approx(total / hands)
+    assert found['gain'] == pytest.approx((total - loadout_total(rows, ())) / hands)
@@ -0,0 +1,66 @@
+# test_play.py
+
+import dataclasses
+import random
+
+import pytest
+
+import play
+from blinds import BOSS_BLINDS
+from cards import EDITIONS, ENHANCEMENTS, SEALS, CardTable
+from deck import CARD_NAMES
+
+
+def _plays(results):
+    return [(tuple(hand['subset']), hand['pattern'], list(hand['pattern_cards']), hand['score']) for hand in results]
+
+
+def _random_table(rng, size):
+    """A table of size cards, duplicates allowed, a third of them with random modifiers."""
+    table = CardTable()
+    ids = []
+    for _ in range(size):
+        if rng.random() < 1 / 3:
+            ids.append(table.add(rng.choice(CARD_NAMES), rng.choice(ENHANCEMENTS), rng.choice(EDITIONS),
+                                 rng.choice(SEALS)))
+        else:
+            ids.append(table.add(rng.choice(CARD_NAMES)))
+    return table, ids
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_find_best_hands_matches_exhaustive_search(seed):
+    rng = random.Random(seed)
+    blinds = [None, *BOSS_BLINDS.values(),
+              dataclasses.replace(BOSS_BLINDS['The Eye'], played_hand_types=['Flush', 'Pair']),
+              dataclasses.replace(BOSS_BLINDS['The Mouth'], played_hand_types=['Two Pair'])]
+    for _ in range(40):
+        table, ids = _random_table(rng, rng.randint(5, 9))
+        blind = rng.choice(blinds)
+        expected = play._find_best_hands_exhaustive(ids, top_n=5, table=table, blind=blind)
+        assert _plays(play.find_best_hands(ids, top_n=5, table=table, blind=blind)) == _plays(expected)
+
+
+def test_find_best_hands_does_not_depend_on_card_order():
+    rng = random.Random(0)
+    for _ in range(200):
+        hand = rng.sample(CARD_NAMES, 8)
+        best = play.find_best_hands(hand, top_n=3)
+        shuffled = play.find_best_hands(rng.sample(hand, len(hand)), top_n=3)
+        assert [(sorted(a['subset']), a['pattern'], sorted(a['pattern_cards'])) for a in best] == \
+               [(sorted(b['subset']), b['pattern'], sorted(b['pattern_cards'])) for b in shuffled]
+
+
+def test_flush_goes_before_straight_of_equal_score():
+    hand = ['2 Heart', '3 Heart', '4 Heart', '5 Heart', '9 Heart', '6 Club', 'King Spade', 'Queen Spade']
+    sums = play.pattern_chip_sums(hand)
+    saved = play.HAND_SCORES
+    chips, mult = saved['Flush']
+    play.HAND_SCORES = dict(saved, Straight=(chips + sums['Flush'] - sums['Straight'], mult))
+    try:
+        for order in (hand, hand[::-1]):
+            best = play.find_best_hands(order, top_n=2)
+            assert [result['pattern'] for result in best] == ['Flush', 'Straight']
+            assert best[0]['score'] == best[1]['score']
+    finally:
+        play.HAND_SCORES = saved
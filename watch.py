@@ -0,0 +1,336 @@
+# watch.py
+
+import json
+import os
+import statistics
+import time
+from deck import CARD_NAMES, Deck, make_deck
+from notation import tokenize_cards
+
+# Seconds between checks of the state file, and of quiet after a change before it is read
+POLL_INTERVAL = 0.02
+DEBOUNCE = 0.05
+
+# What each recommendation is recomputed for; a field missing here changes nothing shown.
+# Neither search scores with the Jokers, so they are only checked, and left out of the cache keys.
+DEPENDS_ON = {
+    'plays': {'hand', 'planets', 'blind'},
+    'discards': {'hand', 'deck', 'planets', 'blind'},
+    'clear': {'hand', 'deck', 'planets', 'blind', 'target', 'hands_left', 'discards_left'},
+}
+
+FIELDS = ('hand', 'deck', 'planets', 'jokers', 'blind', 'target', 'hands_left', 'discards_left')
+
+
+def _cards(value, field, allow_duplicates=False):
+    """Card names from a list of cards or a string, in any notation notation.py reads."""
+    text = value if isinstance(value, str) else ', '.join(value)
+    try:
+        return [CARD_NAMES[card] for card in tokenize_cards(text, allow_duplicates)]
+    except ValueError as e:
+        raise ValueError(f"{e} (in '{field}')") from None
+
+
+def load_state(path):
+    """
+    Read and check a game state file.
+
+    The file is a JSON object with any of:
+    - hand: the cards in hand, as a list or a string ("ah kh 10s" or ["Ace Heart", ...]).
+    - deck: the draw pile, likewise (duplicates allowed); defaults to a Standard deck less the hand.
+    - planets: copies of each Planet Card, e.g. {"Mercury": 2}.
+    - jokers: names of the enabled Jokers, in order.
+    - blind: the Boss Blind's name.
+    - target, hands_left, discards_left: chips still needed and what is left this
+      round; the chance to clear is shown when all three are given.
+
+    Returns:
+    - dict: The fields above, parsed ('hand' as card names, 'deck' as a Deck).
+
+    Raises:
+    - ValueError: If the file is not a JSON object or a field is invalid.
+    """
+    with open(path, encoding='utf-8') as f:
+        try:
+            raw = json.load(f)
+        except ValueError as e:
+            raise ValueError(f"Error: {path} is not valid JSON ({e}).") from None
+    if not isinstance(raw, dict):
+        raise ValueError(f"Error: {path} must hold a JSON object.")
+    unknown = set(raw) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Error: Unknown fields {', '.join(sorted(unknown))}. Use {', '.join(FIELDS)}.")
+    state = {field: raw.get(field) for field in FIELDS}
+    state['hand'] = _cards(raw.get('hand', []), 'hand')
+    if raw.get('deck') is None:
+        deck = make_deck()
+        deck.remove_cards(state['hand'])
+    else:
+        deck = Deck.from_cards(_cards(raw['deck'], 'deck', allow_duplicates=True))
+    state['deck'] = deck
+    state['planets'] = dict(raw.get('planets') or {})
+    state['jokers'] = list(raw.get('jokers') or [])
+    return state
+
+
+def diff_states(old, new):
+    """Return the fields that differ between two states from load_state (every field if old is None)."""
+    if old is None:
+        return set(FIELDS)
+    changed = set()
+    for field in FIELDS:
+        a, b = old[field], new[field]
+        if field == 'deck':
+            if a.counts != b.counts:
+                changed.add(field)
+        elif field == 'hand':
+            if sorted(a) != sorted(b):
+                changed.add(field)
+        elif a != b:
+            changed.add(field)
+    return changed
+
+
+class WatchSession:
+    """
+    Recommendations for a stream of game states, recomputed only where the state changed.
+
+    Planet levels are applied only when the planets change. Each
+    recommendation is kept until a field it depends on (DEPENDS_ON) changes,
+    and plays and discards are read from and stored in the recommendation
+    cache when one is given.
+    """
+
+    def __init__(self, cache=None, deadline=0.05):
+        """
+        Initialize a WatchSession with no state yet.
+
+        Parameters:
+        - cache: A RecommendationCache, or None.
+        - deadline (float): Seconds the discard search may take (see recommend_discard_strategies).
+        """
+        self.cache = cache
+        self.deadline = deadline
+        self.state = None
+        self.results = {}
+
+    def _apply_planets(self, planets):
+        from planetCards import PLANET_CARDS
+        from play import update_hand_scores
+
+        unknown = [name for name in planets if name not in PLANET_CARDS]
+        if unknown:
+            raise ValueError(f"Error: Unknown Planet Cards: {', '.join(unknown)}.")
+        for name, card in PLANET_CARDS.items():
+            card.quantity = int(planets.get(name, 0))
+        update_hand_scores()
+
+    def _check_jokers(self, names):
+        from jokerCatalog import JOKER_CATALOG
+
+        unknown = [name for name in names if name not in JOKER_CATALOG]
+        if unknown:
+            raise ValueError(f"Error: Unknown Jokers: {', '.join(unknown)}.")
+
+    def _blind(self, name):
+        from blinds import BOSS_BLINDS
+
+        if name is None:
+            return None
+        if name not in BOSS_BLINDS:
+            raise ValueError(f"Error: Unknown Boss Blind '{name}'.")
+        return BOSS_BLINDS[name]
+
+    def _cached(self, kind, key, compute):
+        """Return (results, hit): results from the cache, or computed and stored."""
+        if self.cache is not None:
+            found = self.cache.get(key)
+            if found is not None:
+                return found, True
+        start = time.perf_counter()
+        results = compute()
+        if self.cache is not None and all(result.get('exact', True) for result in results):
+            self.cache.put(key, kind, results, time.perf_counter() - start)
+        return results, False
+
+    def update(self, state):
+        """
+        Bring the recommendations up to date with a new state.
+
+        Returns:
+        - dict: 'changed' fields, 'recomputed' recommendations, 'cache_hits'
+          among them, and 'seconds' spent.
+        """
+        from play import find_best_hands
+        from discard import recommend_discard_strategies
+        from recommendationCache import cache_key
+
+        start = time.perf_counter()
+        changed = diff_states(self.state, state)
+        blind = self._blind(state['blind'])
+        if 'planets' in changed:
+            self._apply_planets(state['planets'])
+        if 'jokers' in changed:
+            self._check_jokers(state['jokers'])
+        hand, deck = state['hand'], state['deck']
+
+        recomputed = []
+        hits = 0
+        stale = [kind for kind, fields in DEPENDS_ON.items() if changed & fields or kind not in self.results]
+        for kind in stale:
+            if not hand:
+                self.results[kind] = None
+                continue
+            if kind == 'plays':
+                key = cache_key('plays', hand, blind=blind)
+                self.results[kind], hit = self._cached(kind, key, lambda: find_best_hands(hand, top_n=1, blind=blind))
+            elif kind == 'discards':
+                key = cache_key('discards', hand, deck, blind)
+                self.results[kind], hit = self._cached(
+                    kind, key, lambda: recommend_discard_strategies(hand, deck, top_n=1, blind=blind,
+                                                                    deadline=self.deadline))
+            else:
+                if None in (state['target'], state['hands_left'], state['discards_left']):
+                    self.results[kind] = None
+                    continue
+                from clear import clear_probability
+
+                self.results[kind] = clear_probability(hand, deck, state['target'], state['hands_left'],
+                                                       state['discards_left'], blind=blind)
+                hit = False
+            recomputed.append(kind)
+            hits += hit
+        self.state = state
+        return {'changed': changed, 'recomputed': recomputed, 'cache_hits': hits,
+                'seconds': time.perf_counter() - start}
+
+    def lines(self):
+        """Return the lines of the watch screen for the current state and recommendations."""
+        from balatroAdvisor import format_hand
+        from clear import describe_action
+
+        state = self.state
+        lines = [f"Hand: {format_hand(state['hand']) or '(empty)'}",
+                 f"Deck: {len(state['deck'])} cards   Jokers: {', '.join(state['jokers']) or 'none'}"
+                 f"   Blind: {state['blind'] or 'none'}", ""]
+        plays = self.results.get('plays')
+        if plays:
+            best = plays[0]
+            lines += [f"Best play: {best['pattern']} ({format_hand(best['pattern_cards'])})",
+                      f"   {best['calculation']}"]
+        else:
+            lines += ["Best play: none", ""]
+        discards = self.results.get('discards')
+        if discards:
+            strategy = discards[0]
+            lines.append(f"Best discard: {format_hand(strategy['discard']) or 'nothing'} "
+                         f"aiming for {strategy['pattern']} ({strategy['probability'] * 100:.2f}%)")
+        else:
+            lines.append("Best discard: none")
+        clear_result = self.results.get('clear')
+        if clear_result is not None:
+            lines.append(f"Estimated chance to clear: {clear_result['probability'] * 100:.1f}% "
+                         f"± {clear_result['error'] * 100:.1f}% ({describe_action(clear_result['action'])})")
+        return lines
+
+
+def _signature(path):
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+
+def watch(path, session=None, screen=None, poll=POLL_INTERVAL, debounce=DEBOUNCE, updates=None):
+    """
+    Follow a state file and redraw the recommendations whenever it changes.
+
+    The file is polled every `poll` seconds; once it has stopped changing for
+    `debounce` seconds it is read, diffed against the previous state and the
+    screen is redrawn in place. The latency from the file's modification time
+    to the redrawn screen is measured for every update.
+
+    Parameters:
+    - path (str): The state file (see load_state).
+    - session (WatchSession): Defaults to one without a cache.
+    - screen (screen.Screen): Defaults to a new Screen on stdout.
+    - poll (float): Seconds between checks.
+    - debounce (float): Seconds of quiet before a change is read.
+    - updates (int): Stop after this many updates (defaults to running until interrupted).
+
+    Returns:
+    - list: Latency of each update in seconds.
+    """
+    from screen import Screen
+
+    session = session or WatchSession()
+    screen = screen or Screen(reserve=0)
+    latencies = []
+    started = time.time()
+    seen = None
+    changed_at = None
+    message = f"Waiting for {path}..."
+    screen.render([message])
+    while updates is None or len(latencies) < updates:
+        signature = _signature(path)
+        now = time.perf_counter()
+        if signature != seen:
+            seen = signature
+            changed_at = now
+        elif changed_at is not None and signature is not None and now - changed_at >= debounce:
+            changed_at = None
+            try:
+                update = session.update(load_state(path))
+            except (OSError, ValueError) as e:
+                # A file caught mid-write fails to parse; the next write is picked up
+                screen.render((session.lines() if session.state else []) + ["", str(e)])
+                continue
+            # A file already there when watching starts is timed from the start
+            modified = max(signature[0] / 1e9, started)
+            latency = time.time() - modified
+            recomputed = ', '.join(update['recomputed']) or 'nothing'
+            screen.render(session.lines() + [
+                "",
+                f"Updated {latency * 1000:.1f} ms after the file changed (debounce {debounce * 1000:.0f} ms, "
+                f"recomputed {recomputed} in {update['seconds'] * 1000:.1f} ms, {update['cache_hits']} cached)"
+            ])
+            # The recorded latency includes drawing the frame
+            latencies.append(time.time() - modified)
+            continue
+        time.sleep(poll)
+    return latencies
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Follow a game state file and show recommendations as it changes.")
+    parser.add_argument('path', help="JSON state file, e.g. written by a game mod.")
+    parser.add_argument('--poll', type=float, default=POLL_INTERVAL, help="Seconds between checks of the file.")
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE,
+                        help="Seconds the file must stay unchanged before it is read.")
+    parser.add_argument('--no-cache', action='store_true', help="Do not use the recommendation cache.")
+    args = parser.parse_args()
+
+    cache = None
+    if not args.no_cache:
+        from recommendationCache import RecommendationCache
+        cache = RecommendationCache()
+    latencies = []
+    try:
+        latencies = watch(args.path, WatchSession(cache), poll=args.poll, debounce=args.debounce)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if cache is not None:
+            cache.close()
+    if latencies:
+        print(f"\n{len(latencies)} updates, file change to screen: median "
+              f"{statistics.median(latencies) * 1000:.1f} ms, worst {max(latencies) * 1000:.1f} ms")
+    if cache is not None:
+        print(cache.summary())
+
+
+if __name__ == "__main__":
+    main()